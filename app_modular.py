@@ -58,7 +58,8 @@ from modules.handlers import (
     landing_handler, start_handler, optimize_handler, download_report_handler,
     view_report_handler, preview_csv_handler,
     get_container_stats_handler, get_item_details_handler, get_container_status_handler,
-    clear_container_handler, handle_socketio_update_request, generate_alternative_plan_handler
+    clear_container_handler, handle_socketio_update_request, generate_alternative_plan_handler,
+    optimize_fleet_handler, recommend_container_handler
 )
 from modules.handlers import bp
 
@@ -493,6 +494,8 @@ def create_app():
     app.route('/')(landing_handler)
     app.route('/start')(start_handler)
     app.route('/optimize', methods=['POST'])(optimize_handler)
+    app.route('/optimize_fleet', methods=['POST'])(optimize_fleet_handler)
+    app.route('/recommend_container', methods=['POST'])(recommend_container_handler)
     app.route('/download_report')(download_report_handler)
     app.route('/view_report')(view_report_handler)
     app.route('/preview_csv', methods=['POST'])(preview_csv_handler)
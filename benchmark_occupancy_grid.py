@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the voxel occupancy bitmap that pre-filters overlap checks.
+
+For every manifest in input/*.csv, plus a synthetic manifest of small cubes,
+evaluates the same random genomes without the bitmap and with it at several
+resolutions, the way the genetic algorithm evaluates fitness. It then probes
+the packed container with random candidate positions. Per resolution it
+reports the bitmap memory, the share of the placed volume the bitmap marks,
+the share of overlapping probes it rejects without the exact test, and the
+time per feasibility check and per evaluated genome. Utilization must not
+change: the bitmap only rejects positions the exact test rejects too.
+
+Usage: python benchmark_occupancy_grid.py [genomes] [input_glob] [resolutions]
+       resolutions is a comma-separated list of voxel edges in meters (default 0.01,0.02,0.05,0.1)
+"""
+import glob
+import logging
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+from benchmark_placement_engines import CONTAINER, SEED, load_items
+from optigenix_module.models.container import EnhancedContainer
+from optigenix_module.models.item import Item
+from optigenix_module.optimization.packer import GeneticPacker, PackingGenome
+
+RESOLUTIONS = (0.01, 0.02, 0.05, 0.1)
+CUBE = 0.25  # Edge of the synthetic cubes (m)
+CUBE_COUNT = 600
+PROBES = 2000  # Random candidate positions checked per manifest
+
+
+def cubes():
+    """Synthetic dense manifest of identical small cartons"""
+    return [Item(f"Cube_{index + 1}", CUBE, CUBE, CUBE, 5, 1, 'LOW', 'YES', 'STANDARD', 'NO')
+            for index in range(CUBE_COUNT)]
+
+
+def evaluate(items, genomes, resolution):
+    """Evaluate genomes; returns (seconds per genome, mean utilization)"""
+    packer = GeneticPacker(CONTAINER, occupancy_resolution=resolution)
+    start = time.perf_counter()
+    utilization = [packer._measure_genome(genome)['volume_utilization'] for genome in genomes]
+    return (time.perf_counter() - start) / len(genomes), sum(utilization) / len(utilization)
+
+
+def probe(container, items, resolution):
+    """
+    Check random candidates against a packed container.
+
+    Returns:
+        (microseconds per check, share of overlapping probes the bitmap rejects)
+    """
+    container.occupancy_resolution = resolution
+    grid = container._occupancy_grid()
+    random.seed(SEED)
+    candidates = []
+    for _ in range(PROBES):
+        dims = random.choice(items).dimensions
+        candidates.append(((random.uniform(0, CONTAINER[0] - dims[0]), random.uniform(0, CONTAINER[1] - dims[1]),
+                            random.uniform(0, CONTAINER[2] - dims[2])), dims))
+    start = time.perf_counter()
+    for pos, dims in candidates:
+        container._is_valid_placement(items[0], pos, dims)
+    elapsed = time.perf_counter() - start
+    if grid is None:
+        return elapsed / PROBES * 1e6, None
+    index = container._spatial_index()
+    overlapping = [(pos, dims) for pos, dims in candidates if index.overlaps(pos, dims)]
+    rejected = sum(1 for pos, dims in overlapping if grid.blocked(pos, dims))
+    return elapsed / PROBES * 1e6, rejected / len(overlapping) if overlapping else 0.0
+
+
+def main():
+    genome_count = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    pattern = sys.argv[2] if len(sys.argv) > 2 else os.path.join('input', '*.csv')
+    resolutions = tuple(float(r) for r in sys.argv[3].split(',')) if len(sys.argv) > 3 else RESOLUTIONS
+    logging.disable(logging.INFO)
+
+    manifests = [('cubes (synthetic)', cubes)]
+    manifests += [(os.path.basename(path), lambda path=path: load_items(path)) for path in sorted(glob.glob(pattern))]
+
+    print("=== Occupancy bitmap benchmark ===")
+    print(f"{'manifest':<28} {'items':>6} {'voxel (m)':>9} {'bitmap (KiB)':>12} {'marked':>7} "
+          f"{'rejected':>8} {'check (us)':>10} {'genome (ms)':>11} {'util':>7}")
+    for name, load in manifests:
+        try:
+            items = load()
+        except (OSError, ValueError, KeyError, pd.errors.EmptyDataError) as e:
+            print(f"{name:<28} skipped: {e}")
+            continue
+        if not items:
+            continue
+        random.seed(SEED)
+        genomes = []
+        for _ in range(genome_count):
+            order = list(range(len(items)))
+            random.shuffle(order)
+            genomes.append(PackingGenome(items, order=order, rotation_flags=[random.randrange(6) for _ in order]))
+
+        container = EnhancedContainer(CONTAINER)
+        logging.disable(logging.CRITICAL)
+        with open(os.devnull, 'w') as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                container.pack_items(items)
+            finally:
+                sys.stdout = stdout
+        logging.disable(logging.INFO)
+        placed_volume = container._load_totals().volume
+
+        for resolution in (None,) + resolutions:
+            seconds, utilization = evaluate(items, genomes, resolution)
+            check_us, rejected = probe(container, items, resolution)
+            if resolution is None:
+                memory = marked = rejected_text = '-'
+            else:
+                grid = container._occupancy_grid()
+                memory = f"{grid.nbytes / 1024:.0f}"
+                marked = f"{grid.occupied_volume() / placed_volume:.0%}" if placed_volume else '-'
+                rejected_text = f"{rejected:.0%}"
+            print(f"{name:<28} {len(items):>6} {resolution if resolution else 'off':>9} {memory:>12} {marked:>7} "
+                  f"{rejected_text:>8} {check_us:>10.1f} {seconds * 1000:>11.1f} {utilization:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
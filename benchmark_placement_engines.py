@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the two candidate-position generators (placement engines).
+
+For every manifest in input/*.csv, packs the same random genomes once with
+maximal free spaces and once with extreme points, the way the genetic
+algorithm evaluates fitness, and reports placements per second and the mean
+volume utilization of each engine.
+
+Usage: python benchmark_placement_engines.py [genomes] [input_glob]
+"""
+import glob
+import logging
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+from optigenix_module.models.container_core import PLACEMENT_ENGINES
+from optigenix_module.models.item import Item
+from optigenix_module.optimization.packer import GeneticPacker, PackingGenome
+
+CONTAINER = (12.03, 2.35, 2.39)  # 40ft container (m)
+SEED = 7
+
+
+def load_items(path):
+    """Read a manifest CSV and expand every row into one item per unit, as the genetic algorithm does"""
+    df = pd.read_csv(path)
+    items = []
+    for _, row in df.iterrows():
+        stackable = 'YES' if str(row.get('Stackable', 'YES')).upper() in ('YES', 'TRUE', '1') else 'NO'
+        temperature = row.get('Temperature Sensitivity')
+        for index in range(int(row['Quantity'])):
+            items.append(Item(
+                name=f"{row['Name']}_{index + 1}", length=float(row['Length']), width=float(row['Width']),
+                height=float(row['Height']), weight=float(row['Weight']), quantity=1,
+                fragility=str(row['Fragility']), stackable=stackable, boxing_type=str(row['BoxingType']),
+                bundle='NO', load_bearing=float(row.get('LoadBear', 0) or 0),
+                temperature_sensitivity=str(temperature) if pd.notna(temperature) else None
+            ))
+    return items
+
+
+def run_engine(engine, items, genomes):
+    """Evaluate genomes with one engine; returns (placements per second, mean utilization)"""
+    packer = GeneticPacker(CONTAINER, placement_engine=engine)
+    start = time.perf_counter()
+    utilization = [packer._measure_genome(genome)['volume_utilization'] for genome in genomes]
+    elapsed = time.perf_counter() - start
+    return len(items) * len(genomes) / elapsed, sum(utilization) / len(utilization)
+
+
+def main():
+    genome_count = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    pattern = sys.argv[2] if len(sys.argv) > 2 else os.path.join('input', '*.csv')
+    logging.disable(logging.INFO)
+
+    print("=== Placement engine benchmark ===")
+    header = f"{'manifest':<28} {'items':>6}"
+    for engine in PLACEMENT_ENGINES:
+        header += f" {engine + ' (pl/s)':>22} {'util':>7}"
+    print(header)
+    for path in sorted(glob.glob(pattern)):
+        try:
+            items = load_items(path)
+        except (OSError, ValueError, KeyError, pd.errors.EmptyDataError) as e:
+            print(f"{os.path.basename(path):<28} skipped: {e}")
+            continue
+        if not items:
+            continue
+        random.seed(SEED)
+        genomes = []
+        for _ in range(genome_count):
+            order = list(range(len(items)))
+            random.shuffle(order)
+            genomes.append(PackingGenome(items, order=order, rotation_flags=[random.randrange(6) for _ in order]))
+
+        line = f"{os.path.basename(path):<28} {len(items):>6}"
+        for engine in PLACEMENT_ENGINES:
+            rate, utilization = run_engine(engine, items, genomes)
+            line += f" {rate:>22.1f} {utilization:>7.1%}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the records fitness evaluation places.
+
+Evaluation used to construct a full Item copy for every genome entry (color
+selection, bundle search, per-instance attributes); it now places a
+PlacedBox that points at an ItemType built once per run. For every manifest
+in input/*.csv this times both constructions and measures the memory they
+keep per placement, including a bundled variant of each row where the copy
+repeats the bundle search. It then reports the memory allocated while
+evaluating whole genomes.
+
+Usage: python benchmark_placement_records.py [genomes] [input_glob]
+"""
+import glob
+import logging
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmark_placement_engines import CONTAINER, SEED, load_items
+from optigenix_module.models.item import Item
+from optigenix_module.models.placement import PlacedBox
+from optigenix_module.optimization.item_types import ItemTypeTable
+from optigenix_module.optimization.packer import GeneticPacker, PackingGenome
+
+BUNDLE_QUANTITY = 12  # Units per bundle in the bundled variant
+
+
+def copy_item(item):
+    """Evaluation copy of an item as made before placement records"""
+    return Item(
+        name=item.name, length=item.original_dims[0], width=item.original_dims[1], height=item.original_dims[2],
+        weight=item.weight / item.quantity if item.bundle == 'YES' and item.quantity > 1 else item.weight,
+        quantity=item.quantity, fragility=item.fragility, stackable=item.stackable, boxing_type=item.boxing_type,
+        bundle=item.bundle, load_bearing=item.load_bearing, temperature_sensitivity=item.temperature_sensitivity
+    )
+
+
+def bundled(items):
+    """Every item as a bundle of BUNDLE_QUANTITY units"""
+    return [Item(item.name, *item.original_dims, item.weight, BUNDLE_QUANTITY, item.fragility, item.stackable,
+                 item.boxing_type, 'YES', item.load_bearing, item.temperature_sensitivity) for item in items]
+
+
+def measure(make, items):
+    """Build one record per item; returns (microseconds per record, bytes kept per record)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    records = [make(index, item) for index, item in enumerate(items)]
+    elapsed = time.perf_counter() - start
+    kept = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return elapsed / len(items) * 1e6, kept / len(items)
+
+
+def compare_records(items):
+    """Item copies against placement records for an item table"""
+    table = ItemTypeTable(items)
+    types = table.types.tolist()
+    copies = measure(lambda index, item: copy_item(item), items)
+    records = measure(lambda index, item: PlacedBox(table.item_types[types[index]], item.name, (0.0, 0.0, 0.0),
+                                                    item.dimensions), items)
+    return copies, records
+
+
+def genome_allocations(items, genomes):
+    """Peak traced memory (KiB) while evaluating each genome, averaged"""
+    packer = GeneticPacker(CONTAINER)
+    packer._measure_genome(genomes[0])  # Build the item-type table outside the measurement
+    peaks = []
+    for genome in genomes:
+        tracemalloc.start()
+        packer._measure_genome(genome)
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+        tracemalloc.stop()
+    return sum(peaks) / len(peaks)
+
+
+def main():
+    genome_count = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    pattern = sys.argv[2] if len(sys.argv) > 2 else os.path.join('input', '*.csv')
+    logging.disable(logging.INFO)
+
+    print("=== Placement record benchmark ===")
+    print(f"{'manifest':<28} {'items':>6} {'variant':>8} {'Item copy (us, B)':>20} "
+          f"{'PlacedBox (us, B)':>20} {'genome peak (KiB)':>18}")
+    for path in sorted(glob.glob(pattern)):
+        try:
+            items = load_items(path)
+        except (OSError, ValueError, KeyError, pd.errors.EmptyDataError) as e:
+            print(f"{os.path.basename(path):<28} skipped: {e}")
+            continue
+        if not items:
+            continue
+        random.seed(SEED)
+        genomes = []
+        for _ in range(genome_count):
+            order = list(range(len(items)))
+            random.shuffle(order)
+            genomes.append(PackingGenome(items, order=order, rotation_flags=[random.randrange(6) for _ in order]))
+        peak = genome_allocations(items, genomes)
+
+        for variant, table in (('unit', items), ('bundled', bundled(items))):
+            (copy_us, copy_bytes), (record_us, record_bytes) = compare_records(table)
+            print(f"{os.path.basename(path):<28} {len(items):>6} {variant:>8} "
+                  f"{copy_us:>10.2f} {copy_bytes:>9.0f} {record_us:>10.2f} {record_bytes:>9.0f} "
+                  f"{f'{peak:.1f}' if variant == 'unit' else '':>18}")
+
+
+if __name__ == "__main__":
+    main()
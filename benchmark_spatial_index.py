@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the container spatial index.
+
+Fills a container with unit boxes and times the placement check for the next
+box at growing item counts, once through the spatial index and once with the
+previous linear scan over every placed item. With the index, the cost per
+check should stay roughly flat as the container fills up.
+
+Usage: python benchmark_spatial_index.py [max_items]
+"""
+import sys
+import time
+
+from optigenix_module.models.container import EnhancedContainer
+from optigenix_module.models.item import Item
+
+BOX = 0.25  # Edge of every benchmark box (m)
+CONTAINER = (12.03, 2.35, 2.39)  # 40ft container (m)
+CHECKS = 200  # Placement checks timed per item count
+
+
+def make_box(index):
+    return Item(f"Box_{index}", BOX, BOX, BOX, 10, 1, 'LOW', True, 'STANDARD', 'NO')
+
+
+def linear_scan_check(container, pos, dims):
+    """Overlap and support tests as done before the spatial index: scan every placed item"""
+    box = (pos[0], pos[1], pos[2], dims[0], dims[1], dims[2])
+    for placed in container.items:
+        if container._check_overlap_3d(box, (*placed.position, *placed.dimensions)):
+            return False
+    below = [placed for placed in container.items
+             if abs(placed.position[2] + placed.dimensions[2] - pos[2]) < 0.001 and
+             container._check_overlap_2d((pos[0], pos[1], dims[0], dims[1]),
+                                         (placed.position[0], placed.position[1],
+                                          placed.dimensions[0], placed.dimensions[1]))]
+    return pos[2] == 0 or bool(below)
+
+
+def fill(container, count):
+    """Place count boxes in a regular grid, filling floor layers first"""
+    per_row = int(container.dimensions[0] // BOX)
+    per_layer = per_row * int(container.dimensions[1] // BOX)
+    for index in range(len(container.items), count):
+        box = make_box(index)
+        layer, rest = divmod(index, per_layer)
+        row, column = divmod(rest, per_row)
+        box.position = (column * BOX, row * BOX, layer * BOX)
+        container.items.append(box)
+
+
+def time_checks(check, container, positions, dims):
+    start = time.perf_counter()
+    for pos in positions:
+        check(container, pos, dims)
+    return (time.perf_counter() - start) / len(positions) * 1e6
+
+
+def main():
+    max_items = int(sys.argv[1]) if len(sys.argv) > 1 else 3200
+    container = EnhancedContainer(CONTAINER)
+    probe = make_box(-1)
+    dims = probe.dimensions
+
+    print("=== Spatial index benchmark ===")
+    print(f"{'items':>8} {'indexed (us/check)':>20} {'linear scan (us/check)':>24}")
+    count = 100
+    while count <= max_items:
+        fill(container, count)
+        container._spatial_index()  # Index the new boxes outside the timed checks
+        # Probe positions spread over the lower layers, free or taken depending on the fill level
+        positions = [((i * 7 % 48) * BOX, (i * 3 % 9) * BOX, (i % 9) * BOX) for i in range(CHECKS)]
+        indexed = time_checks(lambda c, p, d: c._is_valid_placement(probe, p, d), container, positions, dims)
+        linear = time_checks(linear_scan_check, container, positions, dims)
+        print(f"{count:>8} {indexed:>20.1f} {linear:>24.1f}")
+        count *= 2
+
+
+if __name__ == "__main__":
+    main()
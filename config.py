@@ -9,6 +9,33 @@ UPLOAD_FOLDER = os.path.normpath(os.path.join(BASE_DIR, 'uploads'))
 PLANS_FOLDER = os.path.normpath(os.path.join(BASE_DIR, 'container_plans'))
 MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))  # 16MB max-limit
 
+# Default wall-clock budget (seconds) for genetic optimization requests; unset means no limit
+GA_TIME_BUDGET_SECONDS = float(os.environ['GA_TIME_BUDGET_SECONDS']) if os.environ.get('GA_TIME_BUDGET_SECONDS') else None
+
+# Seed genetic optimization from similar plans saved in PLANS_FOLDER (set GA_WARM_START=0 to disable)
+GA_WARM_START = os.environ.get('GA_WARM_START', '1') != '0'
+
+# Candidate positions used for packing: 'spaces' (maximal free spaces) or 'extreme_points'
+PLACEMENT_ENGINE = os.environ.get('PLACEMENT_ENGINE', 'spaces')
+
+# Voxel edge (m) of the occupancy bitmap pre-filtering overlap checks, e.g. 0.01 or 0.05; unset disables it
+OCCUPANCY_RESOLUTION = float(os.environ['OCCUPANCY_RESOLUTION']) if os.environ.get('OCCUPANCY_RESOLUTION') else None
+
+# Coordinate units of genetic-algorithm evaluation: 'm', or 'mm' for exact integer-millimetre geometry
+GEOMETRY_UNITS = os.environ.get('GEOMETRY_UNITS', 'm')
+
+# Worker processes packing the containers of a multi-container (fleet) plan; unset uses one per CPU
+FLEET_WORKERS = int(os.environ['FLEET_WORKERS']) if os.environ.get('FLEET_WORKERS') else None
+
+# Share of a container's volume the fleet partitioner fills before opening the next container
+FLEET_FILL_FACTOR = float(os.environ.get('FLEET_FILL_FACTOR', 0.85))
+
+# Container types of a recommendation sweep that get a full genetic optimization after the heuristic pass
+RECOMMEND_TOP_K = int(os.environ.get('RECOMMEND_TOP_K', 3))
+
+# Wall-clock budget (seconds) for generating alternative plans of the current container
+ALTERNATIVE_PLAN_DEADLINE_SECONDS = float(os.environ.get('ALTERNATIVE_PLAN_DEADLINE_SECONDS', 20))
+
 # Use environment variable for secret key in production
 SECRET_KEY = os.environ.get('SECRET_KEY', "f23fc24a32e7986b99c8cdaee97f5f395caf23930a3cbf82")
 
@@ -10,7 +10,9 @@ import subprocess
 import sys
 
 # Import from config instead of app_modular
-from config import PLANS_FOLDER
+from config import (PLANS_FOLDER, GA_TIME_BUDGET_SECONDS, GA_WARM_START, PLACEMENT_ENGINE, OCCUPANCY_RESOLUTION,
+                    GEOMETRY_UNITS, FLEET_WORKERS, FLEET_FILL_FACTOR, RECOMMEND_TOP_K,
+                    ALTERNATIVE_PLAN_DEADLINE_SECONDS)
 
 import json
 import datetime
@@ -20,7 +22,11 @@ import os
 from optigenix_module.constants import CONTAINER_TYPES, TRANSPORT_MODES, get_predefined_container_dimensions
 from optigenix_module.models.item import Item
 from optigenix_module.models.container import EnhancedContainer
+from optigenix_module.models.container_core import PLACEMENT_ENGINES
+from optigenix_module.models.units import UNITS
 from optigenix_module.optimization.genetic import optimize_packing_with_genetic_algorithm # Add this line
+from optigenix_module.optimization.fleet import pack_fleet
+from optigenix_module.optimization.recommendation import recommend_container_type
 
 from modules.models import ContainerStorage
 from modules.visualization import create_interactive_visualization
@@ -81,6 +87,141 @@ def start_handler():
     
     return render_template('index.html', data=default_data)
 
+def _load_manifest(file):
+    """
+    Save an uploaded manifest (CSV or Excel) and read its items
+
+    Returns:
+        Tuple of (DataFrame, list of Item, list of warnings for skipped rows)
+
+    Raises:
+        ValueError: The file format is unsupported or required columns are missing
+    """
+    # Save and process file with proper path normalization
+    filename = secure_filename(file.filename)
+    filepath = os.path.normpath(os.path.join(current_app.config['UPLOAD_FOLDER'], filename))
+    
+    # Ensure upload directory exists
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    
+    # Save file with normalized path
+    file.save(filepath)
+    
+    current_app.logger.info(f"File saved at: {filepath}")
+    
+    # Load data into pandas DataFrame (df)
+    file_ext = filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+    if file_ext == 'csv':
+        df = pd.read_csv(filepath)
+    elif file_ext in ['xlsx', 'xls']:
+        df = pd.read_excel(filepath)
+    else:
+        raise ValueError('Unsupported file format')
+    
+    current_app.logger.info(f"File loaded with {len(df)} rows")
+    current_app.logger.debug(f"File columns: {df.columns.tolist()}")
+    
+    # Validate and standardize column names
+    required_columns = ['Name', 'Length', 'Width', 'Height', 'Weight', 'Quantity', 'Fragility', 'BoxingType', 'Bundle']
+    column_mapping = {
+        'stackable': ['Stackable', 'LoadBearing', 'CanStack', 'Stack'],
+        'fragility': ['Fragility', 'Fragile', 'FragilityLevel'],
+        'boxing_type': ['BoxingType', 'PackagingType', 'Package'],
+        'bundle': ['Bundle', 'IsBundled', 'Bundled'],
+        'temperature_sensitivity': ['Temperature Sensitivity', 'TemperatureSensitivity', 'TempSensitivity']
+    }
+    
+    # Check required columns
+    missing_columns = [col for col in required_columns if col not in df.columns]
+    if missing_columns:
+        current_app.logger.error(f"Missing columns: {missing_columns}")
+        raise ValueError(f'Missing required columns: {", ".join(missing_columns)}')
+        
+    # Find stackable column
+    stackable_col = None
+    for possible_name in column_mapping['stackable']:
+        if possible_name in df.columns:
+            stackable_col = possible_name
+            break
+    
+    # Find temperature sensitivity column
+    temp_sensitivity_col = None
+    for possible_name in column_mapping['temperature_sensitivity']:
+        if possible_name in df.columns:
+            temp_sensitivity_col = possible_name
+            break
+    
+    current_app.logger.info(f"Using stackable column: {stackable_col}, temperature sensitivity column: {temp_sensitivity_col}")
+
+    # >>> This is the crucial block for defining 'items' <<<
+    items = [] 
+    warnings = []
+    for index, row in df.iterrows():
+        try:
+            # Handle potential missing 'Bundle' column gracefully
+            bundle_value_raw = row.get('Bundle', 'NO') # Default to 'NO' if 'Bundle' column is missing
+            bundle_value = str(bundle_value_raw).upper() == 'YES'
+
+            # Handle potential missing temperature sensitivity column
+            temp_sensitivity = None
+            if temp_sensitivity_col and temp_sensitivity_col in row and pd.notna(row[temp_sensitivity_col]):
+                temp_sensitivity = str(row[temp_sensitivity_col])
+            
+            # Handle stackable column
+            stackable_value = 'NO' # Default
+            if stackable_col and stackable_col in row and pd.notna(row[stackable_col]):
+                stackable_raw = str(row[stackable_col]).upper()
+                if stackable_raw in ['YES', 'TRUE', '1']:
+                    stackable_value = 'YES'
+                elif stackable_raw in ['NO', 'FALSE', '0']:
+                    stackable_value = 'NO'
+                # else keep default 'NO' or add more specific handling
+
+            item = Item(
+                name=str(row['Name']),
+                length=float(row['Length']),
+                width=float(row['Width']),
+                height=float(row['Height']),
+                weight=float(row['Weight']),
+                quantity=int(row['Quantity']),
+                fragility=str(row['Fragility']),
+                stackable=stackable_value,
+                boxing_type=str(row['BoxingType']),
+                bundle=bundle_value,
+                temperature_sensitivity=temp_sensitivity
+            )
+            items.append(item)
+            current_app.logger.debug(f"Successfully processed item: {row['Name']}")
+            
+        except Exception as e:
+            current_app.logger.error(f"Error processing item {row['Name']} at index {index}: {str(e)}")
+            warnings.append(f"Warning: Skipped item {row['Name']} (row {index+2}) due to error: {str(e)}")
+            continue
+    return df, items, warnings
+
+def _form_constraint_weights():
+    """
+    Constraint weights from the request form
+
+    Returns:
+        Tuple of (weights for the regular packer, the same weights normalized to sum to 1 for the genetic algorithm)
+    """
+    # Get constraint weights from form - convert form names to expected backend names
+    constraint_weights = {
+        'volume_utilization_weight': float(request.form.get('volume_weight', 0.75)),
+        'stability_score_weight': float(request.form.get('stability_weight', 0.5)),
+        'contact_ratio_weight': float(request.form.get('contact_weight', 0.5)),
+        'weight_balance_weight': float(request.form.get('balance_weight', 0.25)),
+        'items_packed_ratio_weight': float(request.form.get('items_packed_weight', 0.25)),
+        'temperature_constraint_weight': float(request.form.get('temperature_weight', 0.3)),
+        'weight_capacity_weight': float(request.form.get('weight_capacity', 0.5))
+    }
+    
+    # Normalize weights
+    total_weight_sum = sum(constraint_weights.values())
+    normalized_weights = {k: v / total_weight_sum if total_weight_sum > 0 else 0 for k, v in constraint_weights.items()}
+    return constraint_weights, normalized_weights
+
 def optimize_handler():
     """Handle the optimize route"""
     if request.method == 'POST':
@@ -157,62 +298,8 @@ def optimize_handler():
             # Log the dimensions to help debug
             current_app.logger.info(f"Final container dimensions: {dimensions}")
             
-            # Save and process file with proper path normalization
-            filename = secure_filename(file.filename)
-            filepath = os.path.normpath(os.path.join(current_app.config['UPLOAD_FOLDER'], filename))
-            
-            # Ensure upload directory exists
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-            
-            # Save file with normalized path
-            file.save(filepath)
-            
-            current_app.logger.info(f"File saved at: {filepath}")
-            
-            # Load data into pandas DataFrame (df)
-            file_ext = filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
-            if file_ext == 'csv':
-                df = pd.read_csv(filepath)
-            elif file_ext in ['xlsx', 'xls']:
-                df = pd.read_excel(filepath)
-            else:
-                return jsonify({'error': 'Unsupported file format'}), 400
-            
-            current_app.logger.info(f"File loaded with {len(df)} rows")
-            current_app.logger.debug(f"File columns: {df.columns.tolist()}")
-            
-            # Validate and standardize column names
-            required_columns = ['Name', 'Length', 'Width', 'Height', 'Weight', 'Quantity', 'Fragility', 'BoxingType', 'Bundle']
-            column_mapping = {
-                'stackable': ['Stackable', 'LoadBearing', 'CanStack', 'Stack'],
-                'fragility': ['Fragility', 'Fragile', 'FragilityLevel'],
-                'boxing_type': ['BoxingType', 'PackagingType', 'Package'],
-                'bundle': ['Bundle', 'IsBundled', 'Bundled'],
-                'temperature_sensitivity': ['Temperature Sensitivity', 'TemperatureSensitivity', 'TempSensitivity']
-            }
-            
-            # Check required columns
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            if missing_columns:
-                current_app.logger.error(f"Missing columns: {missing_columns}")
-                return jsonify({'error': f'Missing required columns: {", ".join(missing_columns)}'}), 400
-                
-            # Find stackable column
-            stackable_col = None
-            for possible_name in column_mapping['stackable']:
-                if possible_name in df.columns:
-                    stackable_col = possible_name
-                    break
-            
-            # Find temperature sensitivity column
-            temp_sensitivity_col = None
-            for possible_name in column_mapping['temperature_sensitivity']:
-                if possible_name in df.columns:
-                    temp_sensitivity_col = possible_name
-                    break
-            
-            current_app.logger.info(f"Using stackable column: {stackable_col}, temperature sensitivity column: {temp_sensitivity_col}")
-            
+            df, items, warnings = _load_manifest(file)
+
             # Get route temperature from form if provided
             route_temperature = None
             if 'route_temperature' in request.form and request.form['route_temperature']:
@@ -235,51 +322,6 @@ def optimize_handler():
             
             optimization_algorithm = request.form.get('optimization_algorithm') # Ensure this is defined before use
 
-            # >>> This is the crucial block for defining 'items' <<<
-            items = [] 
-            warnings = []
-            for index, row in df.iterrows():
-                try:
-                    # Handle potential missing 'Bundle' column gracefully
-                    bundle_value_raw = row.get('Bundle', 'NO') # Default to 'NO' if 'Bundle' column is missing
-                    bundle_value = str(bundle_value_raw).upper() == 'YES'
-
-                    # Handle potential missing temperature sensitivity column
-                    temp_sensitivity = None
-                    if temp_sensitivity_col and temp_sensitivity_col in row and pd.notna(row[temp_sensitivity_col]):
-                        temp_sensitivity = str(row[temp_sensitivity_col])
-                    
-                    # Handle stackable column
-                    stackable_value = 'NO' # Default
-                    if stackable_col and stackable_col in row and pd.notna(row[stackable_col]):
-                        stackable_raw = str(row[stackable_col]).upper()
-                        if stackable_raw in ['YES', 'TRUE', '1']:
-                            stackable_value = 'YES'
-                        elif stackable_raw in ['NO', 'FALSE', '0']:
-                            stackable_value = 'NO'
-                        # else keep default 'NO' or add more specific handling
-
-                    item = Item(
-                        name=str(row['Name']),
-                        length=float(row['Length']),
-                        width=float(row['Width']),
-                        height=float(row['Height']),
-                        weight=float(row['Weight']),
-                        quantity=int(row['Quantity']),
-                        fragility=str(row['Fragility']),
-                        stackable=stackable_value,
-                        boxing_type=str(row['BoxingType']),
-                        bundle=bundle_value,
-                        temperature_sensitivity=temp_sensitivity
-                    )
-                    items.append(item)
-                    current_app.logger.debug(f"Successfully processed item: {row['Name']}")
-                    
-                except Exception as e:
-                    current_app.logger.error(f"Error processing item {row['Name']} at index {index}: {str(e)}")
-                    warnings.append(f"Warning: Skipped item {row['Name']} (row {index+2}) due to error: {str(e)}")
-                    continue
-            
             if not items:
                 current_app.logger.error("No valid items could be processed from the uploaded file.")
                 # It's better to return a JSON error here if no items are processed
@@ -305,24 +347,30 @@ def optimize_handler():
                 except ValueError:
                     current_app.logger.warning(f"Invalid number of generations: {request.form['num_generations']}")
 
-            # Get constraint weights from form - convert form names to expected backend names
-            constraint_weights = {
-                'volume_utilization_weight': float(request.form.get('volume_weight', 0.75)),
-                'stability_score_weight': float(request.form.get('stability_weight', 0.5)),
-                'contact_ratio_weight': float(request.form.get('contact_weight', 0.5)),
-                'weight_balance_weight': float(request.form.get('balance_weight', 0.25)),
-                'items_packed_ratio_weight': float(request.form.get('items_packed_weight', 0.25)),
-                'temperature_constraint_weight': float(request.form.get('temperature_weight', 0.3)),
-                'weight_capacity_weight': float(request.form.get('weight_capacity', 0.5))
-            }
-            
-            # Normalize weights
-            total_weight_sum = sum(constraint_weights.values())
-            normalized_weights = {k: v / total_weight_sum if total_weight_sum > 0 else 0 for k, v in constraint_weights.items()}
+            time_budget = GA_TIME_BUDGET_SECONDS  # Wall-clock limit for the genetic search, None for no limit
+            if 'time_budget' in request.form and request.form['time_budget']:
+                try:
+                    time_budget = float(request.form['time_budget'])
+                    current_app.logger.info(f"Using time budget: {time_budget}s")
+                except ValueError:
+                    current_app.logger.warning(f"Invalid time budget: {request.form['time_budget']}")
+
+            placement_engine = request.form.get('placement_engine') or PLACEMENT_ENGINE
+            if placement_engine not in PLACEMENT_ENGINES:
+                current_app.logger.warning(f"Invalid placement engine: {placement_engine}")
+                placement_engine = 'spaces'
+            current_app.logger.info(f"Using placement engine: {placement_engine}")
+
+            geometry_units = GEOMETRY_UNITS
+            if geometry_units not in UNITS:
+                current_app.logger.warning(f"Invalid geometry units: {geometry_units}")
+                geometry_units = 'm'
+
+            constraint_weights, normalized_weights = _form_constraint_weights()
             current_app.logger.info(f"Normalized constraint weights: {json.dumps(normalized_weights, indent=2)}")
 
             # Initialize the container object with its dimensions
-            container = EnhancedContainer(dimensions)
+            container = EnhancedContainer(dimensions, occupancy_resolution=OCCUPANCY_RESOLUTION)
 
             # The 'items' variable is now defined before this block
             if optimization_algorithm == 'genetic':
@@ -337,7 +385,12 @@ def optimize_handler():
                     population_size=population_size, # Use the variable defined above
                     generations=num_generations,   # Use the variable defined above
                     route_temperature=route_temperature,
-                    fitness_weights=normalized_weights 
+                    fitness_weights=normalized_weights,
+                    deadline_seconds=time_budget,
+                    plans_folder=PLANS_FOLDER if GA_WARM_START else None,
+                    placement_engine=placement_engine,
+                    occupancy_resolution=OCCUPANCY_RESOLUTION,
+                    units=geometry_units
                 )
                 # Assuming optimize_packing_with_genetic_algorithm returns the container object
                 # or a structure from which the container can be accessed.
@@ -351,7 +404,8 @@ def optimize_handler():
                 current_app.logger.info("Using Regular Packing Algorithm")
                 # Use regular packing algorithm with route temperature AND constraint weights
                 # The container object was already initialized earlier.
-                container.pack_items(items, route_temperature, constraint_weights=constraint_weights)
+                container.pack_items(items, route_temperature, constraint_weights=constraint_weights,
+                                     placement_engine=placement_engine)
                 current_app.logger.info("Regular packing algorithm complete")
             
             current_app.logger.info(f"Packing complete - {len(container.items)} items packed into the container.")
@@ -525,6 +579,138 @@ def optimize_handler():
             current_app.logger.error(f'Unexpected error during optimization: {str(e)}', exc_info=True)
             return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
 
+def optimize_fleet_handler():
+    """Handle the fleet optimize route: pack a manifest into as many containers as it needs"""
+    try:
+        current_app.logger.info("=== OPTIMIZE FLEET ROUTE CALLED ===")
+        cleanup_old_files()  # Cleanup old uploads
+
+        file = request.files.get('file')
+        if file is None or file.filename == '':
+            return jsonify({'error': 'No file uploaded'}), 400
+        if not allowed_file(file.filename):
+            return jsonify({'error': 'Invalid file type. Please upload a CSV or Excel file'}), 400
+
+        # One type (container_type) or a mix (container_types, repeated or comma-separated)
+        container_types = [name.strip() for value in request.form.getlist('container_types')
+                           for name in value.split(',') if name.strip()]
+        if not container_types and request.form.get('container_type'):
+            container_types = [request.form['container_type']]
+        transport_mode = request.form.get('transport_mode')
+        if transport_mode:
+            if transport_mode not in TRANSPORT_MODES:
+                return jsonify({'error': 'Invalid transport mode selected'}), 400
+            allowed_types = TRANSPORT_MODES[transport_mode][1]
+            container_types = container_types or list(allowed_types)
+            not_allowed = [name for name in container_types if name not in allowed_types]
+            if not_allowed:
+                return jsonify({'error': f'Container types not available for this transport mode: {", ".join(not_allowed)}'}), 400
+        unknown = [name for name in container_types if name not in CONTAINER_TYPES]
+        if not container_types or unknown:
+            return jsonify({'error': f'Invalid container types: {", ".join(unknown) or "none selected"}'}), 400
+        current_app.logger.info(f"Fleet container types: {container_types}")
+
+        _, items, warnings = _load_manifest(file)
+        if not items:
+            return jsonify({
+                'error': 'No valid items could be processed from the uploaded file.',
+                'details': 'Please check the file format and data. Warnings: ' + "; ".join(warnings)
+            }), 400
+
+        route_temperature = None
+        if request.form.get('route_temperature'):
+            route_temperature = float(request.form['route_temperature'])
+        time_budget = float(request.form['time_budget']) if request.form.get('time_budget') else GA_TIME_BUDGET_SECONDS
+        placement_engine = request.form.get('placement_engine') or PLACEMENT_ENGINE
+        if placement_engine not in PLACEMENT_ENGINES:
+            current_app.logger.warning(f"Invalid placement engine: {placement_engine}")
+            placement_engine = 'spaces'
+        constraint_weights, normalized_weights = _form_constraint_weights()
+
+        containers, plan = pack_fleet(
+            items, container_types,
+            route_temperature=route_temperature,
+            constraint_weights=constraint_weights,
+            algorithm='genetic' if request.form.get('optimization_algorithm') == 'genetic' else 'regular',
+            fitness_weights=normalized_weights,
+            population_size=int(request.form.get('population_size') or 10),
+            generations=int(request.form.get('num_generations') or 8),
+            deadline_seconds=time_budget,
+            placement_engine=placement_engine,
+            occupancy_resolution=OCCUPANCY_RESOLUTION,
+            parallel_workers=FLEET_WORKERS,
+            fill_factor=FLEET_FILL_FACTOR
+        )
+        plan['warnings'] = warnings
+        container_storage.current_fleet = plan
+        current_app.logger.info(f"Fleet packing complete - {plan['items_packed']}/{plan['total_items']} items in "
+                                f"{plan['container_count']} containers, {plan['wall_time_seconds']}s")
+        return jsonify(plan)
+    except ValueError as e:
+        current_app.logger.error(f"Value error: {str(e)}")
+        return jsonify({'error': f'Invalid value in input: {str(e)}'}), 400
+    except Exception as e:
+        current_app.logger.error(f'Unexpected error during fleet optimization: {str(e)}', exc_info=True)
+        return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
+
+def recommend_container_handler():
+    """Handle the container recommendation route: rank the container types of a transport mode for a manifest"""
+    try:
+        current_app.logger.info("=== RECOMMEND CONTAINER ROUTE CALLED ===")
+        cleanup_old_files()  # Cleanup old uploads
+
+        file = request.files.get('file')
+        if file is None or file.filename == '':
+            return jsonify({'error': 'No file uploaded'}), 400
+        if not allowed_file(file.filename):
+            return jsonify({'error': 'Invalid file type. Please upload a CSV or Excel file'}), 400
+
+        transport_mode = request.form.get('transport_mode')
+        if not transport_mode or transport_mode not in TRANSPORT_MODES:
+            return jsonify({'error': 'Invalid transport mode selected'}), 400
+
+        _, items, warnings = _load_manifest(file)
+        if not items:
+            return jsonify({
+                'error': 'No valid items could be processed from the uploaded file.',
+                'details': 'Please check the file format and data. Warnings: ' + "; ".join(warnings)
+            }), 400
+
+        route_temperature = None
+        if request.form.get('route_temperature'):
+            route_temperature = float(request.form['route_temperature'])
+        time_budget = float(request.form['time_budget']) if request.form.get('time_budget') else GA_TIME_BUDGET_SECONDS
+        placement_engine = request.form.get('placement_engine') or PLACEMENT_ENGINE
+        if placement_engine not in PLACEMENT_ENGINES:
+            current_app.logger.warning(f"Invalid placement engine: {placement_engine}")
+            placement_engine = 'spaces'
+        constraint_weights, normalized_weights = _form_constraint_weights()
+
+        recommendation = recommend_container_type(
+            items, transport_mode,
+            top_k=int(request.form.get('top_k') or RECOMMEND_TOP_K),
+            route_temperature=route_temperature,
+            constraint_weights=constraint_weights,
+            fitness_weights=normalized_weights,
+            population_size=int(request.form.get('population_size') or 10),
+            generations=int(request.form.get('num_generations') or 8),
+            deadline_seconds=time_budget,
+            placement_engine=placement_engine,
+            occupancy_resolution=OCCUPANCY_RESOLUTION,
+            parallel_workers=FLEET_WORKERS,
+            fill_factor=FLEET_FILL_FACTOR
+        )
+        recommendation['warnings'] = warnings
+        current_app.logger.info(f"Recommended container type: {recommendation['recommended']} "
+                                f"({recommendation['wall_time_seconds']}s)")
+        return jsonify(recommendation)
+    except ValueError as e:
+        current_app.logger.error(f"Value error: {str(e)}")
+        return jsonify({'error': f'Invalid value in input: {str(e)}'}), 400
+    except Exception as e:
+        current_app.logger.error(f'Unexpected error during container recommendation: {str(e)}', exc_info=True)
+        return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
+
 def download_report_handler():
     """Handle the download report route"""
     if container_storage.current_container is None:
@@ -697,6 +883,7 @@ def clear_container_handler():
     """Handle the clear container route"""
     container_storage.current_container = None
     container_storage.current_report = None
+    container_storage.current_fleet = None
     return jsonify({'status': 'cleared'})
 
 def handle_socketio_update_request():
@@ -717,7 +904,8 @@ def generate_alternative_plan_handler():
     
     try:
         # Generate multiple arrangements
-        arrangements = container_storage.current_container.generate_multiple_arrangements(5)
+        arrangements = container_storage.current_container.generate_multiple_arrangements(
+            5, deadline_seconds=ALTERNATIVE_PLAN_DEADLINE_SECONDS, parallel_workers=FLEET_WORKERS)
         
         if not arrangements:
             return jsonify({
@@ -733,8 +921,11 @@ def generate_alternative_plan_handler():
                 'volume_utilization': float(container.volume_utilization * 100),
                 'items_packed': len(container.items),
                 'total_weight': float(container.total_weight),
-                'stability_score': float(container._calculate_stability_score()),
-                'weight_balance': float(container._calculate_weight_balance_score())
+                'stability_score': float(container.calculate_overall_stability_score()),
+                'weight_balance': float(container._calculate_weight_balance_score()),
+                'placement_hash': container.placement_hash,
+                'placement_engine': container.variant['placement_engine'],
+                'seed': container.variant['seed']
             }
             alternatives.append(alternative)
         
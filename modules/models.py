@@ -6,4 +6,5 @@ class ContainerStorage:
     """Global container storage for the application"""
     def __init__(self):
         self.current_container = None
-        self.current_report = None
\ No newline at end of file
+        self.current_report = None
+        self.current_fleet = None  # Plan of the last multi-container packing
\ No newline at end of file
@@ -86,15 +86,10 @@ def calculate_cog_impact(container, item):
 
 def calculate_item_interlocking(container, item):
     """Calculate how well item interlocks with others"""
-    contact_count = 0
     max_contacts = 6  # Maximum possible contacts (6 faces)
     
-    for other in container.items:
-        if other == item:
-            continue
-            
-        if has_surface_contact(item.position, item.dimensions, other):
-            contact_count += 1
+    # Items sharing a face with this one, from the container's contact graph
+    contact_count = len(container.contact_neighbors(item, significant_only=False))
             
     return contact_count / max_contacts
 
@@ -9,6 +9,7 @@ from optigenix_module.models.space import MaximalSpace
 from optigenix_module.models.container import EnhancedContainer
 from optigenix_module.optimization.genetic import optimize_packing_with_genetic_algorithm
 from optigenix_module.optimization.packer import PackingGenome, GeneticPacker
+from optigenix_module.optimization.recommendation import recommend_container_type
 from optigenix_module.optimization.temperature import TemperatureConstraintHandler
 from optigenix_module.utils import get_transport_config, can_interlock
 
@@ -23,6 +24,7 @@ __all__ = [
     'GeneticPacker',
     'TemperatureConstraintHandler',
     'optimize_packing_with_genetic_algorithm',
+    'recommend_container_type',
     'get_transport_config',
     'can_interlock'
 ]
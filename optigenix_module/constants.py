@@ -21,6 +21,20 @@ CONTAINER_TYPES = {
     'Flat-Rack-40ft': (12.19, 2.44, 2.44, 39340), # Added max payload weight
 }
 
+# Indicative freight cost per container (USD) used to rank container types; not a quote
+CONTAINER_COST_ESTIMATES = {
+    'Twenty-foot': 1500,
+    'Forty-foot': 2500,
+    'Forty-foot-HC': 2700,
+    'Forty-five-foot-HC': 3200,
+    'Reefer-20ft': 3000,
+    'Reefer-40ft': 4500,
+    'Open-Top-20ft': 2000,
+    'Open-Top-40ft': 3200,
+    'Flat-Rack-20ft': 2200,
+    'Flat-Rack-40ft': 3500,
+}
+
 # Transport modes with their available container types
 TRANSPORT_MODES = {
     '1': ('Road Transport', [
@@ -112,3 +126,13 @@ def get_predefined_container_dimensions(container_name: str):
     if container_fallback_info:
         return list(container_fallback_info[:3]) # Return L, W, H as a list
     return None # Or raise an error if the container name is not found
+
+def get_predefined_container_payload(container_name: str):
+    """Retrieve the maximum payload weight (kg) of a predefined container by name."""
+    container_info = CONTAINER_TYPES_DETAILED.get(container_name)
+    if container_info:
+        return container_info.get('max_weight')
+    container_fallback_info = CONTAINER_TYPES.get(container_name)
+    if container_fallback_info and len(container_fallback_info) > 3:
+        return container_fallback_info[3]
+    return None
@@ -9,6 +9,8 @@ import time
 from typing import Optional, Dict, Any, Union
 import logging
 
+from optigenix_module.utils.llm_cache import get_llm_response_cache
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -26,7 +28,8 @@ def get_llm_completion(
     api_key: Optional[str] = None,
     model: Optional[str] = None,
     retry_count: int = 3,
-    retry_delay: float = 2.0
+    retry_delay: float = 2.0,
+    cache_key: Optional[str] = None
 ) -> Optional[str]:
     """
     Get a completion from the LLM API
@@ -40,6 +43,8 @@ def get_llm_completion(
         model (str, optional): Override the default model
         retry_count (int): Number of retries on failure
         retry_delay (float): Delay between retries in seconds
+        cache_key (str, optional): Key for sharing the response through the
+                                   persistent LLM response cache
         
     Returns:
         Optional[str]: The LLM completion text or None on failure
@@ -51,6 +56,14 @@ def get_llm_completion(
     if not key:
         logger.error("No API key provided. Set OPENAI_API_KEY environment variable.")
         return None
+
+    cache = get_llm_response_cache() if cache_key else None
+    if cache is not None:
+        cache_key = f"completion:{model_name}:{cache_key}"
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Using cached LLM response: {cache_key}")
+            return cached
     
     headers = {
         "Content-Type": "application/json",
@@ -71,7 +84,10 @@ def get_llm_completion(
             if response.status_code == 200:
                 result = response.json()
                 if "choices" in result and len(result["choices"]) > 0:
-                    return result["choices"][0]["message"]["content"].strip()
+                    content = result["choices"][0]["message"]["content"].strip()
+                    if cache is not None and content:
+                        cache.put(cache_key, content)
+                    return content
                 else:
                     logger.error(f"Unexpected API response format: {result}")
             else:
@@ -148,7 +164,8 @@ class GroqClient:
         
         logger.info(f"Initialized Groq client with model: {self.model}")
         
-    def generate(self, prompt: str, temperature: float = 0.3, max_tokens: int = 800) -> str:
+    def generate(self, prompt: str, temperature: float = 0.3, max_tokens: int = 800,
+                 cache_key: Optional[str] = None) -> str:
         """
         Generate a response from the LLM
         
@@ -156,10 +173,20 @@ class GroqClient:
             prompt (str): The prompt to send
             temperature (float): Controls randomness
             max_tokens (int): Maximum response length
+            cache_key (str, optional): Key for sharing the response through the
+                                       persistent LLM response cache
             
         Returns:
             str: The generated response text
         """
+        cache = get_llm_response_cache() if cache_key else None
+        if cache is not None:
+            cache_key = f"groq:{self.model}:{cache_key}"
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Using cached LLM response: {cache_key}")
+                return cached
+
         headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_key}"
@@ -178,7 +205,10 @@ class GroqClient:
             if response.status_code == 200:
                 result = response.json()
                 if "choices" in result and len(result["choices"]) > 0:
-                    return result["choices"][0]["message"]["content"].strip()
+                    content = result["choices"][0]["message"]["content"].strip()
+                    if cache is not None and content:
+                        cache.put(cache_key, content)
+                    return content
                 else:
                     logger.error(f"Unexpected API response format: {result}")
             else:
@@ -0,0 +1,136 @@
+"""
+Batched geometry of the candidate placements of one item.
+
+A layer search scores every (position, rotation) candidate of an item, and
+each score asks the same questions of the placed boxes: overlap, support,
+face contacts and clearances. Answering them one candidate at a time costs a
+round of Python calls per candidate. The batch holds all candidates as arrays
+and answers each question for all of them against all placed boxes with one
+NumPy expression. Every kernel repeats the float operations of its scalar
+counterpart in the same order, so results are bit-for-bit identical.
+"""
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from .contact_graph import CONTACT_TOLERANCE, SIGNIFICANT_SHARE
+
+
+def ordered_sum(values: np.ndarray) -> np.ndarray:
+    """
+    Row sums of an (n, m) array added left to right, like sum() over a list.
+
+    np.sum adds pairwise and can round differently from the scalar loops it replaces.
+    """
+    if values.shape[1] == 0:
+        return np.zeros(values.shape[0])
+    return np.add.accumulate(values, axis=1)[:, -1]
+
+
+class CandidateBatch:
+    """
+    Candidate placements of one item as (n, 3) arrays
+
+    Pairwise kernels take placed boxes as (m, 3) arrays of positions,
+    dimensions and far corners (see SpatialIndex.arrays) and return (n, m)
+    arrays, one row per candidate.
+    """
+
+    def __init__(self, candidates: Sequence[Tuple[Tuple, Tuple]]):
+        """
+        Args:
+            candidates: (pos, dims) per candidate; the tuples are kept as given
+        """
+        self.candidates = list(candidates)
+        count = len(self.candidates)
+        self.low = np.array([pos for pos, _ in self.candidates], dtype=float).reshape(count, 3)
+        self.dims = np.array([dims for _, dims in self.candidates], dtype=float).reshape(count, 3)
+        self.high = self.low + self.dims
+
+    def __len__(self):
+        return len(self.candidates)
+
+    def take(self, keep) -> 'CandidateBatch':
+        """The candidates at the given indices, in that order"""
+        return CandidateBatch([self.candidates[k] for k in keep])
+
+    def overlap_lengths(self, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+        """Overlap of each candidate with each box along x, y and z, as an (n, m, 3) array (0 when apart)"""
+        return np.maximum(0, np.minimum(self.high[:, None], high[None]) - np.maximum(self.low[:, None], low[None]))
+
+    def overlapping(self, low: np.ndarray, high: np.ndarray, axes: Sequence[int] = (0, 1, 2)) -> np.ndarray:
+        """Whether each candidate overlaps each box along the given axes (touching faces do not count)"""
+        axes = list(axes)
+        return ((self.high[:, None, axes] > low[None][..., axes]) &
+                (high[None][..., axes] > self.low[:, None, axes])).all(axis=2)
+
+    def near(self, low: np.ndarray, high: np.ndarray, margin: float) -> np.ndarray:
+        """Boxes whose closed extent meets some candidate grown by margin, as an (m,) mask"""
+        return ((high[None] >= self.low[:, None] - margin) & (low[None] <= self.high[:, None] + margin)).all(axis=2).any(axis=0)
+
+    def face_contacts(self, low: np.ndarray, dims: np.ndarray, high: np.ndarray,
+                      tolerance: float = CONTACT_TOLERANCE) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Contacts between each candidate and each box, as contact_graph.face_contact computes them.
+
+        Returns:
+            (area, significant) arrays of shape (n, m)
+        """
+        area = np.zeros((len(self), len(low)))
+        significant = np.zeros((len(self), len(low)), dtype=bool)
+        # Boxes no candidate comes within tolerance of have no contacts
+        columns = np.flatnonzero(self.near(low, high, tolerance))
+        if len(columns):
+            area[:, columns], significant[:, columns] = self._face_contacts(
+                low[columns], dims[columns], high[columns], tolerance)
+        return area, significant
+
+    def _face_contacts(self, low, dims, high, tolerance):
+        """face_contacts over boxes that some candidate is near"""
+        overlap = self.overlap_lengths(low, high)
+        x_overlap, y_overlap, z_overlap = overlap[..., 0], overlap[..., 1], overlap[..., 2]
+        faces = ((np.abs(self.low[:, None] - high[None]) < tolerance) |
+                 (np.abs(self.high[:, None] - low[None]) < tolerance))
+        x_faces, y_faces, z_faces = faces[..., 0], faces[..., 1], faces[..., 2]
+        footprint = x_overlap * y_overlap
+        x_area = y_overlap * z_overlap
+        y_area = x_overlap * z_overlap
+
+        area = (np.where(x_faces, x_area, 0.0) + np.where(y_faces, y_area, 0.0)) + np.where(z_faces, footprint, 0.0)
+        w1, d1, h1 = (self.dims[:, axis, None] for axis in range(3))
+        w2, d2, h2 = (dims[None, :, axis] for axis in range(3))
+        significant = ((z_faces & (footprint > np.minimum(w1 * d1, w2 * d2) * SIGNIFICANT_SHARE)) |
+                       (y_faces & (y_area > np.minimum(w1 * h1, w2 * h2) * SIGNIFICANT_SHARE)) |
+                       (x_faces & (x_area > np.minimum(d1 * h1, d2 * h2) * SIGNIFICANT_SHARE)))
+        return area, significant
+
+    def clearances(self, low: np.ndarray, high: np.ndarray, container_dims: Sequence[float]) -> List[np.ndarray]:
+        """
+        Free distance from each candidate to the nearest box or wall in each direction, as SpatialIndex.clearances.
+
+        Returns:
+            Arrays of shape (n,) for -x, -y, +x, +y, -z and +z
+        """
+        # Only boxes crossing the candidates' height range can block a horizontal direction
+        layer = (low[:, 2] < self.high[:, 2].max()) & (high[:, 2] > self.low[:, 2].min())
+        sections = {}  # axis -> boxes that can block it and which candidates' cross-section each overlaps
+        distances = []
+        for axis, negative in ((0, True), (1, True), (0, False), (1, False), (2, True), (2, False)):
+            if axis not in sections:
+                boxes = layer if axis != 2 else slice(None)
+                section = [other for other in range(3) if other != axis]
+                sections[axis] = (low[boxes], high[boxes], self.overlapping(low[boxes], high[boxes], section))
+            box_low, box_high, crossing = sections[axis]
+            if negative:
+                face = self.low[:, axis]
+                wall = face
+                gap = face[:, None] - box_high[None, :, axis]
+                ahead = box_high[None, :, axis] <= face[:, None]
+            else:
+                face = self.high[:, axis]
+                wall = container_dims[axis] - face
+                gap = box_low[None, :, axis] - face[:, None]
+                ahead = box_low[None, :, axis] >= face[:, None]
+            nearest = np.where(crossing & ahead, gap, np.inf).min(axis=1, initial=np.inf)
+            distances.append(np.minimum(wall, nearest))
+        return distances
@@ -0,0 +1,149 @@
+"""
+Face-adjacency graph of the items placed in a container.
+
+Contact ratio, interlocking and insulation scores all ask which placed boxes
+share a face and over how much area. Answering that by testing every pair
+makes them quadratic in the item count. The graph records the contacts of
+each box once, when it is placed, using the spatial index to find the few
+boxes it can touch, and keeps running totals so the container-wide scores
+become lookups.
+"""
+from typing import Dict, List, Tuple
+
+from .item_mirror import ItemMirror
+
+# Faces closer than this touch (m), as in ContainerCore._has_surface_contact
+CONTACT_TOLERANCE = 0.001
+
+# Share of the smaller face that must be covered for a significant contact
+SIGNIFICANT_SHARE = 0.1
+
+
+def face_contact(pos1, dims1, pos2, dims2, tolerance: float = CONTACT_TOLERANCE) -> Tuple[float, float, bool]:
+    """
+    Contact between two boxes.
+
+    Args:
+        pos1, dims1: Position and (rotated) dimensions of the first box
+        pos2, dims2: Position and (rotated) dimensions of the second box
+        tolerance: Maximum distance between touching faces
+
+    Returns:
+        (area, footprint, significant): area is the total area of the touching
+        faces, footprint the overlap of the two boxes' floor rectangles, and
+        significant whether ContainerCore._has_surface_contact holds, i.e. a
+        touching face pair overlaps by more than 10% of the smaller face
+    """
+    x1, y1, z1 = pos1
+    w1, d1, h1 = dims1
+    x2, y2, z2 = pos2
+    w2, d2, h2 = dims2
+    x_overlap = max(0, min(x1 + w1, x2 + w2) - max(x1, x2))
+    y_overlap = max(0, min(y1 + d1, y2 + d2) - max(y1, y2))
+    z_overlap = max(0, min(z1 + h1, z2 + h2) - max(z1, z2))
+    x_faces = abs(x1 - (x2 + w2)) < tolerance or abs((x1 + w1) - x2) < tolerance
+    y_faces = abs(y1 - (y2 + d2)) < tolerance or abs((y1 + d1) - y2) < tolerance
+    z_faces = abs(z1 - (z2 + h2)) < tolerance or abs((z1 + h1) - z2) < tolerance
+    footprint = x_overlap * y_overlap
+
+    area = 0
+    if x_faces:
+        area += y_overlap * z_overlap
+    if y_faces:
+        area += x_overlap * z_overlap
+    if z_faces:
+        area += footprint
+    significant = ((z_faces and footprint > min(w1 * d1, w2 * d2) * SIGNIFICANT_SHARE) or
+                   (y_faces and x_overlap * z_overlap > min(w1 * h1, w2 * h2) * SIGNIFICANT_SHARE) or
+                   (x_faces and y_overlap * z_overlap > min(d1 * h1, d2 * h2) * SIGNIFICANT_SHARE))
+    return area, footprint, significant
+
+
+def box_contacts(pos, dims, items: List, index, tolerance: float = CONTACT_TOLERANCE) -> List[Tuple[int, float, float, bool]]:
+    """
+    Contacts a box at pos with dims has, or would have, with placed items.
+
+    Args:
+        pos: (x, y, z) of the box
+        dims: (w, d, h) of the box
+        items: Placed items
+        index: SpatialIndex synced with items
+        tolerance: Maximum distance between touching faces
+
+    Returns:
+        (slot, area, footprint, significant) per touching item, in placement order
+    """
+    found = []
+    for slot in index.near(pos, dims, tolerance):
+        other = items[slot]
+        area, footprint, significant = face_contact(pos, dims, other.position, other.dimensions, tolerance)
+        if area > 0 or significant:
+            found.append((slot, area, footprint, significant))
+    return found
+
+
+class ContactGraph(ItemMirror):
+    """
+    Incrementally maintained face contacts between placed boxes
+
+    Every pair of boxes with touching faces is an edge holding its contact
+    area, floor-rectangle overlap and significance (see face_contact).
+
+    Attributes:
+        contact_area: Total touching-face area over all edges
+        support_area: Total floor-rectangle overlap over significant edges,
+                      accumulated in placement order
+        surface_area: Total surface area of the placed boxes
+        significant_contacts: Number of significant edges
+    """
+
+    def __init__(self, tolerance: float = CONTACT_TOLERANCE):
+        """
+        Args:
+            tolerance: Maximum distance between touching faces
+        """
+        self.tolerance = tolerance
+        super().__init__()
+
+    def _rebuild(self):
+        """Forget every placed box"""
+        self.edges: List[Dict[int, Tuple[float, float, bool]]] = []  # Per slot: neighbour slot -> contact
+        self.contact_area = 0.0
+        self.support_area = 0.0
+        self.surface_area = 0.0
+        self.significant_contacts = 0
+        self._slots = {}  # id(item) -> slot
+
+    def _append(self, item, index):
+        """
+        Add a placed item and its contacts with the boxes placed before it.
+
+        Args:
+            item: The placed item
+            index: SpatialIndex synced with the same item list (passed through sync)
+        """
+        slot = len(self._items)
+        contacts = box_contacts(item.position, item.dimensions, self._source, index, self.tolerance) if slot else []
+        self._slots[id(item)] = slot
+        own = {}
+        self.edges.append(own)
+        w, d, h = item.dimensions
+        self.surface_area += 2 * (w * d + d * h + w * h)
+        for other, area, footprint, significant in contacts:
+            if other >= slot:  # The index may already hold items the graph has not reached
+                continue
+            edge = (area, footprint, significant)
+            own[other] = edge
+            self.edges[other][slot] = edge
+            self.contact_area += area
+            if significant:
+                self.support_area += footprint
+                self.significant_contacts += 1
+
+    def slot(self, item) -> int:
+        """Slot of a placed item, -1 when it is not in the graph"""
+        return self._slots.get(id(item), -1)
+
+    def neighbors(self, slot: int, significant_only: bool = True) -> List[int]:
+        """Slots of the boxes touching the box in slot, in placement order"""
+        return sorted(other for other, edge in self.edges[slot].items() if edge[2] or not significant_only)
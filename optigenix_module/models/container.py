@@ -5,6 +5,7 @@ import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.subplots as sp
+import copy
 import random
 from datetime import datetime
 import json
@@ -15,7 +16,9 @@ from dash.dependencies import Input, Output
 
 from optigenix_module.models.item import Item
 from optigenix_module.models.space import MaximalSpace
-from optigenix_module.models.container_core import ContainerCore
+from optigenix_module.models.container_core import ContainerCore, check_placement_engine
+from optigenix_module.models.occupancy_grid import check_occupancy_resolution
+from optigenix_module.models.units import check_units, to_meters, to_units
 from optigenix_module.models.container_metrics import ContainerMetrics
 from optigenix_module.models.container_packing import ContainerPacking
 from optigenix_module.models.container_visualization import ContainerVisualization
@@ -30,22 +33,39 @@ class EnhancedContainer(ContainerCore, ContainerMetrics, ContainerPacking,
     packing algorithms, visualization tools, and reporting capabilities.
     """
     
-    def __init__(self, dimensions, route_temperature=None):
-        """Initialize container with specified dimensions and optional route temperature"""
+    def __init__(self, dimensions, route_temperature=None, placement_engine='spaces', occupancy_resolution=None,
+                 units='m'):
+        """
+        Initialize container with specified dimensions and optional route temperature
+
+        Args:
+            placement_engine: Candidate-position generator, 'spaces' (maximal free spaces)
+                              or 'extreme_points' (see ContainerCore.candidate_positions)
+            occupancy_resolution: Voxel edge (m) of an occupancy bitmap that pre-filters
+                                  overlap checks on dense manifests; None disables it
+            units: Coordinate units of the packing geometry, 'm' or 'mm' (integer millimetres,
+                   see models.units). Dimensions are always given in metres. Only genome
+                   evaluation packs in millimetres; pack_items needs 'm'.
+        """
         # Validate dimensions
         if not all(isinstance(d, (int, float)) and d > 0 for d in dimensions):
             raise ValueError("Container dimensions must be positive numbers")
         if len(dimensions) != 3:
             raise ValueError("Container must have exactly 3 dimensions (length, width, height)")
             
-        self.dimensions = tuple(float(d) for d in dimensions)
+        self.units = check_units(units)
+        self.dimensions = tuple(to_units(d, self.units) for d in dimensions)
+        self.placement_engine = check_placement_engine(placement_engine)
+        self.occupancy_resolution = check_occupancy_resolution(occupancy_resolution)
         self.items = []
+        self._item_index = None  # SpatialIndex over self.items, built on first placement check
         
         # Store route temperature for temperature-sensitive item handling
         self.route_temperature = route_temperature
         
         # Create completely separate space systems for temperature-sensitive and normal items
-        wall_buffer = 0.1  # 10cm buffer from walls
+        wall_buffer = to_units(0.1, self.units)  # 10cm buffer from walls
+        dimensions = self.dimensions
         
         # 1. Standard space - for regular items (includes positions near walls)
         standard_space = MaximalSpace(0, 0, 0, dimensions[0], dimensions[1], dimensions[2])
@@ -65,6 +85,7 @@ class EnhancedContainer(ContainerCore, ContainerMetrics, ContainerPacking,
         
         # Initialize with both spaces - they'll be kept separate throughout packing
         self.spaces = [standard_space, temp_safe_space]
+        self.live_space_counts = []  # Number of free spaces (or extreme points) after each placement
         
         # Initialize other container properties
         self.weight_distribution = {}
@@ -84,7 +105,40 @@ class EnhancedContainer(ContainerCore, ContainerMetrics, ContainerPacking,
             print(f"\n🌡️ CONTAINER INITIALIZED WITH TEMPERATURE SYSTEM")
             print(f"   Route temperature: {route_temperature}°C")
             print(f"   Temperature-sensitive items will use temperature-safe spaces")
-            print(f"   Wall buffer: {wall_buffer*100:.1f}cm from all container walls")
-            print(f"   Available space for temperature-sensitive items: {temp_safe_space.width:.2f}m × {temp_safe_space.depth:.2f}m × {temp_safe_space.height:.2f}m\n")
+            print(f"   Wall buffer: {to_meters(wall_buffer, self.units)*100:.1f}cm from all container walls")
+            safe_dims = [to_meters(d, self.units) for d in (temp_safe_space.width, temp_safe_space.depth, temp_safe_space.height)]
+            print(f"   Available space for temperature-sensitive items: {safe_dims[0]:.2f}m × {safe_dims[1]:.2f}m × {safe_dims[2]:.2f}m\n")
+
+    def generate_multiple_arrangements(self, count=5, deadline_seconds=None, parallel_workers=None, seed=0):
+        """
+        Alternative arrangements of this container's items (see optimization.arrangements)
+
+        The packed and unpacked items are packed again by a portfolio of differently
+        weighted runs in parallel; layouts that match the current one are left out.
+
+        Args:
+            count: Maximum number of arrangements returned
+            deadline_seconds: Wall-clock budget for the runs; None for no limit
+            parallel_workers: Worker processes running variants; None uses one per CPU
+            seed: Seed of the weight perturbations
+
+        Returns:
+            List of (EnhancedContainer, score) pairs, best score first
+        """
+        from optigenix_module.optimization.arrangements import generate_arrangements, placement_hash
 
-    # generate_alternative_arrangement method removed
\ No newline at end of file
+        units = []
+        for item in (list(self.items) + [item for _, item in self.unpacked_reasons.values()] +
+                     list(getattr(self, 'unpacked_items', []))):
+            unit = copy.copy(item)
+            unit.position = None
+            unit.dimensions = item.unrotated_dimensions()
+            unit.items_above = []
+            units.append(unit)
+        return generate_arrangements(units, [to_meters(d, self.units) for d in self.dimensions], count,
+                                     constraint_weights=getattr(self, 'constraint_weights', None),
+                                     route_temperature=self.route_temperature,
+                                     placement_engine=self.placement_engine,
+                                     occupancy_resolution=self.occupancy_resolution,
+                                     deadline_seconds=deadline_seconds, parallel_workers=parallel_workers,
+                                     seed=seed, exclude=[placement_hash(self)])
\ No newline at end of file
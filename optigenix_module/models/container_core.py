@@ -2,14 +2,228 @@
 Core functionality for the EnhancedContainer class
 """
 import numpy as np
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from optigenix_module.models.item import Item
 from optigenix_module.models.space import MaximalSpace
+from optigenix_module.models.space_store import SpaceStore
+from optigenix_module.models.extreme_points import ExtremePoints
+from optigenix_module.models.spatial_index import SpatialIndex
+from optigenix_module.models.height_map import HeightMap, DEFAULT_RESOLUTION as HEIGHT_MAP_RESOLUTION
+from optigenix_module.models.contact_graph import CONTACT_TOLERANCE, ContactGraph, box_contacts
+from optigenix_module.models.candidate_batch import CandidateBatch
+from optigenix_module.models.load_totals import LoadTotals
+from optigenix_module.models.layer_index import LayerIndex
+from optigenix_module.models.occupancy_grid import OccupancyGrid
+from optigenix_module.models.units import to_units
 from modules.utils import check_overlap_2d
 
+# Candidate-position generators a container can pack with (see ContainerCore.candidate_positions)
+PLACEMENT_ENGINES = ('spaces', 'extreme_points')
+
+
+def check_placement_engine(engine: str) -> str:
+    """Validate a placement engine name"""
+    if engine not in PLACEMENT_ENGINES:
+        raise ValueError(f"Unknown placement engine: {engine} (expected one of {', '.join(PLACEMENT_ENGINES)})")
+    return engine
+
+
 class ContainerCore:
     """Contains core container operations and basic geometry checks"""
+
+    @property
+    def spaces(self) -> SpaceStore:
+        """Free spaces of the container; assigning a list stores it as a SpaceStore"""
+        return self._space_store
+
+    @spaces.setter
+    def spaces(self, spaces):
+        self._space_store = spaces if isinstance(spaces, SpaceStore) else SpaceStore(spaces)
+
+    def _length(self, meters: float):
+        """A length given in metres in the container's coordinate units"""
+        return to_units(meters, getattr(self, 'units', 'm'))
+
+    def _spatial_index(self) -> SpatialIndex:
+        """Spatial index of the placed items, brought up to date with self.items"""
+        index = getattr(self, '_item_index', None)
+        if index is None:
+            index = self._item_index = SpatialIndex(self.dimensions)
+        index.sync(self.items)
+        return index
+
+    def _height_map(self) -> HeightMap:
+        """Height map of the placed items, brought up to date with self.items"""
+        height_map = getattr(self, '_item_height_map', None)
+        if height_map is None:
+            height_map = self._item_height_map = HeightMap(self.dimensions, self._length(HEIGHT_MAP_RESOLUTION))
+        height_map.sync(self.items)
+        return height_map
+
+    def _extreme_points(self) -> ExtremePoints:
+        """Extreme points of the placed items, brought up to date with self.items"""
+        points = getattr(self, '_item_extreme_points', None)
+        if points is None:
+            points = self._item_extreme_points = ExtremePoints(self.dimensions, self._length(0.1))
+        points.sync(self.items)
+        return points
+
+    def _contact_graph(self) -> ContactGraph:
+        """Contact graph of the placed items, brought up to date with self.items"""
+        graph = getattr(self, '_item_contacts', None)
+        if graph is None:
+            graph = self._item_contacts = ContactGraph()
+        graph.sync(self.items, self._spatial_index())
+        return graph
+
+    def _load_totals(self) -> LoadTotals:
+        """Running weight, moment and volume totals of the placed items, brought up to date with self.items"""
+        totals = getattr(self, '_item_load_totals', None)
+        if totals is None:
+            totals = self._item_load_totals = LoadTotals()
+        totals.sync(self.items)
+        return totals
+
+    def _layer_index(self) -> LayerIndex:
+        """Sorted heights of the placed item tops, brought up to date with self.items"""
+        layers = getattr(self, '_item_layers', None)
+        if layers is None:
+            layers = self._item_layers = LayerIndex()
+        layers.sync(self.items)
+        return layers
+
+    def _occupancy_grid(self) -> Optional[OccupancyGrid]:
+        """Voxel occupancy of the placed items, brought up to date with self.items; None when disabled"""
+        resolution = getattr(self, 'occupancy_resolution', None)
+        if resolution is None:
+            return None
+        resolution = self._length(resolution)
+        grid = getattr(self, '_item_occupancy', None)
+        if grid is None or grid.resolution != resolution:
+            grid = self._item_occupancy = OccupancyGrid(self.dimensions, resolution)
+        grid.sync(self.items)
+        return grid
+
+    def surface_contacts(self, pos, dims) -> List[Tuple[Item, float, float]]:
+        """
+        Placed items a box at pos with dims has significant surface contact with (see _has_surface_contact).
+
+        Only the items the spatial index finds next to the box are tested.
+
+        Args:
+            pos: (x, y, z) of the box
+            dims: (w, d, h) of the box
+
+        Returns:
+            (item, contact area, floor overlap) per item, in placement order
+        """
+        items = self.items
+        return [(items[slot], area, footprint)
+                for slot, area, footprint, significant in box_contacts(pos, dims, items, self._spatial_index())
+                if significant]
+
+    def contact_neighbors(self, item, significant_only: bool = True) -> List[Item]:
+        """
+        Placed items touching a placed item, read from the contact graph.
+
+        Args:
+            item: An item of self.items
+            significant_only: Only items in significant surface contact (see _has_surface_contact)
+
+        Returns:
+            List of items in placement order, empty when item is not placed
+        """
+        graph = self._contact_graph()
+        slot = graph.slot(item)
+        if slot < 0:
+            return []
+        return [self.items[other] for other in graph.neighbors(slot, significant_only)]
+
+    def free_space_count(self) -> int:
+        """Number of live free spaces, or of extreme points with the 'extreme_points' engine"""
+        if self.placement_engine == 'extreme_points':
+            return len(self._extreme_points())
+        return len(self.spaces)
+
+    def candidate_positions(self, dims, z: Optional[float] = None,
+                            temperature_safe: bool = False) -> List[Tuple[Tuple[float, float, float], Optional[MaximalSpace]]]:
+        """
+        Candidate positions for a box, from the container's placement engine.
+
+        With 'spaces' these are the corners of the free spaces that can hold
+        the box; with 'extreme_points' the extreme points where it stays inside
+        the container. Callers still check each position with _is_valid_placement.
+
+        Args:
+            dims: Box dimensions (w, d, h)
+            z: Only positions at this height (within 1 mm, exactly with integer millimetres)
+            temperature_safe: Only positions in the temperature-safe zone
+
+        Returns:
+            List of (position, space) pairs in trial order, one per position;
+            space is the first free space offering it, None for extreme points
+        """
+        if self.placement_engine == 'extreme_points':
+            return [(point, None) for point in self._extreme_points().candidates(dims, z, temperature_safe)]
+        # Overlapping free spaces often share a corner; each position is offered once, with its first space
+        candidates = {}
+        for space in self.spaces.fitting(dims, z, temperature_safe):
+            candidates.setdefault((space.x, space.y, space.z), space)
+        return list(candidates.items())
+
+    def top_surface(self, pos, footprint) -> float:
+        """
+        Highest top of the placed items under a footprint (0.0 on the bare floor).
+
+        Args:
+            pos: (x, y) of the footprint's corner
+            footprint: (width, depth)
+        """
+        return self._height_map().top_surface(pos, footprint)
+
+    def items_below(self, pos, footprint, tolerance: float = 0.001) -> List[Item]:
+        """
+        Placed items whose top face is at pos's z and overlaps the footprint.
+
+        Answered from the height map; when it is ambiguous (items hidden under
+        higher ones, several tops in one cell) the spatial index gives the answer.
+
+        Args:
+            pos: (x, y, z) of the footprint's corner
+            footprint: (width, depth)
+            tolerance: Maximum distance between an item top and z; 0 requires exact equality
+
+        Returns:
+            List of items, in placement order
+        """
+        found = self._height_map().items_below(pos, footprint, tolerance)
+        if found is None:
+            found = self._spatial_index().items_below(pos, footprint, tolerance)
+        return found
+
+    def support_area(self, pos, footprint, stackable_only: bool = False) -> float:
+        """
+        Area of a footprint at pos's z resting on the tops of placed items.
+
+        Args:
+            pos: (x, y, z) of the footprint's corner
+            footprint: (width, depth)
+            stackable_only: Only count support from stackable items
+
+        Returns:
+            float: Supported area (the full footprint on the floor)
+        """
+        x, y, z = pos
+        w, d = footprint
+        if z == 0:
+            return w * d
+        return sum(
+            self._calculate_overlap_area((x, y, w, d), (below.position[0], below.position[1],
+                                                        below.dimensions[0], below.dimensions[1]))
+            for below in self.items_below(pos, footprint)
+            if below.stackable or not stackable_only
+        )
     
     def _get_valid_rotations(self, item):
         """Get all valid rotations considering container constraints"""
@@ -70,14 +284,13 @@ class ContainerCore:
             x < 0 or y < 0 or z < 0):
             return False
             
-        # Check overlap with other items
-        for placed_item in self.items:
-            if self._check_overlap_3d(
-                (x, y, z, w, d, h),
-                (placed_item.position[0], placed_item.position[1], placed_item.position[2],
-                 placed_item.dimensions[0], placed_item.dimensions[1], placed_item.dimensions[2])
-            ):
-                return False
+        # Check overlap with other items; the occupancy bitmap rejects most overlaps with one array test
+        grid = self._occupancy_grid()
+        if grid is not None and grid.blocked(pos, dims):
+            return False
+        index = self._spatial_index()
+        if index.overlaps(pos, dims):
+            return False
                 
         # Check stackability and fragility
         if z > 0:  # If not on the ground
@@ -109,52 +322,108 @@ class ContainerCore:
                       # Check if current item can support weight above it based on its fragility
             if item.fragility == 'HIGH':
                 # Don't allow any items to be stacked on high fragility items
-                for placed_item in self.items:
-                    if (placed_item.position and 
-                        placed_item.position[2] > z + h and
-                        check_overlap_2d(
-                            (x, y, w, d),
-                            (placed_item.position[0], placed_item.position[1],
-                             placed_item.dimensions[0], placed_item.dimensions[1])
-                        )):                        return False
+                if index.any_above((x, y), (w, d), z + h):
+                    return False
                 
         return True
         
+    def _layer_arrays(self, batch: CandidateBatch) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Placed items whose height range meets a batch's candidates, as arrays.
+
+        Only these items can overlap, support or touch a candidate.
+
+        Returns:
+            (slots, positions, dimensions, far corners); slots index self.items
+        """
+        low, dims, high = self._spatial_index().arrays()
+        bottom = batch.low[:, 2].min() - CONTACT_TOLERANCE
+        top = batch.high[:, 2].max() + CONTACT_TOLERANCE
+        slots = np.flatnonzero((high[:, 2] >= bottom) & (low[:, 2] <= top))
+        return slots, low[slots], dims[slots], high[slots]
+
+    def _support_arrays(self, batch: CandidateBatch) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        items_below for every candidate of a batch.
+
+        The height map answers items_below when it can, ignoring overlaps within
+        float noise of its grid lines; it finds every item the exact test finds
+        unless their floor cells are disjoint. Only candidates with such an
+        item ask items_below for their set.
+
+        Returns:
+            (slots, positions, dimensions, far corners, below) of the placed
+            items under some candidate; below is an (n, m) mask of the items
+            each candidate rests on
+        """
+        slots, low, dims, high = self._layer_arrays(batch)
+        z = batch.low[:, 2]
+        below = np.abs(high[None, :, 2] - z[:, None]) < 0.001
+        columns = np.flatnonzero(below.any(axis=0))
+        slots, low, dims, high = slots[columns], low[columns], dims[columns], high[columns]
+        below = below[:, columns] & batch.overlapping(low, high, (0, 1))
+        columns = np.flatnonzero(below.any(axis=0))
+        slots, low, dims, high, below = slots[columns], low[columns], dims[columns], high[columns], below[:, columns]
+
+        start, end = self._height_map().cell_bounds(batch.low, batch.high)
+        item_start, item_end = self._height_map().cell_bounds(low, high)
+        shared = (np.maximum(start[:, None], item_start[None]) < np.minimum(end[:, None], item_end[None])).all(axis=2)
+        for k in np.flatnonzero((below & ~shared).any(axis=1) & (z > 0)):
+            pos, rotation = batch.candidates[k]
+            found = {id(below_item) for below_item in self.items_below(pos, (rotation[0], rotation[1]))}
+            hits = np.flatnonzero(below[k])
+            below[k, hits] = [id(self.items[slot]) in found for slot in slots[hits].tolist()]
+        return slots, low, dims, high, below
+
+    def _valid_placement_mask(self, item: Item, batch: CandidateBatch) -> np.ndarray:
+        """
+        _is_valid_placement for every candidate of a batch at once.
+
+        Args:
+            item: Item to place
+            batch: Candidate positions and rotated dimensions of the item
+
+        Returns:
+            Boolean array, True where the placement is valid
+        """
+        x, y, z = batch.low.T
+        x1, y1, z1 = batch.high.T
+        valid = ((x1 <= self.dimensions[0]) & (y1 <= self.dimensions[1]) & (z1 <= self.dimensions[2]) &
+                 (x >= 0) & (y >= 0) & (z >= 0))
+
+        slots, low, dims, high = self._layer_arrays(batch)
+        valid &= ~batch.overlapping(low, high).any(axis=1)
+
+        raised = z > 0
+        if not raised.any():
+            return valid
+        slots, low, dims, high, below = self._support_arrays(batch)
+        items = [self.items[slot] for slot in slots]
+        refused = np.array([below_item.fragility == 'HIGH' or not below_item.stackable for below_item in items],
+                           dtype=bool)
+        load_bearing = np.array([below_item.load_bearing for below_item in items], dtype=float)
+        overlap = batch.overlap_lengths(low, high)
+        weight_ratio = overlap[..., 0] * overlap[..., 1] / (dims[:, 0] * dims[:, 1])
+        overloaded = (load_bearing > 0) & (item.weight > load_bearing * weight_ratio)
+        supported = below.any(axis=1) & ~(below & (refused | overloaded)).any(axis=1)
+        if item.fragility == 'HIGH':
+            all_low, _, all_high = self._spatial_index().arrays()
+            above = (all_low[None, :, 2] > z1[:, None]) & batch.overlapping(all_low, all_high, (0, 1))
+            supported &= ~above.any(axis=1)
+        return valid & (~raised | supported)
+
     def _get_items_below(self, pos: Tuple[float, float, float], 
                         dims: Tuple[float, float]) -> List[Item]:
         """Find items directly below the given position"""
-        x, y, z = pos
-        w, d = dims
-        items_below = []
-        
-        for item in self.items:
-            if (abs(item.position[2] + item.dimensions[2] - z) < 0.001 and
-                check_overlap_2d(
-                    (x, y, w, d),
-                    (item.position[0], item.position[1], 
-                     item.dimensions[0], item.dimensions[1])
-                )):
-                items_below.append(item)
-                
-        return items_below
+        return self.items_below(pos, dims)
 
     def _has_support(self, pos, dims):
         """Check if position has support from below"""
         if pos[2] == 0:  # On the ground
             return True
             
-        x, y, z = pos
-        w, d, h = dims
-          # Check if there's an item directly below
-        for item in self.items:
-            if (item.position[2] + item.dimensions[2] == z and
-                check_overlap_2d(
-                    (x, y, w, d),
-                    (item.position[0], item.position[1], 
-                     item.dimensions[0], item.dimensions[1])
-                )):
-                return True
-        return False
+        # Check if there's an item directly below
+        return bool(self.items_below(pos, dims[:2], tolerance=0))
 
     def _can_merge_spaces(self, s1: MaximalSpace, s2: MaximalSpace) -> bool:
         """Check if two spaces can be merged"""
@@ -171,6 +440,11 @@ class ContainerCore:
 
     def _merge_spaces(self):
         """Merge overlapping spaces"""
+        if not self.spaces.has_merge_candidates():
+            # Without merges the two sorts below only move new spaces into placement order
+            self.spaces.sort_for_placement()
+            return
+
         # First sort spaces by size and position to prioritize optimal merging
         self.spaces.sort(key=lambda s: (-s.get_volume(), s.x, s.y, s.z))
         
@@ -193,42 +467,74 @@ class ContainerCore:
             min(s.width, s.depth)  # Prefer spaces with similar dimensions for better interlocking
         ))
 
-    def _update_spaces(self, pos, dims, used_space=None):
-        """Update available spaces after placing an item"""
+    def _split_space(self, pos, dims, used_space):
+        """
+        Replace the space an item was placed in by the pieces above, to the
+        right of and in front of the item, then merge x-adjacent spaces.
+
+        Other spaces the item overlaps are left as they are; placements in
+        them are rejected by _is_valid_placement.
+        """
         x, y, z = pos
         w, d, h = dims
         
-        if used_space:
-            # Remove used space
-            self.spaces.remove(used_space)
-            
-            # Generate new spaces
-            new_spaces = []
+        # Remove used space
+        self.spaces.remove(used_space)
+        
+        # Generate new spaces
+        new_spaces = []
+        
+        # Space above the item
+        if used_space.height > h:
+            new_spaces.append(MaximalSpace(
+                x, y, z + h,
+                w, used_space.height - h, d
+            ))
             
-            # Space above the item
-            if used_space.height > h:
-                new_spaces.append(MaximalSpace(
-                    x, y, z + h,
-                    w, used_space.height - h, d
-                ))
-                
-            # Space to the right
-            if used_space.width > w:
-                new_spaces.append(MaximalSpace(
-                    x + w, y, z,
-                    used_space.width - w, used_space.height, used_space.depth
-                ))
-                
-            # Space to the front
-            if used_space.depth > d:
-                new_spaces.append(MaximalSpace(
-                    x, y + d, z,
-                    used_space.width, used_space.height, used_space.depth - d
-                ))
+        # Space to the right
+        if used_space.width > w:
+            new_spaces.append(MaximalSpace(
+                x + w, y, z,
+                used_space.width - w, used_space.height, used_space.depth
+            ))
             
-            # Add new spaces and merge overlapping ones
-            self.spaces.extend(new_spaces)
-            self._merge_spaces()
+        # Space to the front
+        if used_space.depth > d:
+            new_spaces.append(MaximalSpace(
+                x, y + d, z,
+                used_space.width, used_space.height, used_space.depth - d
+            ))
+        
+        # Add new spaces and merge overlapping ones
+        self.spaces.extend(new_spaces)
+        self._merge_spaces()
+
+    def _update_spaces(self, pos, dims, used_space=None, maximal: bool = True):
+        """
+        Update available spaces after placing an item.
+
+        By default every free space the item intersects, not only the one it
+        was placed in, is replaced by its parts around the item, and parts
+        contained in another free space are dropped (see SpaceStore.carve).
+        The store keeps only maximal empty boxes and stays bounded as the
+        container fills up. With the 'extreme_points' engine the extreme
+        points are updated instead and the spaces are left alone.
+
+        Args:
+            pos: (x, y, z) of the placed item
+            dims: Placed (rotated) dimensions (w, d, h)
+            used_space: Space the item was placed in; it is among the intersected spaces
+            maximal: False splits only used_space instead (see _split_space), the
+                     space model the layer-by-layer heuristic of pack_items is tuned for
+        """
+        if self.placement_engine != 'extreme_points':
+            if maximal or used_space is None:
+                spaces = self.spaces
+                spaces.carve((pos[0], pos[1], pos[2], pos[0] + dims[0], pos[1] + dims[1], pos[2] + dims[2]))
+                spaces.sort_for_placement()
+            else:
+                self._split_space(pos, dims, used_space)
+        self.live_space_counts.append(self.free_space_count())
 
     def _check_stackability(self, item: Item, pos: Tuple[float, float, float]) -> bool:
         """Check if an item can be stacked at the given position"""
@@ -11,15 +11,13 @@ class ContainerMetrics:
     def _update_metrics(self):
         """Enhanced metrics calculation with error handling"""
         try:
-            # Calculate packed volume safely
-            packed_volume = sum(
-                max(0, item.dimensions[0]) * max(0, item.dimensions[1]) * max(0, item.dimensions[2])
-                for item in self.items
-            )
+            # Packed volume and weight are kept as running totals
+            totals = self._load_totals()
+            packed_volume = totals.volume
             
             # Update metrics with bounds checking - store as decimal (0.0-1.0) not percentage
             self.volume_utilization = min(1.0, packed_volume / max(0.001, self.total_volume))
-            self.total_weight = sum(max(0, item.weight) for item in self.items)
+            self.total_weight = max(0, totals.weight)
             self.remaining_volume = max(0, self.total_volume - packed_volume)
 
             # Update center of gravity
@@ -35,17 +33,11 @@ class ContainerMetrics:
 
     def _update_center_of_gravity(self):
         """Calculate center of gravity after each item placement"""
-        total_moment = np.array([0.0, 0.0, 0.0])
-        self.total_weight = 0
-        
-        for item in self.items:
-            pos = np.array(item.position)
-            center = pos + np.array(item.dimensions) / 2
-            total_moment += center * item.weight
-            self.total_weight += item.weight
+        totals = self._load_totals()
+        self.total_weight = totals.weight
             
         if self.total_weight > 0:
-            self.center_of_gravity = total_moment / self.total_weight
+            self.center_of_gravity = np.array(totals.moment, dtype=float) / self.total_weight
 
     def _update_weight_distribution(self, item) -> None:
         """Update weight distribution when placing a new item"""
@@ -87,13 +79,8 @@ class ContainerMetrics:
         if not self.items:
             return 0.0
             
-        total_contacts = 0
-        for item in self.items:
-            for other in self.items:
-                if item != other and self._has_surface_contact(
-                    item.position, item.dimensions, other
-                ):
-                    total_contacts += 1
+        # Every significant contact in the contact graph touches two items
+        total_contacts = 2 * self._contact_graph().significant_contacts
                     
         # Return normalized score (0-1, higher is better)
         max_possible_contacts = len(self.items) * 6  # Each item can touch 6 sides
@@ -105,23 +92,13 @@ class ContainerMetrics:
         w, d, h = dims
         score = 0
         
-        # Check support from below
-        support_area = 0
-        total_area = w * d
-        items_below = self._get_items_below(pos, (w, d))
-        
         # Ground placement is most stable
         if z == 0:
             return 1.0
             
-        # Calculate support from items below
-        for below_item in items_below:
-            overlap = self._calculate_overlap_area(
-                (x, y, w, d),
-                (below_item.position[0], below_item.position[1],
-                 below_item.dimensions[0], below_item.dimensions[1])
-            )
-            support_area += overlap
+        # Check support from below
+        total_area = w * d
+        support_area = self.support_area(pos, (w, d))
             
         # Calculate support ratio
         support_ratio = support_area / total_area
@@ -306,30 +283,10 @@ class ContainerMetrics:
         if not self.items or len(self.items) < 2:
             return 0.0
             
-        total_contact_area = 0.0
-        total_surface_area = 0.0
-        
-        for item in self.items:
-            if not (hasattr(item, 'position') and item.position and hasattr(item, 'dimensions')):
-                continue
-                
-            # Calculate total surface area for this item
-            w, d, h = item.dimensions
-            item_surface_area = 2 * (w*d + w*h + d*h)
-            total_surface_area += item_surface_area
-            
-            # Calculate contact area with other items
-            for other_item in self.items:
-                if item != other_item and hasattr(other_item, 'position') and other_item.position:
-                    contact_area = self._calculate_contact_area_between_items(
-                        item.position, item.dimensions, other_item
-                    )
-                    total_contact_area += contact_area
-        
-        # Avoid double counting (each contact is counted twice in the loop above)
-        total_contact_area /= 2
-        
-        return total_contact_area / total_surface_area if total_surface_area > 0 else 0.0
+        # The contact graph keeps the touching-face area of every pair (counted once)
+        # and the surface area of every item as running totals
+        graph = self._contact_graph()
+        return graph.contact_area / graph.surface_area if graph.surface_area > 0 else 0.0
     
     def _calculate_contact_area_between_items(self, pos, dims, other_item):
         """Calculate contact area between two items (helper method)"""
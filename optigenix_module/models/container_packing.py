@@ -1,12 +1,16 @@
 """
 Packing algorithms for the EnhancedContainer class
 """
-from typing import List, Tuple, Dict
+from typing import List, Optional, Tuple, Dict
 import numpy as np
 import logging
+import random
 
 from optigenix_module.models.item import Item
 from optigenix_module.models.space import MaximalSpace
+from optigenix_module.models.space_store import SpaceStore
+from optigenix_module.models.container_core import check_placement_engine
+from optigenix_module.models.candidate_batch import CandidateBatch, ordered_sum
 from modules.utils import check_overlap_2d
 
 # Initialize logger
@@ -14,12 +18,100 @@ logger = logging.getLogger(__name__)
 
 """Converted to use utility function - contents moved to utils.py"""
 
+
+def expand_quantities(items: List[Item]) -> List[Item]:
+    """
+    One packable unit per piece: non-bundled items are copied once per quantity as NAME_1, NAME_2, ...
+
+    Bundled items with a quantity above one are already a single unit and are kept as they are.
+    """
+    expanded_items = []
+
+    for item in items:
+        if item.bundle == 'YES' and item.quantity > 1:
+            # Handle bundled items - already processed in Item initialization
+            expanded_items.append(item)
+        else:
+            # For non-bundled items, create individual copies
+            try:
+                quantity = int(item.quantity)  # Ensure integer conversion
+                for i in range(quantity):
+                    new_item = Item(
+                        name=f"{item.name}_{i+1}",
+                        length=float(item.original_dims[0]),
+                        width=float(item.original_dims[1]),
+                        height=float(item.original_dims[2]),
+                        weight=float(item.weight),
+                        quantity=1,
+                        fragility=item.fragility,
+                        stackable=item.stackable,
+                        boxing_type=item.boxing_type,
+                        bundle='NO',
+                        load_bearing=getattr(item, 'load_bearing', 0),  # Properly copy load bearing capacity
+                        temperature_sensitivity=getattr(item, 'temperature_sensitivity', None)
+                    )
+                    expanded_items.append(new_item)
+            except ValueError as e:
+                print(f"Error converting quantity for item {item.name}: {e}")
+                continue
+    return expanded_items
+
+
+def perturb_order(items: List[Item], seed: int, swaps: Optional[int] = None) -> List[Item]:
+    """
+    A packing order with seeded swaps of neighbouring units.
+
+    Only neighbours of different dimensions are swapped, since swapping
+    identical units leaves the layout as it is, and temperature-sensitive
+    units are never swapped with the others, so they still come first.
+
+    Args:
+        items: Units in packing order
+        seed: Seed of the swaps; equal seeds give equal orders
+        swaps: Number of swaps, by default one per four units
+
+    Returns:
+        The reordered units
+    """
+    rng = random.Random(seed)
+    order = list(items)
+    for _ in range(len(order) // 4 if swaps is None else swaps):
+        pairs = [index for index in range(len(order) - 1)
+                 if order[index].dimensions != order[index + 1].dimensions and
+                 getattr(order[index], 'needs_insulation', False) == getattr(order[index + 1], 'needs_insulation', False)]
+        if not pairs:
+            break
+        index = rng.choice(pairs)
+        order[index], order[index + 1] = order[index + 1], order[index]
+    return order
+
+
 class ContainerPacking:
     """Contains methods for packing items into the container"""
     
-    def pack_items(self, items: List[Item], route_temperature=None, constraint_weights=None):
-        """Pack items with improved temperature constraint handling and constraint weights"""
+    def pack_items(self, items: List[Item], route_temperature=None, constraint_weights=None, placement_engine=None,
+                   expanded=False, order_seed=None):
+        """
+        Pack items with improved temperature constraint handling and constraint weights
+
+        Args:
+            placement_engine: 'spaces' or 'extreme_points' to override the container's
+                              candidate-position generator (see ContainerCore.candidate_positions)
+            expanded: Items are already one unit each (see expand_quantities) and are
+                      packed under their own names
+            order_seed: When given, the sorted packing order is varied by seeded swaps of
+                        neighbouring units (see perturb_order)
+
+        Raises:
+            ValueError: The container works in units other than metres. Item dimensions
+                        and the clearances used here are metres; millimetre containers
+                        only evaluate genomes (see GeneticPacker).
+        """
+        if getattr(self, 'units', 'm') != 'm':
+            raise ValueError(f"pack_items needs a container in metres, not '{self.units}'")
         self.route_temperature = route_temperature  # Store route temperature for constraint checking
+        if placement_engine is not None:
+            self.placement_engine = check_placement_engine(placement_engine)
         
         # Initialize constraint weights with defaults if not provided
         self.constraint_weights = constraint_weights or {
@@ -39,35 +131,7 @@ class ContainerPacking:
                     f"Packed: {self.constraint_weights['items_packed_ratio_weight']:.2f} | " +
                     f"Temperature: {self.constraint_weights.get('temperature_constraint_weight', 0):.2f}")
         
-        expanded_items = []
-        
-        for item in items:
-            if item.bundle == 'YES' and item.quantity > 1:
-                # Handle bundled items - already processed in Item initialization
-                expanded_items.append(item)
-            else:
-                # For non-bundled items, create individual copies
-                try:
-                    quantity = int(item.quantity)  # Ensure integer conversion
-                    for i in range(quantity):
-                        new_item = Item(
-                            name=f"{item.name}_{i+1}",
-                            length=float(item.original_dims[0]),
-                            width=float(item.original_dims[1]),
-                            height=float(item.original_dims[2]),
-                            weight=float(item.weight),
-                            quantity=1,
-                            fragility=item.fragility,
-                            stackable=item.stackable,
-                            boxing_type=item.boxing_type,
-                            bundle='NO',
-                            load_bearing=getattr(item, 'load_bearing', 0),  # Properly copy load bearing capacity
-                            temperature_sensitivity=getattr(item, 'temperature_sensitivity', None)
-                        )
-                        expanded_items.append(new_item)
-                except ValueError as e:
-                    print(f"Error converting quantity for item {item.name}: {e}")
-                    continue
+        expanded_items = list(items) if expanded else expand_quantities(items)
 
         # Identify temperature sensitive items and mark them
         if self.route_temperature is not None:
@@ -99,6 +163,8 @@ class ContainerPacking:
                                 x.dimensions[2],                         # Lower height preferred
                                 -x.weight                                # Heavier items next
                             ))
+        if order_seed is not None:
+            sorted_items = perturb_order(sorted_items, order_seed)
                         
         # Print temperature-sensitive items for verification
         temp_items = [item for item in sorted_items if getattr(item, 'needs_insulation', False)]
@@ -120,7 +186,14 @@ class ContainerPacking:
                 self.dimensions[2]                    # height
             )
             safe_zone.temperature_safe = True
-            self.spaces.append(safe_zone)
+            # A container topped up after packing already has items in the zone: only
+            # the zone's free parts around them are added
+            zone = SpaceStore([safe_zone])
+            for placed in self.items:
+                zone.carve(tuple(placed.position) + tuple(p + d for p, d in zip(placed.position, placed.dimensions)))
+            self.spaces.extend(zone)
+            if self.placement_engine == 'extreme_points':
+                self._extreme_points().add_point((safe_zone.x, safe_zone.y, safe_zone.z))
             print(f"🌡️ Created temperature-safe zone: {wall_buffer:.2f}m from all walls")
             print(f"   Safe zone dimensions: {safe_zone.x:.2f}, {safe_zone.y:.2f}, {safe_zone.z:.2f}, {safe_zone.width:.2f}, {safe_zone.depth:.2f}, {safe_zone.height:.2f}")
         
@@ -137,8 +210,7 @@ class ContainerPacking:
             if not self._try_pack_in_layer(item, 0):
                 # Try on existing layers
                 packed = False
-                for height in sorted(set(i.position[2] + i.dimensions[2] 
-                                  for i in self.items if i.position)):
+                for height in list(self._layer_index().heights):
                     if self._try_pack_in_layer(item, height):
                         packed = True
                         break
@@ -192,29 +264,22 @@ class ContainerPacking:
 
             best_pos = None
             best_rot = None
-            best_score = float('-inf')
             best_space = None
+            candidates = []
             
-            # For each rotation, try to find best position
+            # For each rotation, collect the candidate positions; they are scored together below
             for rotation in rotations:
                 # Skip if height + item height exceeds container height
                 if height + rotation[2] > self.dimensions[2]:
                     continue
 
-                # Find valid positions in current layer
-                for space in self.spaces:
+                # Find valid positions in current layer: candidates at the correct height that fit the rotation
+                for candidate, space in self.candidate_positions(rotation, z=height):
                     # Skip spaces that aren't temperature-safe for temperature-sensitive items
                     if needs_temperature_protection and hasattr(space, 'temperature_safe') and space.temperature_safe is False:
                         continue
 
-                    if not space.can_fit_item(rotation):
-                        continue
-                        
-                    # Only consider spaces at the correct height
-                    if abs(space.z - height) > 0.001:
-                        continue
-                        
-                    pos = (space.x, space.y, height)
+                    pos = (candidate[0], candidate[1], height)
                     
                     # 🔒 TEMPERATURE CONSTRAINT ENFORCEMENT - PHASE 2 (EARLY WALL CHECK)
                     # Before even checking valid placement, reject wall positions for temperature-sensitive items
@@ -239,25 +304,14 @@ class ContainerPacking:
                             top_wall_dist < wall_buffer):
                             # Skip this position entirely for temperature-sensitive items
                             continue
-                    
-                    if self._is_valid_placement(item, pos, rotation):
-                        # 🔒 TEMPERATURE CONSTRAINT ENFORCEMENT - PHASE 3 (DETAILED CHECK)
-                        # Additional temperature constraint checks
-                        if hasattr(self, 'route_temperature') and self.route_temperature is not None:
-                            if not self._check_temperature_constraints(item, pos, self.route_temperature):
-                                continue  # Failed temperature constraints
-                        
-                        # Calculate position score
-                        score = self._evaluate_position_enhanced(item, pos, rotation)
-                        
-                        # Update best position if this one has a better score
-                        if score > best_score:
-                            best_score = score
-                            best_pos = pos
-                            best_rot = rotation
-                            best_space = space
-        
-            if best_pos and best_rot and best_space:
+
+                    candidates.append((pos, rotation, space))
+
+            best = self._best_candidate(item, candidates)
+            if best is not None:
+                best_pos, best_rot, best_space = best
+        
+            if best_pos and best_rot:
                 # 🔒 TEMPERATURE CONSTRAINT ENFORCEMENT - PHASE 4 (FINAL VERIFICATION)
                 # One final verification for temperature-sensitive items before placement
                 if needs_temperature_protection:
@@ -290,7 +344,7 @@ class ContainerPacking:
                 item.position = best_pos
                 item.dimensions = best_rot
                 self.items.append(item)
-                self._update_spaces(best_pos, best_rot, best_space)
+                self._update_spaces(best_pos, best_rot, best_space, maximal=False)
                 self._update_weight_distribution(item)
                 return True
             
@@ -300,6 +354,157 @@ class ContainerPacking:
             print(f"Error packing item {item.name}: {str(e)}")
             return False
 
+    def _best_candidate(self, item, candidates):
+        """
+        Best-scoring valid placement among an item's candidates.
+
+        Checks and scores all candidates at once; the result is the one the
+        scalar loop (_is_valid_placement, _check_temperature_constraints and
+        _evaluate_position_enhanced per candidate, first best score wins) picks.
+
+        Args:
+            item: Item to place
+            candidates: (pos, rotation, space) per candidate, in search order
+
+        Returns:
+            The chosen (pos, rotation, space), or None when no candidate is valid
+        """
+        if not candidates:
+            return None
+        batch = CandidateBatch([(pos, rotation) for pos, rotation, _ in candidates])
+        valid = self._valid_placement_mask(item, batch)
+
+        # 🔒 TEMPERATURE CONSTRAINT ENFORCEMENT - PHASE 3 (DETAILED CHECK)
+        # Additional temperature constraint checks
+        if hasattr(self, 'route_temperature') and self.route_temperature is not None:
+            for k in np.flatnonzero(valid):
+                if not self._check_temperature_constraints(item, batch.candidates[k][0], self.route_temperature):
+                    valid[k] = False  # Failed temperature constraints
+
+        keep = np.flatnonzero(valid)
+        if not len(keep):
+            return None
+        scores = self._evaluate_positions_enhanced(item, batch.take(keep))
+        return candidates[keep[int(np.argmax(scores))]]
+
+    def _evaluate_positions_enhanced(self, item, batch: CandidateBatch) -> np.ndarray:
+        """
+        _evaluate_position_enhanced for every candidate of a batch at once.
+
+        Scores are bit-for-bit those of the scalar method, and support mechanisms
+        are added in candidate order, as scoring the candidates one by one does.
+
+        Args:
+            item: Item to place
+            batch: Valid candidate positions and rotated dimensions of the item
+
+        Returns:
+            Array of weighted scores, one per candidate
+        """
+        constraint_scores = {
+            'volume_utilization': 0,
+            'stability_score': 0,
+            'contact_ratio': 0,
+            'weight_balance': 0,
+            'temperature_constraint': 0,
+            'items_packed_ratio': 100
+        }
+        x, y, z = batch.low.T
+        x1, y1, z1 = batch.high.T
+        w, d, h = batch.dims.T
+
+        # --- STABILITY SCORE ---
+        constraint_scores['stability_score'] = self._support_scores(batch) * 100
+
+        # --- VOLUME UTILIZATION ---
+        container_volume = self.dimensions[0] * self.dimensions[1] * self.dimensions[2]
+        all_low, _, all_high = self._spatial_index().arrays()
+        wasted_space = 0
+        for distance in batch.clearances(all_low, all_high, self.dimensions):
+            wasted_space = wasted_space + distance
+        space_efficiency = 1.0 - np.minimum(1.0, wasted_space / (container_volume ** (1/3)))
+        constraint_scores['volume_utilization'] = space_efficiency * 100
+
+        # Significant contacts with the placed items, in placement order
+        slots, low, dims, high = self._layer_arrays(batch)
+        contact_area, significant = batch.face_contacts(low, dims, high)
+
+        # --- TEMPERATURE CONSTRAINTS ---
+        if getattr(item, 'needs_insulation', False):
+            wall_buffer = 0.3  # 30cm buffer
+            min_wall_distance = np.minimum.reduce([
+                x, y, self.dimensions[0] - x1, self.dimensions[1] - y1, z, self.dimensions[2] - z1])
+            wall_distance_score = np.where(min_wall_distance < wall_buffer,
+                                           (min_wall_distance / wall_buffer) * 50,
+                                           50 + np.minimum(50, (min_wall_distance - wall_buffer) * 50))
+            insulating = np.array([not getattr(self.items[slot], 'needs_insulation', False) for slot in slots],
+                                  dtype=bool)
+            surrounding_items = significant.sum(axis=1)
+            insulating_items = (significant & insulating).sum(axis=1)
+            insulation_score = np.minimum(100, (surrounding_items * 10) + (insulating_items * 20))
+            constraint_scores['temperature_constraint'] = (wall_distance_score * 0.7) + (insulation_score * 0.3)
+
+        # --- CONTACT RATIO ---
+        total_surface_area = 2 * (w*d + w*h + d*h)
+        contact_ratio = np.minimum(1.0, ordered_sum(np.where(significant, contact_area, 0.0)) / total_surface_area)
+        constraint_scores['contact_ratio'] = contact_ratio * 100
+
+        # --- WEIGHT BALANCE ---
+        container_center = (self.dimensions[0]/2, self.dimensions[1]/2, self.dimensions[2]/2)
+        ideal_cog = (self.dimensions[0]/2, self.dimensions[1]/2, self.dimensions[2]/4)
+        current_distance = self._calculate_distance(self._calculate_current_cog(), ideal_cog)
+        new_cogs = self._load_totals().centers_of_gravity_with(batch.low, item.dimensions, item.weight,
+                                                               container_center)
+        # Distances go through float ** like the scalar method: NumPy's power and sqrt may round differently
+        new_distance = np.array([self._calculate_distance(new_cog, ideal_cog) for new_cog in new_cogs.tolist()])
+        if current_distance > 0:
+            balance_improvement = np.maximum(-100, np.minimum(100, (current_distance - new_distance) * 100 / current_distance))
+        else:
+            balance_improvement = 0
+        constraint_scores['weight_balance'] = 50 + balance_improvement/2
+
+        # --- APPLY WEIGHTS ---
+        weighted_score = 0
+        for constraint, score in constraint_scores.items():
+            weighted_score = weighted_score + score * self._constraint_weight(constraint)
+        return weighted_score
+
+    def _support_scores(self, batch: CandidateBatch) -> np.ndarray:
+        """_calculate_support_score for every candidate of a batch, adding support mechanisms in candidate order"""
+        z = batch.low[:, 2]
+        raised = z != 0
+        if not raised.any():
+            return np.ones(len(batch))
+        slots, low, _, high, below = self._support_arrays(batch)
+        stackable = np.array([bool(self.items[slot].stackable) for slot in slots], dtype=bool)
+        below &= stackable
+        overlap = batch.overlap_lengths(low, high)
+        support_area = ordered_sum(np.where(below, overlap[..., 0] * overlap[..., 1], 0.0))
+        support_ratio = support_area / (batch.dims[:, 0] * batch.dims[:, 1])
+        scores = np.where(raised, np.maximum(0.3, support_ratio), 1.0)
+        for k in np.flatnonzero(raised & (support_ratio < 0.3)):
+            pos, dims = batch.candidates[k]
+            if self._can_add_support(pos, dims):
+                self._add_support_mechanism(pos, dims)
+                scores[k] = 0.8
+        return scores
+
+    def _constraint_weight(self, constraint: str) -> float:
+        """Weight of a constraint score in the position evaluation"""
+        weight_key = f"{constraint}_weight"
+        if hasattr(self, 'constraint_weights') and weight_key in self.constraint_weights:
+            return self.constraint_weights[weight_key]
+        # Default weights if not provided
+        default_weights = {
+            'volume_utilization_weight': 0.75,
+            'stability_score_weight': 0.50,
+            'contact_ratio_weight': 0.50,
+            'weight_balance_weight': 0.25,
+            'items_packed_ratio_weight': 0.25,
+            'temperature_constraint_weight': 0.30
+        }
+        return default_weights.get(weight_key, 0.1)
+
     def _evaluate_position_enhanced(self, item, pos, dims):
         """Enhanced position evaluation with weighted constraints"""
         # Base scores for each constraint category
@@ -354,13 +559,9 @@ class ContainerPacking:
                 wall_distance_score = 50 + min(50, (min_wall_distance - wall_buffer) * 50)  # 50-100 range
             
             # Count surrounding items for insulation
-            surrounding_items = 0
-            insulating_items = 0
-            for placed_item in self.items:
-                if self._has_surface_contact(pos, dims, placed_item):
-                    surrounding_items += 1
-                    if not getattr(placed_item, 'needs_insulation', False):
-                        insulating_items += 1
+            surrounding = [placed_item for placed_item, _, _ in self.surface_contacts(pos, dims)]
+            surrounding_items = len(surrounding)
+            insulating_items = sum(1 for placed_item in surrounding if not getattr(placed_item, 'needs_insulation', False))
             
             # Calculate insulation score
             insulation_score = min(100, (surrounding_items * 10) + (insulating_items * 20))
@@ -373,10 +574,9 @@ class ContainerPacking:
         contact_area = 0
         total_surface_area = 2 * (w*d + w*h + d*h)
         
-        for placed_item in self.items:
-            if self._has_surface_contact(pos, dims, placed_item):
-                contact_count += 1
-                contact_area += self._calculate_contact_area(pos, dims, placed_item)
+        for placed_item, placed_contact_area, _ in self.surface_contacts(pos, dims):
+            contact_count += 1
+            contact_area += placed_contact_area
         
         contact_ratio = min(1.0, contact_area / total_surface_area)
         constraint_scores['contact_ratio'] = contact_ratio * 100
@@ -402,20 +602,7 @@ class ContainerPacking:
         # --- APPLY WEIGHTS ---
         weighted_score = 0
         for constraint, score in constraint_scores.items():
-            weight_key = f"{constraint}_weight"
-            if hasattr(self, 'constraint_weights') and weight_key in self.constraint_weights:
-                weighted_score += score * self.constraint_weights[weight_key]
-            else:
-                # Default weights if not provided
-                default_weights = {
-                    'volume_utilization_weight': 0.75,
-                    'stability_score_weight': 0.50,
-                    'contact_ratio_weight': 0.50,
-                    'weight_balance_weight': 0.25,
-                    'items_packed_ratio_weight': 0.25,
-                    'temperature_constraint_weight': 0.30
-                }
-                weighted_score += score * default_weights.get(weight_key, 0.1)
+            weighted_score += score * self._constraint_weight(constraint)
         
         return weighted_score
 
@@ -427,20 +614,9 @@ class ContainerPacking:
         if z == 0:  # On the ground
             return 1.0
             
-        support_area = 0
         total_area = w * d
-        items_below = self._get_items_below(pos, (w, d))
-        
-        for below_item in items_below:
-            overlap = self._calculate_overlap_area(
-                (x, y, w, d),
-                (below_item.position[0], below_item.position[1],
-                 below_item.dimensions[0], below_item.dimensions[1])
-            )
-            # Relaxed load bearing requirement
-            stackable_support = below_item.stackable
-            if stackable_support:
-                support_area += overlap
+        # Relaxed load bearing requirement: any stackable item below supports
+        support_area = self.support_area(pos, (w, d), stackable_only=True)
         
         # If support area is insufficient, add support mechanisms
         support_ratio = support_area / total_area
@@ -579,13 +755,10 @@ class ContainerPacking:
                                         wall_contacts += 1
                                     
                                     # Count surrounding items for insulation
-                                    surrounding_items = 0
-                                    insulating_items = 0
-                                    for placed_item in self.items:
-                                        if self._has_surface_contact(pos, item.dimensions, placed_item):
-                                            surrounding_items += 1
-                                            if not getattr(placed_item, 'needs_insulation', False):
-                                                insulating_items += 1
+                                    surrounding = [placed_item for placed_item, _, _ in self.surface_contacts(pos, item.dimensions)]
+                                    surrounding_items = len(surrounding)
+                                    insulating_items = sum(1 for placed_item in surrounding
+                                                           if not getattr(placed_item, 'needs_insulation', False))
                                     
                                     if wall_contacts > 0:
                                         if surrounding_items < 2 or insulating_items < 1:
@@ -730,32 +903,17 @@ class ContainerPacking:
 
     def _count_surrounding_items(self, item, pos):
         """Count items surrounding the given item for insulation purposes"""
-        x, y, z = pos
-        w, d, h = item.dimensions
         surrounding_count = 0
         
-        # Define detection range - slightly larger than the item
+        # Detection range - slightly larger than the item; the spatial index
+        # only returns items within it
         detection_buffer = 0.05  # 5cm detection buffer
-        min_x = x - detection_buffer
-        max_x = x + w + detection_buffer
-        min_y = y - detection_buffer
-        max_y = y + d + detection_buffer
-        min_z = z - detection_buffer
-        max_z = z + h + detection_buffer
-        
-        for placed_item in self.items:
+        for slot in self._spatial_index().near(pos, item.dimensions, detection_buffer):
+            placed_item = self.items[slot]
             # Skip comparing with itself
             if placed_item.position is None or (placed_item.position == pos and placed_item.dimensions == item.dimensions):
                 continue
-            
-            px, py, pz = placed_item.position
-            pw, pd, ph = placed_item.dimensions
-            
-            # Check if the placed item is adjacent to or overlapping with our item
-            if (px + pw >= min_x and px <= max_x and
-                py + pd >= min_y and py <= max_y and
-                pz + ph >= min_z and pz <= max_z):
-                surrounding_count += 1
+            surrounding_count += 1
             
         return surrounding_count
 
@@ -806,16 +964,16 @@ class ContainerPacking:
             self.remaining_volume = self.dimensions[0] * self.dimensions[1] * self.dimensions[2]
             return
             
-        # Calculate metrics
+        # Calculate metrics from the running totals
+        totals = self._load_totals()
         container_volume = self.dimensions[0] * self.dimensions[1] * self.dimensions[2]
-        used_volume = sum(item.dimensions[0] * item.dimensions[1] * item.dimensions[2] 
-                          for item in self.items if item.position)
+        used_volume = totals.volume
                           
         self.volume_utilization = used_volume / container_volume if container_volume > 0 else 0
         self.remaining_volume = container_volume - used_volume
         
-        # Calculate total weight and validate against container max payload
-        self.total_weight = sum(item.weight for item in self.items if item.position)
+        # Validate total weight against container max payload
+        self.total_weight = totals.weight
         
         # Check if we have container type information for weight validation
         if hasattr(self, 'container_type') and self.container_type:
@@ -832,52 +990,8 @@ class ContainerPacking:
     
     def _find_nearest_distances(self, pos, dims):
         """Find the nearest items or walls in all 6 directions"""
-        x, y, z = pos
-        w, d, h = dims
-        
-        # Initialize with distances to walls
-        nearest_distances = [
-            x,                              # Distance to left wall
-            y,                              # Distance to front wall
-            self.dimensions[0] - (x + w),   # Distance to right wall
-            self.dimensions[1] - (y + d),   # Distance to back wall
-            z,                              # Distance to bottom
-            self.dimensions[2] - (z + h)    # Distance to top
-        ]
-        
-        # Check all items for closer distances
-        for item in self.items:
-            if item.position is None:
-                continue
-                
-            ix, iy, iz = item.position
-            iw, id, ih = item.dimensions
-            
-            # Left distance (-X direction)
-            if iy < y + d and iy + id > y and iz < z + h and iz + ih > z and ix + iw <= x:
-                nearest_distances[0] = min(nearest_distances[0], x - (ix + iw))
-                
-            # Front distance (-Y direction)
-            if ix < x + w and ix + iw > x and iz < z + h and iz + ih > z and iy + id <= y:
-                nearest_distances[1] = min(nearest_distances[1], y - (iy + id))
-                
-            # Right distance (+X direction)
-            if iy < y + d and iy + id > y and iz < z + h and iz + ih > z and ix >= x + w:
-                nearest_distances[2] = min(nearest_distances[2], ix - (x + w))
-                
-            # Back distance (+Y direction)
-            if ix < x + w and ix + iw > x and iz < z + h and iz + ih > z and iy >= y + d:
-                nearest_distances[3] = min(nearest_distances[3], iy - (y + d))
-                
-            # Bottom distance (-Z direction)
-            if ix < x + w and ix + iw > x and iy < y + d and iy + id > y and iz + ih <= z:
-                nearest_distances[4] = min(nearest_distances[4], z - (iz + ih))
-                
-            # Top distance (+Z direction)
-            if ix < x + w and ix + iw > x and iy < y + d and iy + id > y and iz >= z + h:
-                nearest_distances[5] = min(nearest_distances[5], iz - (z + h))
-                
-        return nearest_distances
+        # Order: left, front, right, back, bottom, top; only items in the six slabs are tested
+        return self._spatial_index().clearances(pos, dims)
 
     def _calculate_contact_area(self, pos, dims, other_item):
         """Calculate contact area between two items"""
@@ -919,61 +1033,15 @@ class ContainerPacking:
 
     def _calculate_current_cog(self):
         """Calculate current center of gravity of packed items"""
-        total_weight = 0
-        weighted_x = 0
-        weighted_y = 0
-        weighted_z = 0
-        
-        for item in self.items:
-            if item.position is None:
-                continue
-                
-            x, y, z = item.position
-            w, d, h = item.dimensions
-            
-            # Calculate item's center position
-            center_x = x + w/2
-            center_y = y + d/2
-            center_z = z + h/2
-            
-            weighted_x += center_x * item.weight
-            weighted_y += center_y * item.weight
-            weighted_z += center_z * item.weight
-            total_weight += item.weight
-        
-        if total_weight == 0:
-            # If no items yet, return container center
-            return (self.dimensions[0]/2, self.dimensions[1]/2, self.dimensions[2]/2)
-        
-        return (weighted_x/total_weight, weighted_y/total_weight, weighted_z/total_weight)
+        # If no items yet, return container center
+        container_center = (self.dimensions[0]/2, self.dimensions[1]/2, self.dimensions[2]/2)
+        return self._load_totals().center_of_gravity(container_center)
 
     def _calculate_cog_with_new_item(self, item, pos):
         """Calculate what the CoG would be with a new item added"""
-        x, y, z = pos
-        w, d, h = item.dimensions
-        
-        # Calculate total weight and weighted position sums with existing items
-        total_weight = item.weight
-        weighted_x = (x + w/2) * item.weight
-        weighted_y = (y + d/2) * item.weight
-        weighted_z = (z + h/2) * item.weight
-        
-        for packed_item in self.items:
-            if packed_item.position is None:
-                continue
-                
-            ix, iy, iz = packed_item.position
-            iw, id, ih = packed_item.dimensions
-            
-            weighted_x += (ix + iw/2) * packed_item.weight
-            weighted_y += (iy + id/2) * packed_item.weight
-            weighted_z += (iz + ih/2) * packed_item.weight
-            total_weight += packed_item.weight
-        
-        if total_weight == 0:
-            return (self.dimensions[0]/2, self.dimensions[1]/2, self.dimensions[2]/2)
-        
-        return (weighted_x/total_weight, weighted_y/total_weight, weighted_z/total_weight)
+        # Constant time: the new item's moment is added to the running totals
+        container_center = (self.dimensions[0]/2, self.dimensions[1]/2, self.dimensions[2]/2)
+        return self._load_totals().center_of_gravity_with(pos, item.dimensions, item.weight, container_center)
 
     def _calculate_distance(self, point1, point2):
         """Calculate distance between two 3D points"""
@@ -0,0 +1,161 @@
+"""
+Extreme-point candidate positions for container packing.
+
+The maximal-space engine offers the corner of every free space as a candidate
+position; on large manifests that is many more candidates than useful
+positions. Extreme points (Crainic, Perboli and Tadei, 2008) are generated
+from each placed box: the three corners next to its origin, each projected
+back along the two other axes until it meets a wall or another box. They give
+far fewer candidates while keeping the positions that pack tightly.
+"""
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .item_mirror import ItemMirror
+
+# Boxes closer than this are treated as touching (m)
+_TOLERANCE = 1e-9
+
+
+class ExtremePoints(ItemMirror):
+    """
+    Extreme points of the boxes placed in a container
+
+    Points are kept unique. Every point also keeps its room: the free
+    distance along +x, +y and +z before a wall or placed box. A point covered
+    by a placed box, i.e. a box placed there would start inside it, or left
+    without room along some axis is dropped, and candidates only offers
+    points with enough room for the box.
+    """
+
+    def __init__(self, container_dims: Tuple[float, float, float], safe_margin: float = 0.1):
+        """
+        Args:
+            container_dims: Container dimensions (length, width, height)
+            safe_margin: Wall distance of the temperature-safe zone, as for the container's temperature-safe space
+        """
+        self.container_dims = tuple(float(d) for d in container_dims)
+        self.safe_margin = float(safe_margin)
+        super().__init__()
+
+    def __len__(self):
+        return len(self._points)
+
+    def _rebuild(self):
+        """Forget every placed box; only the container origin (and the safe-zone origin) remain"""
+        self._points = np.zeros((1, 3))
+        self._room = np.asarray(self.container_dims)[None, :].copy()
+        self._mins = np.empty((0, 3))  # Corners of the placed boxes
+        self._maxs = np.empty((0, 3))
+        if self.safe_margin > 0:
+            self.add_point((self.safe_margin, self.safe_margin, 0.0))
+
+    def _append(self, item):
+        """Add the extreme points of a placed item"""
+        self.add_box(item.position, item.dimensions)
+
+    def add_point(self, point: Sequence[float]):
+        """Add a candidate point unless it is already known or covered by a placed box"""
+        point = np.asarray(point, dtype=float).reshape(1, 3)
+        if (self._points == point).all(axis=1).any():
+            return
+        if len(self._mins) and self._covered(point).any():
+            return
+        room = self._free_room(point[0])
+        if (room > _TOLERANCE).all():
+            self._points = np.concatenate((self._points, point))
+            self._room = np.concatenate((self._room, room[None, :]))
+
+    def add_box(self, pos: Sequence[float], dims: Sequence[float]):
+        """
+        Register a placed box: drop the points it covers and add its extreme points.
+
+        Args:
+            pos: (x, y, z) of the box
+            dims: Placed (rotated) dimensions (w, d, h)
+        """
+        low = np.asarray(pos, dtype=float)
+        high = low + np.asarray(dims, dtype=float)
+        self._mins = np.concatenate((self._mins, low[None, :]))
+        self._maxs = np.concatenate((self._maxs, high[None, :]))
+        points, room = self._points, self._room
+        for axis in range(3):
+            # Points whose ray along +axis now hits the new box lose room
+            hit = low[axis] >= points[:, axis] - _TOLERANCE
+            for other in range(3):
+                if other != axis:
+                    hit &= (low[other] <= points[:, other] + _TOLERANCE) & (points[:, other] < high[other] - _TOLERANCE)
+            room[hit, axis] = np.minimum(room[hit, axis], low[axis] - points[hit, axis])
+        keep = ~self._covered(points, low, high) & (room > _TOLERANCE).all(axis=1)
+        self._points, self._room = points[keep], room[keep]
+
+        new_points = []
+        for axis in range(3):
+            corner = low.copy()
+            corner[axis] = high[axis]
+            for direction in range(3):
+                if direction != axis:
+                    new_points.append(self._project(corner, direction))
+        for point in new_points:
+            self.add_point(point)
+
+    def candidates(self, dims: Sequence[float], z: Optional[float] = None, temperature_safe: bool = False,
+                   tolerance: float = 0.001) -> List[Tuple[float, float, float]]:
+        """
+        Points where a box with dims stays inside the container, lowest and closest to the origin first.
+
+        Args:
+            dims: Box dimensions (w, d, h)
+            z: Only points whose z is within tolerance of this height
+            temperature_safe: Only points where the box stays inside the temperature-safe zone
+            tolerance: Tolerance of the z restriction
+        """
+        points, room = self._points, self._room
+        if z is not None:
+            # Only the points at the height are tested further
+            level = np.abs(points[:, 2] - z) <= tolerance
+            points, room = points[level], room[level]
+        dims = np.asarray(dims, dtype=float)
+        mask = (room >= dims - _TOLERANCE).all(axis=1)
+        if temperature_safe:
+            margin = self.safe_margin
+            limits = np.asarray(self.container_dims)
+            mask &= (points[:, :2] >= margin).all(axis=1) & (points + dims <= limits - margin + _TOLERANCE).all(axis=1)
+        points = points[mask]
+        order = np.lexsort((points[:, 1], points[:, 0], points[:, 0]**2 + points[:, 1]**2, points[:, 2]))
+        return [tuple(point) for point in points[order].tolist()]
+
+    def _covered(self, points: np.ndarray, low: np.ndarray = None, high: np.ndarray = None) -> np.ndarray:
+        """For each point, whether it lies in a placed box (or in [low, high) when given), faces excluded above"""
+        if low is None:
+            low, high = self._mins, self._maxs
+        else:
+            low, high = low[None, :], high[None, :]
+        inside = ((points[:, None, :] >= low[None, :, :] - _TOLERANCE) &
+                  (points[:, None, :] < high[None, :, :] - _TOLERANCE)).all(axis=2)
+        return inside.any(axis=1)
+
+    def _free_room(self, point: np.ndarray) -> np.ndarray:
+        """Free distance from a point along +x, +y and +z to a wall or placed box"""
+        room = np.asarray(self.container_dims) - point
+        mins, maxs = self._mins, self._maxs
+        for axis in range(3):
+            ahead = mins[:, axis] >= point[axis] - _TOLERANCE
+            for other in range(3):
+                if other != axis:
+                    ahead &= (mins[:, other] <= point[other] + _TOLERANCE) & (point[other] < maxs[:, other] - _TOLERANCE)
+            if ahead.any():
+                room[axis] = min(room[axis], mins[ahead, axis].min() - point[axis])
+        return room
+
+    def _project(self, point: np.ndarray, axis: int) -> np.ndarray:
+        """Move a point towards the origin along axis until it meets a wall or a placed box"""
+        others = [other for other in range(3) if other != axis]
+        mins, maxs = self._mins, self._maxs
+        blocking = (maxs[:, axis] <= point[axis] + _TOLERANCE)
+        for other in others:
+            blocking &= (mins[:, other] <= point[other] + _TOLERANCE) & (point[other] < maxs[:, other] - _TOLERANCE)
+        projected = point.copy()
+        projected[axis] = maxs[blocking, axis].max() if blocking.any() else 0.0
+        return projected
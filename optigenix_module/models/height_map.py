@@ -0,0 +1,143 @@
+"""
+Height map (skyline) of the items placed in a container.
+
+Most support questions - which items hold a box up, how much of its base is
+supported, can it be stacked there - ask for the top surface under a
+footprint. The height map keeps, for every cell of a discretized floor grid,
+the top z of the boxes covering it and the box that forms that top, so these
+questions become array slices instead of scans over container.items.
+"""
+import math
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .item_mirror import ItemMirror
+
+# Default floor-grid cell edge (m); item dimensions are usually multiples of it
+DEFAULT_RESOLUTION = 0.05
+
+# Slack (in cells) when snapping box edges to grid lines, absorbing float noise
+_SNAP = 1e-4
+
+
+class HeightMap(ItemMirror):
+    """
+    Incrementally maintained skyline over a floor grid
+
+    Every cell touched by a box's base counts as covered by it, so the top over
+    a footprint is never underestimated. A cell remembers a single box: when a query
+    could miss a box (the skyline over the footprint rises above the query
+    height, or several boxes end at the same cell top), items_below returns
+    None and callers fall back to an exact search.
+    """
+
+    def __init__(self, container_dims: Tuple[float, float, float], resolution: float = DEFAULT_RESOLUTION):
+        """
+        Args:
+            container_dims: Container dimensions (length, width, height)
+            resolution: Cell edge of the floor grid
+        """
+        self.container_dims = tuple(float(d) for d in container_dims)
+        self.resolution = float(resolution)
+        shape = (max(1, math.ceil(self.container_dims[0] / self.resolution - _SNAP)),
+                 max(1, math.ceil(self.container_dims[1] / self.resolution - _SNAP)))
+        self.top = np.zeros(shape)  # Top z per cell
+        self.top_slot = np.full(shape, -1, dtype=np.int32)  # Box forming the top, -1 for the floor
+        self.top_count = np.zeros(shape, dtype=np.uint16)  # Boxes ending at the cell's top
+        super().__init__()
+
+    def _rebuild(self):
+        """Forget every placed box"""
+        self.top.fill(0.0)
+        self.top_slot.fill(-1)
+        self.top_count.fill(0)
+
+    def _cells(self, x, y, w, d) -> Tuple[slice, slice]:
+        """Grid cells touched by the interior of a footprint"""
+        r = self.resolution
+        i0 = max(0, math.floor(x / r + _SNAP))
+        j0 = max(0, math.floor(y / r + _SNAP))
+        i1 = max(i0 + 1, math.ceil((x + w) / r - _SNAP))
+        j1 = max(j0 + 1, math.ceil((y + d) / r - _SNAP))
+        return slice(i0, i1), slice(j0, j1)
+
+    def cell_bounds(self, low: np.ndarray, high: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        _cells for many footprints at once.
+
+        Args:
+            low: (n, 2+) array of footprint corners (x, y, ...)
+            high: (n, 2+) array of far corners (x + w, y + d, ...)
+
+        Returns:
+            (start, end) arrays of shape (n, 2): cell index ranges along x and y
+        """
+        r = self.resolution
+        start = np.maximum(0, np.floor(low[:, :2] / r + _SNAP))
+        end = np.maximum(start + 1, np.ceil(high[:, :2] / r - _SNAP))
+        return start, end
+
+    def _append(self, item, tolerance: float = 0.001):
+        """Raise the skyline under a placed item"""
+        x, y, z = item.position
+        w, d, h = item.dimensions
+        slot = len(self._items)
+        cells = self._cells(x, y, w, d)
+        top = self.top[cells]
+        top_slot = self.top_slot[cells]
+        top_count = self.top_count[cells]
+        item_top = z + h
+        # Tops closer than two tolerances may both match a query height, so they count as one level
+        level = np.abs(top - item_top) < 2 * tolerance
+        raised = top < item_top
+        top_count[level] += 1
+        top_count[raised & ~level] = 1
+        top_slot[raised] = slot
+        top[raised] = item_top
+
+    def top_surface(self, pos, footprint) -> float:
+        """Highest top z under a footprint (0.0 on the bare floor)"""
+        return float(self.top[self._cells(pos[0], pos[1], footprint[0], footprint[1])].max())
+
+    def items_below(self, pos, footprint, tolerance: float = 0.001) -> Optional[List]:
+        """
+        Placed items whose top is at pos's z and whose base overlaps the footprint.
+
+        Args:
+            pos: (x, y, z) of the footprint's corner
+            footprint: (width, depth)
+            tolerance: Maximum distance between an item top and z; 0 requires exact equality
+
+        Returns:
+            List of items in placement order, or None when the skyline alone
+            cannot answer (see class docstring)
+        """
+        x, y, z = pos
+        w, d = footprint
+        cells = self._cells(x, y, w, d)
+        top = self.top[cells]
+        if tolerance > 0:
+            if (top > z + tolerance).any():
+                return None
+            at_z = np.abs(top - z) < tolerance
+        else:
+            if (top > z).any():
+                return None
+            at_z = top == z
+        if not at_z.any():
+            return []
+        if (self.top_count[cells][at_z] > 1).any():
+            return None
+
+        x1, y1 = x + w, y + d
+        found = []
+        for slot in np.unique(self.top_slot[cells][at_z]).tolist():
+            if slot < 0:
+                continue
+            item = self._items[slot]
+            ix, iy, _ = item.position
+            iw, idp, _ = item.dimensions
+            if not (x1 <= ix or ix + iw <= x or y1 <= iy or iy + idp <= y):
+                found.append(item)
+        return found
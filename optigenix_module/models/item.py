@@ -6,6 +6,12 @@ from typing import Tuple
 from modules.utils import check_overlap_2d
 
 class Item:
+    # Attributes set outside __init__: needs_insulation and color by temperature
+    # preprocessing, temperature_priority by TemperatureConstraintHandler
+    __slots__ = ('name', 'original_dims', 'weight', 'quantity', 'fragility', 'stackable', 'boxing_type', 'bundle',
+                 'position', 'items_above', 'load_bearing', 'temperature_sensitivity', 'needs_insulation',
+                 'temperature_priority', 'color', 'dimensions')
+
     def __init__(self, name, length, width, height, weight, quantity, fragility, stackable, boxing_type, bundle, load_bearing=0, temperature_sensitivity=None):
         self.name = name
         self.original_dims = (float(length), float(width), float(height))
@@ -93,6 +99,12 @@ class Item:
         # If still no solution, return minimal stacking arrangement
         return (orig_l, orig_w, orig_h * min(qty, max_layers))
 
+    def unrotated_dimensions(self) -> Tuple[float, float, float]:
+        """Dimensions before packing rotated the item: the bundle's, or the piece's own"""
+        if self.bundle == 'YES' and self.quantity > 1:
+            return self._calculate_bundle_dimensions()
+        return self.original_dims
+
     def __eq__(self, other):
         """Equality comparison based on item name"""
         if not isinstance(other, Item):
@@ -0,0 +1,61 @@
+"""
+Base class of the structures derived from a container's placed items.
+
+Spatial index, height map, extreme points, contact graph, load totals, layer
+index and occupancy bitmap all answer questions about container.items and are
+kept up to date the same way: containers only append to their item list, so
+each structure takes new items one at a time and starts over only when the
+list was replaced or shortened.
+"""
+from typing import List
+
+
+class ItemMirror:
+    """
+    Structure kept in step with a container's item list
+
+    Subclasses implement two hooks: _rebuild() resets the derived state to an
+    empty container, and _append(item) adds one placed item to it. The base
+    class tracks the mirrored items in _items, in list order; while _append
+    runs, _items still holds only the items placed before the new one.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+    def clear(self):
+        """Forget every placed item"""
+        self._items = []
+        self._source = None  # List the structure mirrors (container.items)
+        self._rebuild()
+
+    def sync(self, items: List, *context):
+        """
+        Bring the structure up to date with a container's item list.
+
+        New items at the end of the list are appended; a replaced list, or one
+        whose mirrored part changed, is re-applied from scratch.
+
+        Args:
+            items: The container's list of placed items
+            context: Extra arguments passed on to _append
+        """
+        count = len(self._items)
+        if items is not self._source or len(items) < count or (count and items[count - 1] is not self._items[-1]):
+            self.clear()
+            self._source = items
+            count = 0
+        for item in items[count:]:
+            self._append(item, *context)
+            self._items.append(item)
+
+    def _rebuild(self):
+        """Reset the derived state to that of an empty container"""
+        raise NotImplementedError
+
+    def _append(self, item, *context):
+        """Add one placed item to the derived state"""
+        raise NotImplementedError
@@ -0,0 +1,36 @@
+"""
+Heights of the layers formed by the items placed in a container.
+
+When an item does not fit on the floor, the layer packer tries to rest it on
+the top of some placed item, lowest first. Rebuilding the sorted set of item
+tops for every unplaced item made that enumeration O(n log n) per item; the
+index here inserts each placed item's top once, keeping the heights sorted.
+"""
+from bisect import insort
+from typing import List
+
+from .item_mirror import ItemMirror
+
+
+class LayerIndex(ItemMirror):
+    """
+    Incrementally maintained sorted set of placed item tops
+
+    Attributes:
+        heights: Distinct tops (z + height) of the placed items, ascending;
+                 of equal tops the first one placed is kept
+    """
+
+    def _rebuild(self):
+        """Forget every placed item"""
+        self.heights: List[float] = []
+        self._known = set()
+
+    def _append(self, item):
+        """Record a placed item's top; items without a position are skipped"""
+        if not item.position:
+            return
+        top = item.position[2] + item.dimensions[2]
+        if top not in self._known:
+            self._known.add(top)
+            insort(self.heights, top)
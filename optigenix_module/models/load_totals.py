@@ -0,0 +1,91 @@
+"""
+Running weight, moment and volume totals of the items placed in a container.
+
+Center of gravity, weight balance and utilization are sums over the placed
+items. Recomputing them for every candidate position made position scoring
+linear in the item count; the totals here are updated once per placed item,
+and "what if this item went there" becomes a constant-time query.
+"""
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from .item_mirror import ItemMirror
+
+
+class LoadTotals(ItemMirror):
+    """
+    Incrementally maintained sums over placed items
+
+    Attributes:
+        weight: Total weight of the placed items
+        volume: Total volume of the placed items
+        moment: Weight-weighted sum of the item centers, per axis
+    """
+
+    def _rebuild(self):
+        """Forget every placed item"""
+        self.weight = 0
+        self.volume = 0
+        self.moment = [0, 0, 0]
+
+    def _append(self, item):
+        """Add a placed item; items without a position count for nothing"""
+        if item.position is None:
+            return
+        x, y, z = item.position
+        w, d, h = item.dimensions
+        weight = item.weight
+        self.weight += weight
+        self.volume += max(0, w) * max(0, d) * max(0, h)
+        moment = self.moment
+        moment[0] += (x + w/2) * weight
+        moment[1] += (y + d/2) * weight
+        moment[2] += (z + h/2) * weight
+
+    def center_of_gravity(self, default: Sequence[float]) -> Tuple[float, float, float]:
+        """Center of gravity of the placed items, default when they weigh nothing"""
+        if self.weight == 0:
+            return tuple(default)
+        return (self.moment[0]/self.weight, self.moment[1]/self.weight, self.moment[2]/self.weight)
+
+    def center_of_gravity_with(self, pos: Sequence[float], dims: Sequence[float], weight: float,
+                               default: Sequence[float]) -> Tuple[float, float, float]:
+        """
+        Center of gravity if one more item were placed.
+
+        Args:
+            pos: (x, y, z) of the new item
+            dims: (w, d, h) of the new item
+            weight: Weight of the new item
+            default: Result when the total weight is zero
+        """
+        total_weight = self.weight + weight
+        if total_weight == 0:
+            return tuple(default)
+        x, y, z = pos
+        w, d, h = dims
+        moment = self.moment
+        return ((moment[0] + (x + w/2) * weight) / total_weight,
+                (moment[1] + (y + d/2) * weight) / total_weight,
+                (moment[2] + (z + h/2) * weight) / total_weight)
+
+    def centers_of_gravity_with(self, positions: np.ndarray, dims: Sequence[float], weight: float,
+                                default: Sequence[float]) -> np.ndarray:
+        """
+        center_of_gravity_with for one item at each of several positions.
+
+        Args:
+            positions: (n, 3) array of positions of the new item
+            dims: (w, d, h) of the new item
+            weight: Weight of the new item
+            default: Result when the total weight is zero
+
+        Returns:
+            (n, 3) array of centers of gravity
+        """
+        total_weight = self.weight + weight
+        if total_weight == 0:
+            return np.tile(np.asarray(default, dtype=float), (len(positions), 1))
+        half = np.array([dims[0]/2, dims[1]/2, dims[2]/2])
+        return (np.asarray(self.moment, dtype=float) + (positions + half) * weight) / total_weight
@@ -0,0 +1,145 @@
+"""
+Lightweight records for placements made during fitness evaluation.
+
+Evaluation packs the same item table for every genome, so the attributes
+packing reads from an item - dimensions after bundling, weight, handling
+flags - are fixed per item type for the whole run. ItemType holds them once,
+and a PlacedBox only records which type went where and how it was rotated,
+instead of constructing a full Item (color selection, bundle search,
+per-instance dict) for every placement.
+"""
+import copy
+from typing import Optional, Tuple
+
+from optigenix_module.models.units import dims_to_units
+
+
+class ItemType:
+    """
+    Immutable packing attributes shared by all items of one type
+
+    Attributes mirror those of Item, with dimensions after bundling, so an
+    ItemType can be passed wherever placement checks expect an item.
+    """
+
+    __slots__ = ('type_id', 'dimensions', 'original_dims', 'weight', 'quantity', 'fragility', 'stackable',
+                 'boxing_type', 'bundle', 'load_bearing', 'temperature_sensitivity', 'needs_insulation')
+
+    def __init__(self, type_id: int, item):
+        """
+        Args:
+            type_id: Id of the type in its ItemTypeTable
+            item: Any item of the type
+        """
+        set_field = object.__setattr__
+        set_field(self, 'type_id', type_id)
+        set_field(self, 'dimensions', tuple(item.dimensions))
+        set_field(self, 'original_dims', tuple(item.original_dims))
+        set_field(self, 'weight', item.weight)
+        set_field(self, 'quantity', item.quantity)
+        set_field(self, 'fragility', item.fragility)
+        set_field(self, 'stackable', item.stackable)
+        set_field(self, 'boxing_type', item.boxing_type)
+        set_field(self, 'bundle', item.bundle)
+        set_field(self, 'load_bearing', item.load_bearing)
+        set_field(self, 'temperature_sensitivity', item.temperature_sensitivity)
+        set_field(self, 'needs_insulation', getattr(item, 'needs_insulation', False))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"ItemType is immutable, cannot set '{name}'")
+
+    def __reduce__(self):
+        state = {name: getattr(self, name) for name in self.__slots__}
+        return _restore_item_type, (state,)
+
+    def in_units(self, units: str) -> "ItemType":
+        """The same type with its dimensions in the given coordinate units (see models.units)"""
+        if units == 'm':
+            return self
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state['dimensions'] = dims_to_units(self.dimensions, units)
+        state['original_dims'] = dims_to_units(self.original_dims, units)
+        return _restore_item_type(state)
+
+    def __repr__(self):
+        return f"ItemType({self.type_id}, dims={self.dimensions}, weight={self.weight})"
+
+
+def _restore_item_type(state):
+    """Unpickle an ItemType (its fields cannot be set through the normal protocol)"""
+    item_type = object.__new__(ItemType)
+    for name, value in state.items():
+        object.__setattr__(item_type, name, value)
+    return item_type
+
+
+class PlacedBox:
+    """
+    An item type placed at a position with rotated dimensions
+
+    Reads the item attributes placement checks use (weight, fragility, ...)
+    from its type, so containers can hold it in place of an Item.
+    """
+
+    __slots__ = ('item_type', 'name', 'position', 'dimensions')
+
+    def __init__(self, item_type: ItemType, name: str, position: Optional[Tuple[float, float, float]],
+                 dimensions: Tuple[float, float, float]):
+        """
+        Args:
+            item_type: Type of the placed item
+            name: Name of the placed item, for logging
+            position: (x, y, z) of the box, None while it is only a candidate
+            dimensions: Placed (rotated) dimensions (w, d, h)
+        """
+        self.item_type = item_type
+        self.name = name
+        self.position = position
+        self.dimensions = dimensions
+
+    @property
+    def type_id(self) -> int:
+        return self.item_type.type_id
+
+    @property
+    def weight(self) -> float:
+        return self.item_type.weight
+
+    @property
+    def fragility(self):
+        return self.item_type.fragility
+
+    @property
+    def stackable(self):
+        return self.item_type.stackable
+
+    @property
+    def load_bearing(self) -> float:
+        return self.item_type.load_bearing
+
+    @property
+    def temperature_sensitivity(self):
+        return self.item_type.temperature_sensitivity
+
+    @property
+    def needs_insulation(self) -> bool:
+        return self.item_type.needs_insulation
+
+    def to_item(self, source):
+        """
+        Full Item placed like this box, for the final container and its reports.
+
+        Args:
+            source: The item this box was placed for
+
+        Returns:
+            Shallow copy of source with this box's position and dimensions
+        """
+        item = copy.copy(source)
+        item.position = self.position
+        item.dimensions = self.dimensions
+        item.items_above = []
+        return item
+
+    def __repr__(self):
+        return f"PlacedBox(type={self.item_type.type_id}, name='{self.name}', pos={self.position}, dims={self.dimensions})"
@@ -0,0 +1,461 @@
+"""
+Array-backed store of the free (maximal) spaces of a container.
+
+Packing asks two questions of the free spaces after every placement: in which
+order to try them, and which of them can hold the next item. With a plain list
+both meant Python-level work over every space: a full re-sort per placement
+and a can_fit_item call per space and candidate. SpaceStore keeps the
+MaximalSpace objects together with NumPy columns of their geometry, answers
+fit, overlap and containment queries with vectorized masks and keeps the
+placement order incrementally by inserting new spaces at their sorted position.
+
+Extents follow MaximalSpace.can_fit_item: width runs along x, height along y
+and depth along z.
+"""
+import math
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from optigenix_module.models.space import MaximalSpace
+
+# Column of every geometry attribute in SpaceStore._data
+X, Y, Z, WIDTH, HEIGHT, DEPTH = range(6)
+
+# Values of the temperature_safe column
+_SAFE, _UNSAFE, _UNSET = 1, 0, -1
+
+_INITIAL_CAPACITY = 32
+
+# Extents at or below this are treated as empty (m)
+MIN_EXTENT = 1e-9
+
+
+def placement_key(space) -> Tuple:
+    """
+    Sort key of the placement order kept by SpaceStore: lowest first, then
+    closest to the origin, then largest, then most compact.
+    """
+    volume = space.get_volume()
+    return (space.z, space.x**2 + space.y**2, -volume, min(space.width, space.depth), space.x, space.y)
+
+
+def _contains(outer: np.ndarray, inner: np.ndarray, tolerance: float = MIN_EXTENT) -> np.ndarray:
+    """contains[i, j]: whether box outer[i] contains box inner[j] (corner rows as in SpaceStore.boxes)"""
+    return ((outer[:, None, :3] <= inner[None, :, :3] + tolerance) &
+            (outer[:, None, 3:] >= inner[None, :, 3:] - tolerance)).all(axis=2)
+
+
+def dominated(boxes: np.ndarray, safe: np.ndarray) -> np.ndarray:
+    """
+    For each box, whether another box of the set contains it (see SpaceStore.covered
+    for the temperature-safe rule). Of several identical boxes the first is kept.
+
+    Args:
+        boxes: Corners (x0, y0, z0, x1, y1, z1), one row per box
+        safe: Whether each box is temperature-safe
+    """
+    contains = _contains(boxes, boxes) & (safe[:, None] | ~safe[None, :])
+    # Mutual containment means identical boxes (up to the tolerance): only the earlier one counts
+    earlier = np.tri(len(boxes), k=-1, dtype=bool).T
+    contains &= ~contains.T | earlier
+    np.fill_diagonal(contains, False)
+    return contains.any(axis=0)
+
+
+def _flag(space) -> int:
+    safe = getattr(space, 'temperature_safe', None)
+    if safe is None:
+        return _UNSET
+    return _SAFE if safe else _UNSAFE
+
+
+class SpaceStore:
+    """
+    List of MaximalSpace objects with NumPy columns x, y, z, width, height, depth and temperature_safe
+
+    Supports the list operations containers use on their spaces (iteration,
+    indexing, len, append, extend, remove, pop, sort, copy). Spaces must not be
+    modified while they are in the store.
+
+    The store tracks how many leading spaces are in placement order (see
+    placement_key). Spaces appended since the last sort_for_placement are
+    inserted into that prefix by binary search instead of re-sorting the list.
+    As the order is by height first, the prefix also indexes the spaces by z
+    (see level_rows).
+    """
+
+    def __init__(self, spaces: Iterable = ()):
+        """
+        Args:
+            spaces: Initial spaces, in list order
+        """
+        self._spaces = list(spaces)
+        count = len(self._spaces)
+        self._data = np.empty((max(_INITIAL_CAPACITY, 2 * count), 6))
+        self._safe = np.empty(len(self._data), dtype=np.int8)
+        for row, space in enumerate(self._spaces):
+            self._write(row, space)
+        self._keys = []  # placement_key of the sorted prefix
+        self._sorted = 0  # Length of the prefix that is in placement order
+
+    # List protocol
+
+    def __len__(self):
+        return len(self._spaces)
+
+    def __iter__(self):
+        return iter(self._spaces)
+
+    def __getitem__(self, index):
+        return self._spaces[index]
+
+    def __setitem__(self, index: int, space):
+        if index < 0:
+            index += len(self._spaces)
+        self._spaces[index] = space
+        self._write(index, space)
+        self._truncate_sorted(index)
+
+    def __repr__(self):
+        return f"SpaceStore({self._spaces!r})"
+
+    def append(self, space):
+        """Add a space at the end"""
+        row = len(self._spaces)
+        self._reserve(row + 1)
+        self._spaces.append(space)
+        self._write(row, space)
+
+    def extend(self, spaces: Iterable):
+        """Add spaces at the end, in order"""
+        for space in spaces:
+            self.append(space)
+
+    def pop(self, index: int = -1):
+        """Remove and return the space at index"""
+        count = len(self._spaces)
+        if index < 0:
+            index += count
+        space = self._spaces.pop(index)
+        self._data[index:count - 1] = self._data[index + 1:count]
+        self._safe[index:count - 1] = self._safe[index + 1:count]
+        if index < self._sorted:
+            del self._keys[index]
+            self._sorted -= 1
+        return space
+
+    def remove(self, space):
+        """Remove a space (matched by identity, as MaximalSpace has no equality)"""
+        for index, stored in enumerate(self._spaces):
+            if stored is space:
+                self.pop(index)
+                return
+        raise ValueError("SpaceStore.remove(space): space not in store")
+
+    def sort(self, key=None, reverse: bool = False):
+        """Stable in-place sort, like list.sort"""
+        spaces = self._spaces
+        if key is None:
+            order = sorted(range(len(spaces)), key=spaces.__getitem__, reverse=reverse)
+        else:
+            order = sorted(range(len(spaces)), key=lambda index: key(spaces[index]), reverse=reverse)
+        self._permute(order)
+
+    def sort_by(self, *keys: np.ndarray):
+        """
+        Stable in-place sort by key columns, the first key being the primary one.
+
+        Args:
+            keys: One array per key, aligned with the store (e.g. built from the columns)
+        """
+        self._permute(np.lexsort(keys[::-1]).tolist())
+
+    def copy(self) -> "SpaceStore":
+        """Shallow copy sharing the MaximalSpace objects"""
+        clone = SpaceStore.__new__(SpaceStore)
+        clone._spaces = list(self._spaces)
+        clone._data = self._data.copy()
+        clone._safe = self._safe.copy()
+        clone._keys = list(self._keys)
+        clone._sorted = self._sorted
+        return clone
+
+    # Columns
+
+    def _column(self, column: int) -> np.ndarray:
+        return self._data[:len(self._spaces), column]
+
+    @property
+    def x(self) -> np.ndarray:
+        return self._column(X)
+
+    @property
+    def y(self) -> np.ndarray:
+        return self._column(Y)
+
+    @property
+    def z(self) -> np.ndarray:
+        return self._column(Z)
+
+    @property
+    def width(self) -> np.ndarray:
+        return self._column(WIDTH)
+
+    @property
+    def height(self) -> np.ndarray:
+        return self._column(HEIGHT)
+
+    @property
+    def depth(self) -> np.ndarray:
+        return self._column(DEPTH)
+
+    @property
+    def temperature_safe(self) -> np.ndarray:
+        """Whether each space is flagged temperature-safe (unset counts as not safe)"""
+        return self._safe[:len(self._spaces)] == _SAFE
+
+    # Queries
+
+    def fit_mask(self, dims: Sequence[float], z: Optional[float] = None, temperature_safe: bool = False,
+                 tolerance: float = 0.001) -> np.ndarray:
+        """
+        Boolean mask of the spaces that can hold dims (as MaximalSpace.can_fit_item).
+
+        Args:
+            dims: Item dimensions, compared with width, height and depth in that order
+            z: Only spaces whose z is within tolerance of this height
+            temperature_safe: Only spaces flagged temperature-safe
+            tolerance: Tolerance of the z restriction
+        """
+        mask = np.zeros(len(self._spaces), dtype=bool)
+        mask[self._fit_rows(dims, z, temperature_safe, tolerance)] = True
+        return mask
+
+    def fitting(self, dims: Sequence[float], z: Optional[float] = None, temperature_safe: bool = False,
+                tolerance: float = 0.001) -> List:
+        """Spaces that can hold dims, in store order (arguments as for fit_mask)"""
+        spaces = self._spaces
+        return [spaces[row] for row in self._fit_rows(dims, z, temperature_safe, tolerance).tolist()]
+
+    def level_rows(self, z: float, tolerance: float = 0.001) -> np.ndarray:
+        """Rows of the spaces whose z is within tolerance of a height, in store order"""
+        return self._fit_rows((-np.inf, -np.inf, -np.inf), z, False, tolerance)
+
+    def _fit_rows(self, dims: Sequence[float], z: Optional[float], temperature_safe: bool,
+                  tolerance: float, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """
+        Rows of the spaces fit_mask selects, in store order, optionally among rows start:stop only.
+
+        With a height, only the run of the sorted prefix at that height (found
+        by binary search on the placement keys, with bounds a tolerance wider
+        than the test) and the spaces appended since the last sort_for_placement
+        are tested.
+        """
+        count = len(self._spaces) if stop is None else stop
+        tail = None
+        if z is not None and stop is None:
+            if self._sorted < count:
+                tail = self._fit_rows(dims, z, temperature_safe, tolerance, self._sorted, count)
+            margin = 2 * tolerance
+            start = bisect_left(self._keys, (z - margin,))
+            count = bisect_right(self._keys, (z + margin, math.inf))
+        data = self._data[start:count]
+        mask = (data[:, WIDTH] >= dims[0]) & (data[:, HEIGHT] >= dims[1]) & (data[:, DEPTH] >= dims[2])
+        if z is not None:
+            mask &= np.abs(data[:, Z] - z) <= tolerance
+        if temperature_safe:
+            mask &= self._safe[start:count] == _SAFE
+        rows = np.flatnonzero(mask) + start
+        return rows if tail is None else np.concatenate((rows, tail))
+
+    def has_merge_candidates(self) -> bool:
+        """
+        Whether any two spaces satisfy ContainerCore._can_merge_spaces: same y, z,
+        height and depth, and touching along x.
+        """
+        count = len(self._spaces)
+        if count < 2:
+            return False
+        data = self._data[:count]
+        groups = data[:, (Y, Z, HEIGHT, DEPTH)]
+        order = np.lexsort(groups.T[::-1])
+        grouped = groups[order]
+        same = (grouped[1:] == grouped[:-1]).all(axis=1)
+        if not same.any():
+            return False
+
+        # Compare starts and ends along x within every group of two or more spaces
+        starts = data[order, X]
+        ends = starts + data[order, WIDTH]
+        boundaries = np.flatnonzero(~same) + 1
+        for first, last in zip([0] + boundaries.tolist(), boundaries.tolist() + [count]):
+            if last - first > 1 and not set(starts[first:last].tolist()).isdisjoint(ends[first:last].tolist()):
+                return True
+        return False
+
+    def boxes(self) -> np.ndarray:
+        """Corners (x0, y0, z0, x1, y1, z1) of every space, one row per space"""
+        data = self._data[:len(self._spaces)]
+        return np.concatenate((data[:, (X, Y, Z)], data[:, (X, Y, Z)] + data[:, (WIDTH, HEIGHT, DEPTH)]), axis=1)
+
+    def overlap_mask(self, box: Sequence[float], tolerance: float = MIN_EXTENT) -> np.ndarray:
+        """
+        Boolean mask of the spaces whose interior overlaps a box.
+
+        Args:
+            box: Corners (x0, y0, z0, x1, y1, z1)
+            tolerance: Overlap along an axis must exceed this to count
+        """
+        boxes = self.boxes()
+        return ((boxes[:, 3:] > np.asarray(box[:3]) + tolerance) &
+                (boxes[:, :3] < np.asarray(box[3:]) - tolerance)).all(axis=1)
+
+    def covered(self, boxes: np.ndarray, safe: np.ndarray) -> np.ndarray:
+        """
+        For each box, whether a stored space contains it.
+
+        A space that is not temperature-safe never covers a temperature-safe
+        box, since temperature-sensitive items may only use the latter.
+
+        Args:
+            boxes: Corners (x0, y0, z0, x1, y1, z1), one row per box
+            safe: Whether each box is temperature-safe
+        """
+        if not len(self._spaces) or not len(boxes):
+            return np.zeros(len(boxes), dtype=bool)
+        contains = _contains(self.boxes(), boxes) & (self.temperature_safe[:, None] | ~safe[None, :])
+        return contains.any(axis=0)
+
+    def carve(self, box: Sequence[float], tolerance: float = MIN_EXTENT) -> int:
+        """
+        Subtract a placed box from every space it overlaps.
+
+        Each overlapped space is replaced by its maximal parts around the box:
+        beside, in front of, behind, below and above it, each spanning the
+        full space along the other two axes. Parts inherit the space's
+        temperature_safe flag. Parts contained in another space are dropped,
+        so a store of maximal spaces stays one.
+
+        Args:
+            box: Corners (x0, y0, z0, x1, y1, z1) of the placed box
+            tolerance: Extents and overlaps at or below this count as empty
+
+        Returns:
+            Number of spaces added (they are appended at the end)
+        """
+        hit = self.overlap_mask(box, tolerance)
+        if not hit.any():
+            return 0
+        rows = np.flatnonzero(hit)
+        x, y, z, w, d, h = self._data[rows].T
+        flags = self._safe[rows]
+        bx0, by0, bz0, bx1, by1, bz1 = box
+        parts = np.stack((
+            np.column_stack((x, y, z, bx0 - x, d, h)),
+            np.column_stack((np.full_like(x, bx1), y, z, x + w - bx1, d, h)),
+            np.column_stack((x, y, z, w, by0 - y, h)),
+            np.column_stack((x, np.full_like(y, by1), z, w, y + d - by1, h)),
+            np.column_stack((x, y, z, w, d, bz0 - z)),
+            np.column_stack((x, y, np.full_like(z, bz1), w, d, z + h - bz1)),
+        ), axis=1).reshape(-1, 6)
+        flags = np.repeat(flags, 6)
+        valid = (parts[:, 3:] > tolerance).all(axis=1)
+        parts, flags = parts[valid], flags[valid]
+        self.delete(hit)
+
+        corners = np.concatenate((parts[:, :3], parts[:, :3] + parts[:, 3:]), axis=1)
+        safe = flags == _SAFE
+        keep = ~(dominated(corners, safe) | self.covered(corners, safe))
+        parts, flags = parts[keep], flags[keep]
+
+        start = len(self._spaces)
+        self._reserve(start + len(parts))
+        self._data[start:start + len(parts)] = parts
+        self._safe[start:start + len(parts)] = flags
+        for row, flag in zip(parts.tolist(), flags.tolist()):
+            space = MaximalSpace(*row)
+            space.temperature_safe = None if flag == _UNSET else flag == _SAFE
+            self._spaces.append(space)
+        return len(parts)
+
+    def select(self, mask: np.ndarray) -> List:
+        """Spaces where mask is set, in store order"""
+        spaces = self._spaces
+        return [spaces[index] for index in np.flatnonzero(mask).tolist()]
+
+    def delete(self, mask: np.ndarray):
+        """Remove the spaces where mask is set, keeping the order of the others"""
+        keep = ~np.asarray(mask, dtype=bool)
+        count = int(keep.sum())
+        self._spaces = [space for space, kept in zip(self._spaces, keep.tolist()) if kept]
+        self._data[:count] = self._data[:len(keep)][keep]
+        self._safe[:count] = self._safe[:len(keep)][keep]
+        self._keys = [key for key, kept in zip(self._keys, keep[:self._sorted].tolist()) if kept]
+        self._sorted = len(self._keys)
+
+    # Placement order
+
+    def sort_for_placement(self):
+        """
+        Bring the store into placement order (see placement_key).
+
+        Spaces added since the last call are inserted at their sorted
+        position, after spaces with an equal key, which matches a stable sort
+        of the whole list.
+        """
+        count = len(self._spaces)
+        if self._sorted == count:
+            return
+        if self._sorted * 2 < count:
+            keys = [placement_key(space) for space in self._spaces]
+            order = sorted(range(count), key=keys.__getitem__)
+            self._permute(order)
+            self._keys = [keys[index] for index in order]
+            self._sorted = count
+            return
+
+        keys = self._keys
+        data, safe = self._data, self._safe
+        for row in range(self._sorted, count):
+            space = self._spaces[row]
+            key = placement_key(space)
+            target = bisect_right(keys, key)
+            if target < row:
+                del self._spaces[row]
+                self._spaces.insert(target, space)
+                moved, moved_safe = data[row].copy(), safe[row]
+                data[target + 1:row + 1] = data[target:row]
+                safe[target + 1:row + 1] = safe[target:row]
+                data[target], safe[target] = moved, moved_safe
+            keys.insert(target, key)
+        self._sorted = count
+
+    # Internals
+
+    def _write(self, row: int, space):
+        self._data[row] = (space.x, space.y, space.z, space.width, space.height, space.depth)
+        self._safe[row] = _flag(space)
+
+    def _reserve(self, count: int):
+        if count > len(self._data):
+            capacity = max(count, 2 * len(self._data))
+            data = np.empty((capacity, 6))
+            safe = np.empty(capacity, dtype=np.int8)
+            used = len(self._spaces)
+            data[:used] = self._data[:used]
+            safe[:used] = self._safe[:used]
+            self._data, self._safe = data, safe
+
+    def _permute(self, order: List[int]):
+        count = len(order)
+        self._spaces = [self._spaces[index] for index in order]
+        self._data[:count] = self._data[order]
+        self._safe[:count] = self._safe[order]
+        self._truncate_sorted(0)
+
+    def _truncate_sorted(self, length: int):
+        if length < self._sorted:
+            self._sorted = length
+            del self._keys[length:]
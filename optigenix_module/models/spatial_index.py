@@ -0,0 +1,231 @@
+"""
+Uniform-grid spatial index over the items placed in a container.
+
+Placement checks (overlap, support, "anything above me") used to scan every
+placed item, making packing quadratic in the item count. The index buckets
+placed boxes into a uniform 3D grid sized from the container, so each query
+only tests the boxes sharing a cell with the query region.
+"""
+import math
+from typing import Iterable, List, Set, Tuple
+
+import numpy as np
+
+from .item_mirror import ItemMirror
+
+# Default number of grid cells for a container; the cell edge follows from its volume
+DEFAULT_TARGET_CELLS = 512
+
+
+class SpatialIndex(ItemMirror):
+    """
+    Uniform 3D grid of placed item boxes
+
+    A box is registered in every cell its closed extent touches, so boxes that
+    only touch a query region (e.g. the item a box rests on) are still found.
+    Queries return candidates from those cells and apply the exact geometric
+    test, giving the same answers as a scan over all items.
+    """
+
+    def __init__(self, container_dims: Tuple[float, float, float], target_cells: int = DEFAULT_TARGET_CELLS):
+        """
+        Args:
+            container_dims: Container dimensions (length, width, height)
+            target_cells: Approximate number of grid cells
+        """
+        self.container_dims = tuple(float(d) for d in container_dims)
+        volume = self.container_dims[0] * self.container_dims[1] * self.container_dims[2]
+        self.cell_size = max((volume / max(1, target_cells)) ** (1.0 / 3.0), 1e-6)
+        super().__init__()
+
+    def _rebuild(self):
+        """Drop every indexed box"""
+        self._cells = {}
+        self._boxes: List[Tuple[float, float, float, float, float, float]] = []  # x0, y0, z0, x1, y1, z1
+        self._extent = None  # Bounding box of all indexed boxes: [x0, y0, z0, x1, y1, z1]
+        self._array = np.empty((0, 9))  # Rows of position, dimensions and far corner, grown by arrays()
+        self._array_count = 0  # Leading rows of _array that are filled in
+
+    def _append(self, item):
+        """Index a placed item by its position and (rotated) dimensions"""
+        x, y, z = item.position
+        w, d, h = item.dimensions
+        box = (x, y, z, x + w, y + d, z + h)
+        slot = len(self._items)
+        self._boxes.append(box)
+        extent = self._extent
+        if extent is None:
+            self._extent = list(box)
+        else:
+            for axis in range(3):
+                extent[axis] = min(extent[axis], box[axis])
+                extent[axis + 3] = max(extent[axis + 3], box[axis + 3])
+        for cell in self._cell_range(*box):
+            bucket = self._cells.get(cell)
+            if bucket is None:
+                self._cells[cell] = [slot]
+            else:
+                bucket.append(slot)
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Indexed boxes as arrays for batched geometry, one row per slot.
+
+        Returns:
+            (positions, dimensions, far corners), each of shape (n, 3); the far
+            corners hold the same floats as the boxes the queries test
+        """
+        count, filled = len(self._boxes), self._array_count
+        if len(self._array) < count:
+            grown = np.empty((max(count, 2 * len(self._array), 32), 9))
+            grown[:filled] = self._array[:filled]
+            self._array = grown
+        if filled < count:
+            self._array[filled:count] = [tuple(item.position) + tuple(item.dimensions) + box[3:]
+                                         for item, box in zip(self._items[filled:count], self._boxes[filled:count])]
+            self._array_count = count
+        rows = self._array[:count]
+        return rows[:, 0:3], rows[:, 3:6], rows[:, 6:9]
+
+    def _cell_range(self, x0, y0, z0, x1, y1, z1) -> Iterable[Tuple[int, int, int]]:
+        size = self.cell_size
+        i0, i1 = math.floor(x0 / size), math.floor(x1 / size)
+        j0, j1 = math.floor(y0 / size), math.floor(y1 / size)
+        k0, k1 = math.floor(z0 / size), math.floor(z1 / size)
+        return ((i, j, k) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1) for k in range(k0, k1 + 1))
+
+    def _candidates(self, x0, y0, z0, x1, y1, z1) -> Set[int]:
+        cells = self._cells
+        slots = set()
+        for cell in self._cell_range(x0, y0, z0, x1, y1, z1):
+            bucket = cells.get(cell)
+            if bucket:
+                slots.update(bucket)
+        return slots
+
+    def overlaps(self, pos, dims) -> bool:
+        """Whether a box at pos with dims overlaps any placed item (touching faces do not count)"""
+        x, y, z = pos
+        w, d, h = dims
+        x1, y1, z1 = x + w, y + d, z + h
+        boxes = self._boxes
+        for slot in self._candidates(x, y, z, x1, y1, z1):
+            bx0, by0, bz0, bx1, by1, bz1 = boxes[slot]
+            if not (x1 <= bx0 or bx1 <= x or y1 <= by0 or by1 <= y or z1 <= bz0 or bz1 <= z):
+                return True
+        return False
+
+    def items_below(self, pos, footprint, tolerance: float = 0.001) -> List:
+        """
+        Placed items whose top face is at pos's z (within tolerance) and overlaps the footprint.
+
+        Args:
+            pos: (x, y, z) of the footprint's corner
+            footprint: (width, depth)
+            tolerance: Maximum distance between an item top and z; 0 requires exact equality
+
+        Returns:
+            List of items, in placement order
+        """
+        x, y, z = pos
+        w, d = footprint
+        x1, y1 = x + w, y + d
+        boxes = self._boxes
+        found = []
+        for slot in self._candidates(x, y, z - tolerance, x1, y1, z + tolerance):
+            bx0, by0, _, bx1, by1, bz1 = boxes[slot]
+            on_top = abs(bz1 - z) < tolerance if tolerance > 0 else bz1 == z
+            if on_top and not (x1 <= bx0 or bx1 <= x or y1 <= by0 or by1 <= y):
+                found.append(slot)
+        return [self._items[slot] for slot in sorted(found)]
+
+    def near(self, pos, dims, margin: float = 0.0) -> List[int]:
+        """
+        Placed boxes whose closed extent meets the box at pos with dims grown by margin on every side.
+
+        Args:
+            pos: (x, y, z) of the query box
+            dims: (w, d, h) of the query box
+            margin: Distance added around the query box
+
+        Returns:
+            Slots of the boxes in placement order; a slot is the item's index in the mirrored item list
+        """
+        x, y, z = pos
+        w, d, h = dims
+        x0, y0, z0 = x - margin, y - margin, z - margin
+        x1, y1, z1 = x + w + margin, y + d + margin, z + h + margin
+        boxes = self._boxes
+        found = []
+        for slot in self._candidates(x0, y0, z0, x1, y1, z1):
+            bx0, by0, bz0, bx1, by1, bz1 = boxes[slot]
+            if bx1 >= x0 and bx0 <= x1 and by1 >= y0 and by0 <= y1 and bz1 >= z0 and bz0 <= z1:
+                found.append(slot)
+        found.sort()
+        return found
+
+    def any_above(self, footprint_pos, footprint, z: float) -> bool:
+        """Whether any placed item starts strictly above z and overlaps the footprint"""
+        x, y = footprint_pos
+        w, d = footprint
+        x1, y1 = x + w, y + d
+        boxes = self._boxes
+        for slot in self._candidates(x, y, z, x1, y1, self.container_dims[2]):
+            bx0, by0, bz0, bx1, by1, _ = boxes[slot]
+            if bz0 > z and not (x1 <= bx0 or bx1 <= x or y1 <= by0 or by1 <= y):
+                return True
+        return False
+
+    def clearances(self, pos, dims) -> List[float]:
+        """
+        Free distance from a box at pos with dims to the nearest placed item or wall in each direction.
+
+        Only items whose cross-section overlaps the box's face (touching edges do not count) block a
+        direction. Each direction walks the grid layer by layer away from the face and stops once no
+        unvisited layer can hold a closer item, or at the edge of the indexed boxes.
+
+        Args:
+            pos: (x, y, z) of the box
+            dims: (w, d, h) of the box
+
+        Returns:
+            Distances along -x, -y, +x, +y, -z and +z
+        """
+        low = tuple(pos)
+        high = (low[0] + dims[0], low[1] + dims[1], low[2] + dims[2])
+        size = self.cell_size
+        limits = self.container_dims
+        cells = self._cells
+        boxes = self._boxes
+        extent = self._extent
+        distances = []
+        # (axis, towards the origin) in the order of the returned distances
+        for axis, negative in ((0, True), (1, True), (0, False), (1, False), (2, True), (2, False)):
+            b, c = [other for other in range(3) if other != axis]
+            lo_b, hi_b, lo_c, hi_c = low[b], high[b], low[c], high[c]
+            section = [(j, k) for j in range(math.floor(lo_b / size), math.floor(hi_b / size) + 1)
+                       for k in range(math.floor(lo_c / size), math.floor(hi_c / size) + 1)]
+            if negative:
+                face = low[axis]
+                nearest = face
+                layers = range(math.floor(face / size), math.floor(extent[axis] / size) - 1, -1) if extent else ()
+            else:
+                face = high[axis]
+                nearest = limits[axis] - face
+                layers = range(math.floor(face / size), math.floor(extent[axis + 3] / size) + 1) if extent else ()
+            for layer in layers:
+                # Closest an item first registered in this layer can be
+                if (face - (layer + 1) * size if negative else layer * size - face) >= nearest:
+                    break
+                for j, k in section:
+                    cell = (layer, j, k) if axis == 0 else (j, layer, k) if axis == 1 else (j, k, layer)
+                    for slot in cells.get(cell, ()):
+                        box = boxes[slot]
+                        if box[b] < hi_b and box[b + 3] > lo_b and box[c] < hi_c and box[c + 3] > lo_c:
+                            if negative:
+                                if box[axis + 3] <= face:
+                                    nearest = min(nearest, face - box[axis + 3])
+                            elif box[axis] >= face:
+                                nearest = min(nearest, box[axis] - face)
+            distances.append(nearest)
+        return distances
@@ -0,0 +1,47 @@
+"""
+Length units of the packing geometry.
+
+Containers, free spaces and placement records work in metres by default,
+with float coordinates compared through small tolerances in some places and
+exactly in others. They can instead work on integer millimetres: sums and
+differences of coordinates are then exact, every tolerance test degenerates
+to an equality test, and equal positions and spaces are equal keys for
+caches and de-duplication. Lengths are converted when they enter the packing
+core (container and item dimensions, metre-valued settings) and converted
+back to metres for reporting.
+"""
+from typing import Sequence, Tuple
+
+# Supported coordinate units
+UNITS = ('m', 'mm')
+
+MM_PER_M = 1000
+
+
+def check_units(units: str) -> str:
+    """Validate a coordinate-unit name"""
+    if units not in UNITS:
+        raise ValueError(f"Unknown coordinate units: {units} (expected one of {', '.join(UNITS)})")
+    return units
+
+
+def to_units(meters: float, units: str):
+    """A length in metres expressed in units: a float for 'm', whole millimetres (int) for 'mm'"""
+    if units == 'mm':
+        return int(round(meters * MM_PER_M))
+    return float(meters)
+
+
+def dims_to_units(dims: Sequence[float], units: str) -> Tuple:
+    """Dimensions or a position in metres expressed in units"""
+    return tuple(to_units(value, units) for value in dims)
+
+
+def meters_per_unit(units: str) -> float:
+    """Length of one coordinate unit in metres"""
+    return 1.0 / MM_PER_M if units == 'mm' else 1.0
+
+
+def to_meters(length, units: str) -> float:
+    """A length in units expressed in metres"""
+    return length / MM_PER_M if units == 'mm' else length
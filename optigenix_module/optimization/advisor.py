@@ -0,0 +1,93 @@
+"""
+Background LLM advisor for the genetic algorithm.
+
+LLM round-trips (including client-side retry back-off) take seconds, while a
+generation may take a fraction of that. The advisor runs advice requests on a
+background thread; the generation loop queues requests and polls for answers
+without ever waiting on the network.
+"""
+import queue
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger("packer")
+
+
+class LLMAdvisor:
+    """
+    Runs LLM advice requests on a background thread
+
+    Advice is grouped by topic (e.g. "mutation", "weights"). At most one request
+    per topic is in flight; its result is held until the next poll for that topic
+    and handed out once.
+    """
+
+    def __init__(self, name: str = "llm-advisor"):
+        """
+        Args:
+            name: Name of the background thread
+        """
+        self._requests = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._fresh: Dict[str, Any] = {}
+        self._closed = False
+        self.requests_made = 0
+        self.responses_received = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def request(self, topic: str, func: Callable, *args, **kwargs) -> bool:
+        """
+        Queue an advice request unless one for the same topic is already in flight.
+
+        Args:
+            topic: Advice topic
+            func: Callable producing the advice (None means no advice)
+            *args, **kwargs: Arguments for func
+
+        Returns:
+            bool: True if a new request was queued
+        """
+        with self._lock:
+            if self._closed or topic in self._pending:
+                return False
+            self._pending.add(topic)
+            self.requests_made += 1
+        self._requests.put((topic, func, args, kwargs))
+        return True
+
+    def poll(self, topic: str) -> Optional[Any]:
+        """Return fresh advice for a topic if some has arrived since the last poll"""
+        with self._lock:
+            return self._fresh.pop(topic, None)
+
+    def is_pending(self, topic: Optional[str] = None) -> bool:
+        """Whether a request for the topic (or any topic) is still being answered"""
+        with self._lock:
+            return topic in self._pending if topic is not None else bool(self._pending)
+
+    def close(self):
+        """Stop the background thread; answers still in flight are discarded"""
+        with self._lock:
+            self._closed = True
+            self._fresh.clear()
+        self._requests.put(None)
+
+    def _run(self):
+        while True:
+            task = self._requests.get()
+            if task is None:
+                return
+            topic, func, args, kwargs = task
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"❌ LLM advisor request '{topic}' failed: {e}")
+                result = None
+            with self._lock:
+                self._pending.discard(topic)
+                if result is not None and not self._closed:
+                    self._fresh[topic] = result
+                    self.responses_received += 1
@@ -0,0 +1,218 @@
+"""
+Alternative arrangements of a packed container.
+
+The layer packer is deterministic, so asking it again for "another" plan
+returns the same layout. Alternatives come from a portfolio of runs that each
+pack the container's items in a perturbed order, with differently weighted
+placement scores (both from a seeded generator) or with another placement
+engine. The runs are independent and
+execute concurrently within a deadline; layouts that differ only by swapping
+identical items or by sub-centimetre offsets share a placement hash and are
+kept once.
+"""
+import os
+import time
+import random
+import hashlib
+import logging
+from copy import deepcopy
+from concurrent.futures import ProcessPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from optigenix_module.models.container import EnhancedContainer
+from optigenix_module.models.container_core import PLACEMENT_ENGINES
+from optigenix_module.models.item import Item
+from optigenix_module.models.units import meters_per_unit
+
+logger = logging.getLogger("arrangements")
+
+# Constraint weights of pack_items when a container carries none (e.g. a genetic-algorithm plan)
+DEFAULT_CONSTRAINT_WEIGHTS = {
+    'volume_utilization_weight': 0.75,
+    'stability_score_weight': 0.50,
+    'contact_ratio_weight': 0.50,
+    'weight_balance_weight': 0.25,
+    'items_packed_ratio_weight': 0.25,
+    'temperature_constraint_weight': 0.30
+}
+
+# Constraint weight -> arrangement metric it weighs in the arrangement score
+SCORE_METRICS = {
+    'volume_utilization_weight': 'volume_utilization',
+    'stability_score_weight': 'stability_score',
+    'contact_ratio_weight': 'contact_ratio',
+    'weight_balance_weight': 'weight_balance',
+    'items_packed_ratio_weight': 'items_packed_ratio'
+}
+
+# Placements closer than this (m) count as the same placement when hashing a layout
+HASH_PRECISION = 0.01
+
+
+def placement_hash(container: EnhancedContainer, precision: float = HASH_PRECISION) -> str:
+    """
+    Hash of a container's layout that ignores item names and placement order.
+
+    Positions and dimensions are rounded to precision (m), so layouts that only
+    swap identical items or shift them by a few millimetres hash the same.
+    """
+    step = precision / meters_per_unit(getattr(container, 'units', 'm'))
+    boxes = sorted(tuple(round(value / step) for value in tuple(item.position) + tuple(item.dimensions))
+                   for item in container.items)
+    return hashlib.md5(repr(boxes).encode()).hexdigest()
+
+
+def arrangement_metrics(container: EnhancedContainer, total_items: int) -> Dict[str, float]:
+    """Metrics of a packed container, each between 0 and 1 (higher is better)"""
+    return {
+        'volume_utilization': float(container.volume_utilization),
+        'stability_score': float(container.calculate_overall_stability_score()),
+        'contact_ratio': float(container.calculate_overall_contact_ratio()),
+        'weight_balance': float(container._calculate_weight_balance_score()),
+        'items_packed_ratio': len(container.items) / total_items if total_items else 0.0
+    }
+
+
+def arrangement_score(metrics: Dict[str, float], constraint_weights: Dict[str, float]) -> float:
+    """Weighted mean of arrangement metrics, weighted by the matching constraint weights"""
+    weights = {metric: constraint_weights.get(key, 0.0) for key, metric in SCORE_METRICS.items()}
+    total = sum(weights.values())
+    if total <= 0:
+        return 0.0
+    return sum(metrics[metric] * weight for metric, weight in weights.items()) / total
+
+
+def arrangement_variants(runs: int, constraint_weights: Dict[str, float], placement_engine: str,
+                         seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Settings of the portfolio runs.
+
+    Run 0 repeats the given settings, so it reproduces a layout packed with them.
+    Every other run scales each constraint weight by a factor between 0.25 and 1.75
+    drawn from its own seeded generator and perturbs the packing order with its seed
+    (see perturb_order); every other run uses the other placement engine. Weights
+    alone rarely move the 'spaces' engine, whose candidates tie often; the order does.
+
+    Returns:
+        Dicts of variant (run index), seed, constraint_weights, order_seed (None for
+        run 0) and placement_engine
+    """
+    other_engine = next(engine for engine in PLACEMENT_ENGINES if engine != placement_engine)
+    variants = []
+    for index in range(runs):
+        run_seed = seed * 1000003 + index
+        rng = random.Random(run_seed)
+        weights = dict(constraint_weights) if index == 0 else {
+            key: value * rng.uniform(0.25, 1.75) for key, value in constraint_weights.items()}
+        variants.append({
+            'variant': index,
+            'seed': run_seed,
+            'constraint_weights': weights,
+            'order_seed': None if index == 0 else run_seed,
+            'placement_engine': placement_engine if index % 2 == 0 else other_engine
+        })
+    return variants
+
+
+def _pack_variant(dims: Sequence[float], units: List[Item], variant: Dict[str, Any],
+                  settings: Dict[str, Any]) -> EnhancedContainer:
+    """
+    Worker entry point: pack the units with one variant's settings.
+
+    Returns:
+        The packed container, with variant and pack_seconds set
+    """
+    started = time.monotonic()
+    container = EnhancedContainer(dims, placement_engine=variant['placement_engine'],
+                                  occupancy_resolution=settings['occupancy_resolution'])
+    container.pack_items(units, settings['route_temperature'], constraint_weights=variant['constraint_weights'],
+                         expanded=True, order_seed=variant['order_seed'])
+    container.variant = variant
+    container.pack_seconds = time.monotonic() - started
+    return container
+
+
+def _run_portfolio(dims, units, variants, settings, workers, deadline) -> List[EnhancedContainer]:
+    """Pack every variant that finishes before the deadline (time.monotonic() value, None for no limit)"""
+    finished = []
+    total = len(variants)
+    if workers > 1 and len(variants) > 1:
+        pool = ProcessPoolExecutor(max_workers=min(workers, len(variants)))
+        try:
+            futures = [pool.submit(_pack_variant, dims, units, variant, settings) for variant in variants]
+            timeout = max(0.0, deadline - time.monotonic()) if deadline is not None else None
+            for future in as_completed(futures, timeout=timeout):
+                finished.append(future.result())
+            return finished
+        except FuturesTimeoutError:
+            logger.warning(f"⏱️  Arrangement deadline reached: {len(finished)} of {total} runs finished")
+            return finished
+        except BrokenProcessPool as e:
+            logger.error(f"❌ Arrangement worker pool failed ({e}). Running the remaining variants in this process.")
+            done = {container.variant['variant'] for container in finished}
+            variants = [variant for variant in variants if variant['variant'] not in done]
+        finally:
+            # Runs still in progress are abandoned, not waited for
+            pool.shutdown(wait=False, cancel_futures=True)
+    for variant in variants:
+        if deadline is not None and time.monotonic() >= deadline:
+            logger.warning(f"⏱️  Arrangement deadline reached: {len(finished)} of {total} runs finished")
+            break
+        # Each run packs its own copy of the units: packing sets their positions
+        finished.append(_pack_variant(dims, deepcopy(units), variant, settings))
+    return finished
+
+
+def generate_arrangements(units: List[Item], container_dims: Sequence[float], count: int = 5,
+                          constraint_weights: Optional[Dict[str, float]] = None, route_temperature=None,
+                          placement_engine: str = 'spaces', occupancy_resolution=None, runs: Optional[int] = None,
+                          deadline_seconds: Optional[float] = None, parallel_workers: Optional[int] = None,
+                          seed: int = 0, exclude: Sequence[str] = ()) -> List[Tuple[EnhancedContainer, float]]:
+    """
+    Pack units in several diversified ways and keep the best distinct layouts.
+
+    Args:
+        units: Packable units (quantity already expanded); they are copied, not modified
+        container_dims: Container dimensions in metres
+        count: Maximum number of arrangements returned
+        constraint_weights: Constraint weights the variants start from and the score uses
+        route_temperature: Route temperature for temperature-sensitive items
+        placement_engine: Placement engine of run 0; other runs alternate with the other engine
+        occupancy_resolution: Voxel edge (m) of the occupancy bitmap; None disables it
+        runs: Number of portfolio runs (defaults to twice count, leaving room for duplicates)
+        deadline_seconds: Wall-clock budget; runs not finished by then are dropped
+        parallel_workers: Worker processes running variants concurrently; None uses one per CPU
+        seed: Seed of the weight perturbations; equal seeds give equal portfolios
+        exclude: Placement hashes of layouts not to return (e.g. the current plan)
+
+    Returns:
+        (container, score) pairs, best score first; each container carries its
+        variant settings, placement_hash, metrics and pack_seconds
+    """
+    started = time.monotonic()
+    deadline = started + deadline_seconds if deadline_seconds is not None else None
+    constraint_weights = constraint_weights or DEFAULT_CONSTRAINT_WEIGHTS
+    workers = max(1, parallel_workers or os.cpu_count() or 1)
+    variants = arrangement_variants(runs or 2 * count, constraint_weights, placement_engine, seed)
+    settings = dict(route_temperature=route_temperature, occupancy_resolution=occupancy_resolution)
+
+    finished = _run_portfolio(container_dims, units, variants, settings, workers, deadline)
+
+    best = {}  # placement hash -> (container, score)
+    excluded = set(exclude)
+    for container in sorted(finished, key=lambda container: container.variant['variant']):
+        if not container.items:
+            continue
+        container.placement_hash = placement_hash(container)
+        if container.placement_hash in excluded:
+            continue
+        container.metrics = arrangement_metrics(container, len(units))
+        score = arrangement_score(container.metrics, constraint_weights)
+        known = best.get(container.placement_hash)
+        if known is None or score > known[1]:
+            best[container.placement_hash] = (container, score)
+    arrangements = sorted(best.values(), key=lambda entry: -entry[1])[:count]
+    logger.info(f"🔀 {len(arrangements)} distinct arrangements from {len(finished)} of {len(variants)} runs "
+                f"in {time.monotonic() - started:.2f}s")
+    return arrangements
@@ -0,0 +1,360 @@
+"""
+Multi-container (fleet) packing for manifests that exceed one container.
+
+A single packing run lists whatever does not fit as unpacked. Fleet packing
+first partitions the manifest over containers of the selected types by volume
+and payload (first-fit decreasing), then packs every container independently,
+concurrently on a process pool. Units a container cannot place after all are
+first offered to the free space of the packed containers, then spill over into
+a further round of containers, until everything is placed or a round places
+nothing.
+"""
+import os
+import time
+import logging
+import datetime
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from optigenix_module.constants import (CONTAINER_TYPES, get_predefined_container_dimensions,
+                                        get_predefined_container_payload)
+from optigenix_module.models.container import EnhancedContainer
+from optigenix_module.models.container_packing import expand_quantities
+from optigenix_module.models.item import Item
+from optigenix_module.optimization.genetic import optimize_packing_with_genetic_algorithm
+
+logger = logging.getLogger("fleet")
+
+# Packing run used for each container of a fleet
+FLEET_ALGORITHMS = ('regular', 'genetic')
+
+# Share of a container's volume the partitioner fills before opening the next one;
+# layer packing rarely reaches full utilization, so units are not planned right up to it
+DEFAULT_FILL_FACTOR = 0.85
+
+
+def _volume(dims: Sequence[float]) -> float:
+    return dims[0] * dims[1] * dims[2]
+
+
+def fits_container(item: Item, container_dims: Sequence[float]) -> bool:
+    """Whether some rotation the packer may use fits the item inside an empty container"""
+    l, w, h = item.dimensions
+    for rot in ((l, w, h), (l, h, w), (w, l, h), (w, h, l), (h, l, w), (h, w, l)):
+        if (all(d <= max_d for d, max_d in zip(rot, container_dims)) and
+                (item.fragility != 'HIGH' or rot[2] <= item.dimensions[2])):
+            return True
+    return False
+
+
+def container_capacities(container_types: Sequence[str]) -> Dict[str, Tuple[Tuple[float, float, float], float]]:
+    """
+    Dimensions and payload of predefined container types.
+
+    Returns:
+        Dict of type name -> ((length, width, height), max payload in kg; inf when unknown)
+
+    Raises:
+        ValueError: No types are given or a type is not in CONTAINER_TYPES
+    """
+    if not container_types:
+        raise ValueError("At least one container type is required")
+    capacities = {}
+    for name in container_types:
+        if name not in CONTAINER_TYPES:
+            raise ValueError(f"Unknown container type: {name}")
+        payload = get_predefined_container_payload(name)
+        capacities[name] = (tuple(float(d) for d in get_predefined_container_dimensions(name)),
+                            float(payload) if payload else float('inf'))
+    return capacities
+
+
+def partition_items(units: List[Item], container_types: Sequence[str],
+                    fill_factor: float = DEFAULT_FILL_FACTOR) -> Tuple[List[Tuple[str, List[Item]]], List[Tuple[Item, str]]]:
+    """
+    Assign units to as few containers as volume and payload allow (first-fit decreasing).
+
+    Units are taken largest first and go to the first open container with room for
+    them, otherwise into a new container of the largest type that can hold them.
+    Each container is then swapped for the smallest selected type that still holds
+    its units, so a mix of types ends with smaller containers where they suffice.
+
+    Args:
+        units: Packable units (see expand_quantities)
+        container_types: Names of the container types to use, from CONTAINER_TYPES
+        fill_factor: Share of a container's volume that may be assigned to it
+
+    Returns:
+        (partitions, rejected): (container type, units) per container in opening
+        order, and (unit, reason) for units no selected container type can take
+    """
+    capacities = container_capacities(container_types)
+    largest_first = sorted(capacities, key=lambda name: -_volume(capacities[name][0]))
+    bins = []  # [container type, units, assigned volume, assigned weight]
+    rejected = []
+    for unit in sorted(units, key=lambda unit: (-_volume(unit.dimensions), -unit.weight)):
+        volume = _volume(unit.dimensions)
+        for entry in bins:
+            dims, payload = capacities[entry[0]]
+            if (entry[2] + volume <= _volume(dims) * fill_factor and entry[3] + unit.weight <= payload and
+                    fits_container(unit, dims)):
+                entry[1].append(unit)
+                entry[2] += volume
+                entry[3] += unit.weight
+                break
+        else:
+            fitting = [name for name in largest_first if fits_container(unit, capacities[name][0])]
+            name = next((name for name in fitting if unit.weight <= capacities[name][1]), None)
+            if name is not None:
+                bins.append([name, [unit], volume, unit.weight])
+            elif fitting:
+                rejected.append((unit, f"Item weight ({unit.weight:.1f}kg) exceeds the payload of every "
+                                       f"selected container type ({', '.join(fitting)})"))
+            else:
+                rejected.append((unit, f"Item dimensions ({unit.dimensions[0]:.2f}×{unit.dimensions[1]:.2f}×"
+                                       f"{unit.dimensions[2]:.2f}m) exceed every selected container type"))
+
+    partitions = []
+    for name, assigned, volume, weight in bins:
+        for smaller in reversed(largest_first):
+            dims, payload = capacities[smaller]
+            if (volume <= _volume(dims) * fill_factor and weight <= payload and
+                    all(fits_container(unit, dims) for unit in assigned)):
+                name = smaller
+                break
+        partitions.append((name, assigned))
+    return partitions, rejected
+
+
+def _pack_fleet_container(container_type: str, units: List[Item], settings: Dict[str, Any]) -> EnhancedContainer:
+    """
+    Worker entry point: pack one container of a fleet.
+
+    Args:
+        container_type: Name of the container type
+        units: Units assigned to the container
+        settings: Packing settings (see pack_containers)
+
+    Returns:
+        The packed container, with container_type and pack_seconds set
+    """
+    started = time.monotonic()
+    dims = get_predefined_container_dimensions(container_type)
+    if settings['algorithm'] == 'genetic':
+        container = optimize_packing_with_genetic_algorithm(
+            units, dims,
+            population_size=settings['population_size'],
+            generations=settings['generations'],
+            fitness_weights=settings['fitness_weights'],
+            route_temperature=settings['route_temperature'],
+            deadline_seconds=settings['deadline_seconds'],
+            placement_engine=settings['placement_engine'],
+            occupancy_resolution=settings['occupancy_resolution'])
+    else:
+        container = EnhancedContainer(dims, placement_engine=settings['placement_engine'],
+                                      occupancy_resolution=settings['occupancy_resolution'])
+        container.pack_items(units, settings['route_temperature'], constraint_weights=settings['constraint_weights'],
+                             expanded=True)
+    container.container_type = container_type
+    container.pack_seconds = time.monotonic() - started
+    return container
+
+
+def pack_containers(partitions: List[Tuple[str, List[Item]]], settings: Dict[str, Any],
+                    workers: int) -> List[EnhancedContainer]:
+    """
+    Pack one container per partition, on a process pool when there are several workers and containers.
+
+    Args:
+        partitions: (container type, units) per container; each container packs its own units
+        settings: algorithm ('regular' or 'genetic'), route_temperature, constraint_weights,
+                  fitness_weights, population_size, generations, deadline_seconds,
+                  placement_engine and occupancy_resolution, as pack_fleet takes them
+        workers: Maximum number of worker processes
+
+    Returns:
+        The packed containers in partition order, with container_type and pack_seconds set
+    """
+    if workers > 1 and len(partitions) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(partitions))) as pool:
+                return list(pool.map(_pack_fleet_container, *zip(*partitions), [settings] * len(partitions)))
+        except BrokenProcessPool as e:
+            logger.error(f"❌ Fleet worker pool failed ({e}). Packing containers in this process.")
+    return [_pack_fleet_container(name, units, settings) for name, units in partitions]
+
+
+def _leftovers(container: EnhancedContainer) -> List[Tuple[Item, str]]:
+    """Take the units a packed container could not place, with the reason, off its unpacked lists"""
+    leftovers = [(item, reason) for reason, item in getattr(container, 'unpacked_reasons', {}).values()]
+    leftovers += [(item, "Failed to place item with genetic algorithm - Try adjusting algorithm parameters")
+                  for item in getattr(container, 'unpacked_items', [])]
+    container.unpacked_reasons = {}
+    container.unpacked_items = []
+    return leftovers
+
+
+def _top_up(containers: List[EnhancedContainer], units: List[Item], settings: Dict[str, Any]) -> List[Item]:
+    """
+    Place spilled units in the free space of already packed containers.
+
+    Each container continues layer packing with the units its remaining volume and
+    payload could take, so a small spill-over does not open a container of its own.
+
+    Returns:
+        The units still not placed
+    """
+    for container in containers:
+        if not units:
+            break
+        payload = get_predefined_container_payload(container.container_type) or float('inf')
+        volume, weight = container.remaining_volume, payload - container.total_weight
+        offered, rest = [], []
+        for unit in units:
+            unit_volume = _volume(unit.dimensions)
+            if unit_volume <= volume and unit.weight <= weight:
+                offered.append(unit)
+                volume -= unit_volume
+                weight -= unit.weight
+            else:
+                rest.append(unit)
+        if offered:
+            container.pack_items(offered, settings['route_temperature'],
+                                 constraint_weights=settings['constraint_weights'], expanded=True)
+            units = [item for item, _ in _leftovers(container)] + rest
+    return units
+
+
+def pack_fleet(items: List[Item], container_types: Sequence[str], route_temperature=None,
+               constraint_weights=None, algorithm: str = 'regular', fitness_weights=None,
+               population_size: int = 10, generations: int = 8, deadline_seconds: Optional[float] = None,
+               placement_engine: str = 'spaces', occupancy_resolution=None,
+               parallel_workers: Optional[int] = None,
+               fill_factor: float = DEFAULT_FILL_FACTOR) -> Tuple[List[EnhancedContainer], Dict[str, Any]]:
+    """
+    Pack a manifest into as few containers of the given types as it needs.
+
+    Args:
+        items: Manifest items; quantities are expanded into units as pack_items does
+        container_types: One container type name, or several to mix, from CONTAINER_TYPES
+        route_temperature: Route temperature for temperature-sensitive items
+        constraint_weights: Constraint weights of the regular packing algorithm
+        algorithm: 'regular' (layer packing) or 'genetic' for each container
+        fitness_weights: Fitness weights of the genetic algorithm
+        population_size: Genetic algorithm population size
+        generations: Genetic algorithm generations
+        deadline_seconds: Wall-clock budget of the genetic runs, shared by all spill-over rounds
+        placement_engine: Candidate positions used for packing, 'spaces' or 'extreme_points'
+        occupancy_resolution: Voxel edge (m) of the occupancy bitmap; None disables it
+        parallel_workers: Worker processes packing containers concurrently; None uses one per CPU
+        fill_factor: Share of a container's volume the partitioner assigns before opening the next
+
+    Returns:
+        (containers, plan): the packed containers in fleet order, and the
+        multi-container plan as a JSON-serializable dict
+    """
+    if algorithm not in FLEET_ALGORITHMS:
+        raise ValueError(f"Unknown fleet packing algorithm: {algorithm} (expected one of {', '.join(FLEET_ALGORITHMS)})")
+    if isinstance(container_types, str):
+        container_types = [container_types]
+    started = time.monotonic()
+    workers = max(1, parallel_workers or os.cpu_count() or 1)
+    settings = dict(algorithm=algorithm, route_temperature=route_temperature, constraint_weights=constraint_weights,
+                    fitness_weights=fitness_weights, population_size=population_size, generations=generations,
+                    deadline_seconds=None, placement_engine=placement_engine,
+                    occupancy_resolution=occupancy_resolution)
+
+    units = expand_quantities(items)
+    containers = []
+    unpacked = []
+    pending = units
+    rounds = 0
+    while pending:
+        pending = _top_up(containers, pending, settings)
+        if not pending:
+            break
+        partitions, rejected = partition_items(pending, container_types, fill_factor)
+        unpacked += rejected
+        if not partitions:
+            break
+        rounds += 1
+        if deadline_seconds is not None:
+            settings['deadline_seconds'] = max(0.0, deadline_seconds - (time.monotonic() - started))
+        logger.info(f"🚚 Fleet round {rounds}: {len(pending)} units over {len(partitions)} container(s)")
+        packed = pack_containers(partitions, settings, workers)
+        pending = []
+        for container in packed:
+            leftovers = _leftovers(container)
+            if container.items:
+                containers.append(container)
+                pending += [item for item, _ in leftovers]
+            else:
+                # Nothing fits in an empty container, so another container would not help either
+                unpacked += leftovers
+        if not any(container.items for container in packed):
+            break
+    wall_time = time.monotonic() - started
+    logger.info(f"🚚 Fleet packed {sum(len(container.items) for container in containers)} of {len(units)} units "
+                f"into {len(containers)} container(s) in {wall_time:.2f}s ({rounds} round(s), {workers} worker(s))")
+    return containers, fleet_plan(containers, unpacked, container_types, algorithm, len(units), wall_time, rounds,
+                                  workers)
+
+
+def _item_record(item: Item) -> Dict[str, Any]:
+    """JSON record of an item as saved in container plans"""
+    return {
+        'name': item.name,
+        'dimensions': [float(d) for d in item.dimensions],
+        'weight': float(item.weight),
+        'fragility': item.fragility,
+        'stackable': item.stackable,
+        'boxing_type': item.boxing_type,
+        'bundle': item.bundle,
+        'temperature_sensitivity': getattr(item, 'temperature_sensitivity', None),
+        'needs_insulation': getattr(item, 'needs_insulation', False)
+    }
+
+
+def fleet_plan(containers: List[EnhancedContainer], unpacked: List[Tuple[Item, str]], container_types: Sequence[str],
+               algorithm: str, total_items: int, wall_time: float, rounds: int, workers: int) -> Dict[str, Any]:
+    """
+    Multi-container plan of packed fleet containers.
+
+    Utilizations are percentages, like the single-container report.
+    """
+    container_volume = sum(_volume(container.dimensions) for container in containers)
+    packed_volume = sum(_volume(item.dimensions) for container in containers for item in container.items)
+    records = []
+    for index, container in enumerate(containers, 1):
+        payload = get_predefined_container_payload(container.container_type)
+        records.append({
+            'index': index,
+            'container_type': container.container_type,
+            'container_dimensions': [float(d) for d in container.dimensions],
+            'max_weight': float(payload) if payload else None,
+            'volume_utilization': float(container.volume_utilization * 100),
+            'weight_utilization': float(container.total_weight / payload * 100) if payload else None,
+            'items_packed': len(container.items),
+            'total_weight': float(container.total_weight),
+            'remaining_volume': float(container.remaining_volume),
+            'center_of_gravity': [float(x) for x in container.center_of_gravity],
+            'pack_seconds': round(container.pack_seconds, 3),
+            'packed_items': [dict(_item_record(item), position=[float(p) for p in item.position])
+                             for item in container.items]
+        })
+    return {
+        'timestamp': datetime.datetime.now().strftime("%Y%m%d_%H%M%S"),
+        'container_types': list(container_types),
+        'algorithm_used': 'Genetic Algorithm' if algorithm == 'genetic' else 'Regular Algorithm',
+        'container_count': len(containers),
+        'items_packed': sum(len(container.items) for container in containers),
+        'total_items': total_items,
+        'volume_utilization': float(packed_volume / container_volume * 100) if container_volume else 0.0,
+        'wall_time_seconds': round(wall_time, 3),
+        'packing_seconds': round(sum(container.pack_seconds for container in containers), 3),
+        'rounds': rounds,
+        'workers': workers,
+        'containers': records,
+        'unpacked_items': [dict(_item_record(item), reason=reason) for item, reason in unpacked]
+    }
@@ -3,13 +3,18 @@ Main entry point for genetic algorithm container packing optimization.
 Integrates temperature constraints and packer logic.
 """
 import os
+import time
 import logging
 from typing import List, Dict, Any
 
+import numpy as np
+
 from optigenix_module.models.container import EnhancedContainer
 from optigenix_module.models.item import Item
+from optigenix_module.models.placement import PlacedBox
 from optigenix_module.optimization.temperature import TemperatureConstraintHandler
-from optigenix_module.optimization.packer import GeneticPacker
+from optigenix_module.optimization.packer import GeneticPacker, PackingGenome
+from optigenix_module.optimization.warm_start import warm_start_seeds
 
 # Configure logging
 logging.basicConfig(
@@ -26,8 +31,38 @@ logger.info("=" * 70)
 
 def optimize_packing_with_genetic_algorithm(items, container_dims, 
                                          population_size=10, generations=8,
-                                        fitness_weights=None, route_temperature=None):
-    """Main function to optimize packing using genetic algorithm"""
+                                        fitness_weights=None, route_temperature=None,
+                                        parallel_workers=None, islands=None,
+                                        migration_interval=5, migration_topology='ring',
+                                        deadline_seconds=None, max_evaluations=None,
+                                        stagnation_limit=None, stop_at_volume_bound=False,
+                                        plans_folder=None, placement_engine='spaces',
+                                        occupancy_resolution=None, units='m'):
+    """
+    Main function to optimize packing using genetic algorithm
+
+    Args:
+        parallel_workers: Number of worker processes used to evaluate genome fitness.
+                          None (default) evaluates sequentially.
+        islands: Number of island sub-populations for island-model mode, each
+                 evolved in its own worker process. None (default) runs a single population.
+        migration_interval: Generations between migrations in island-model mode.
+        migration_topology: 'ring' or 'full' migration between islands.
+        deadline_seconds: Wall-clock budget counted from this call, including LLM calls.
+                          The best plan found when it runs out is returned.
+        max_evaluations: Maximum number of genome evaluations for the search.
+        stagnation_limit: Stop after this many generations without improvement.
+        stop_at_volume_bound: Stop as soon as a genome packs every item.
+        plans_folder: Folder of saved container plans. When given, the most similar
+                      saved plans seed part of the initial population (warm start).
+        placement_engine: Candidate positions used to evaluate genomes, 'spaces' or
+                          'extreme_points' (see GeneticPacker).
+        occupancy_resolution: Voxel edge (m) of the occupancy bitmap that pre-filters
+                              overlap checks while evaluating genomes; None disables it.
+        units: Coordinate units genomes are evaluated in, 'm' or 'mm' (exact integer
+               millimetres, see GeneticPacker). The returned container is in metres.
+    """
+    started = time.monotonic()
     # Set route temperature from environment variable
     from optigenix_module.utils.llm_connector import get_llm_client
       # First, handle item quantities and sort by volume/weight for smarter initialization
@@ -128,22 +163,41 @@ def optimize_packing_with_genetic_algorithm(items, container_dims,
     # Sort items with temperature-sensitive ones first
     expanded_items.sort(key=lambda x: (getattr(x, 'temperature_priority', 0)), reverse=True)
       # Initialize genetic packer with temperature constraints
-    genetic_packer = GeneticPacker(container_dims, population_size, generations, route_temperature)
+    genetic_packer = GeneticPacker(container_dims, population_size, generations, route_temperature,
+                                   parallel_workers=parallel_workers, islands=islands,
+                                   migration_interval=migration_interval,
+                                   migration_topology=migration_topology,
+                                   placement_engine=placement_engine,
+                                   occupancy_resolution=occupancy_resolution, units=units)
     if temp_handler:
         genetic_packer.temp_handler = temp_handler
     
     # Run optimization with fitness weights
+    if deadline_seconds is not None:
+        deadline_seconds = max(0.0, deadline_seconds - (time.monotonic() - started))  # Time left after preprocessing
+    budget = dict(deadline_seconds=deadline_seconds, max_evaluations=max_evaluations,
+                  stagnation_limit=stagnation_limit, stop_at_volume_bound=stop_at_volume_bound)
+    if plans_folder:
+        budget['seeds'] = warm_start_seeds(expanded_items, container_dims, plans_folder)
     if fitness_weights:
         logger.info(f"Using custom fitness weights from UI sliders: {fitness_weights}")
-        best_genome = genetic_packer.optimize(expanded_items, fitness_weights=fitness_weights)
+        best_genome = genetic_packer.optimize(expanded_items, fitness_weights=fitness_weights, **budget)
     else:
         logger.info("No fitness weights provided - will use LLM dynamic weights or defaults")
-        best_genome = genetic_packer.optimize(expanded_items)
+        best_genome = genetic_packer.optimize(expanded_items, **budget)
+    if best_genome is None:
+        # The budget ran out before any genome was packed: pack the items in manifest order, unrotated
+        logger.warning(f"⏱️  No genome evaluated ({genetic_packer.stop_reason}) - packing the items in manifest order")
+        best_genome = PackingGenome(expanded_items, rotation_flags=bytes(len(expanded_items)))
+        best_genome.generation_count = genetic_packer.generations_completed
+        best_genome.stop_reason = genetic_packer.stop_reason
     
     # Create final container with best solution
-    return final_packing(best_genome, container_dims, expanded_items, route_temperature, original_item_count)
+    return final_packing(best_genome, container_dims, expanded_items, route_temperature, original_item_count,
+                         placement_engine=placement_engine, occupancy_resolution=occupancy_resolution)
 
-def final_packing(best_genome, container_dims, expanded_items, route_temperature=None, original_item_count=None):
+def final_packing(best_genome, container_dims, expanded_items, route_temperature=None, original_item_count=None,
+                  placement_engine='spaces', occupancy_resolution=None):
     """
     Creates final container with best solution from genetic algorithm
     
@@ -153,6 +207,9 @@ def final_packing(best_genome, container_dims, expanded_items, route_temperature
         expanded_items: List of expanded items
         route_temperature: Temperature setting for the route
         original_item_count: Original count of items (including quantities)
+        placement_engine: Candidate positions the items are tried at, 'spaces' or
+                          'extreme_points'; the engine the genomes were evaluated with
+        occupancy_resolution: Voxel edge (m) of the container's occupancy bitmap, or None
         
     Returns:
         EnhancedContainer with packed items
@@ -166,147 +223,135 @@ def final_packing(best_genome, container_dims, expanded_items, route_temperature
         temp_handler = TemperatureConstraintHandler(route_temperature)
     
     # Create container for final packing
-    container = EnhancedContainer(container_dims)
+    container = EnhancedContainer(container_dims, placement_engine=placement_engine,
+                                  occupancy_resolution=occupancy_resolution)
     if route_temperature is not None:
         container.route_temperature = route_temperature
     
     # Sort spaces after each item placement for better utilization
     def sort_spaces_by_fitness(container):
         """Sort spaces by a fitness score that prefers spaces with better interlocking potential"""
-        container.spaces.sort(key=lambda space: (
-            # First prioritize bottom spaces for stability
-            space.z,
-            # Then prioritize spaces with multiple contact surfaces (corners, against walls)
-            -(sum(1 for val in [space.x, space.y, space.z] if val == 0) + 
-              sum(1 for dim, val in zip(range(3), [space.x+space.width, space.y+space.depth, space.z+space.height]) 
-                  if val == container.dimensions[dim])),
-            # Then prioritize spaces adjacent to existing items for interlocking
-            -len([item for item in container.items 
-                 if (abs(space.x - (item.position[0] + item.dimensions[0])) < 0.001 or
-                     abs(space.x + space.width - item.position[0]) < 0.001 or
-                     abs(space.y - (item.position[1] + item.dimensions[1])) < 0.001 or
-                     abs(space.y + space.depth - item.position[1]) < 0.001 or
-                     abs(space.z - (item.position[2] + item.dimensions[2])) < 0.001 or
-                     abs(space.z + space.height - item.position[2]) < 0.001)]),
-            # Then prefer spaces closer to origin for compact packing
-            space.x**2 + space.y**2 + space.z**2
-        ))
+        if container.placement_engine != 'spaces':
+            return  # Extreme points keep their own order
+        spaces = container.spaces
+        x, y, z = spaces.x, spaces.y, spaces.z
+        x1, y1, z1 = x + spaces.width, y + spaces.depth, z + spaces.height
+        # Spaces with multiple contact surfaces (corners, against walls)
+        length, width, height = container.dimensions
+        wall_contacts = ((x == 0).astype(int) + (y == 0) + (z == 0) +
+                         (x1 == length) + (y1 == width) + (z1 == height))
+        # Spaces adjacent to existing items for interlocking
+        adjacent = np.zeros(len(spaces), dtype=int)
+        if container.items:
+            starts = np.array([item.position for item in container.items], dtype=float)
+            ends = starts + np.array([item.dimensions for item in container.items], dtype=float)
+
+            def touching(side, faces):
+                return np.abs(side[:, None] - faces[None, :]) < 0.001
+
+            adjacent = (touching(x, ends[:, 0]) | touching(x1, starts[:, 0]) |
+                        touching(y, ends[:, 1]) | touching(y1, starts[:, 1]) |
+                        touching(z, ends[:, 2]) | touching(z1, starts[:, 2])).sum(axis=1)
+        # Bottom spaces first for stability, then contacts, then closeness to the origin
+        spaces.sort_by(z, -wall_contacts, -adjacent, x**2 + y**2 + z**2)
     
     # Track which items couldn't be packed for better reporting
     unpacked_items = []
     
     # First try to pack with the genome's suggested order and rotations
-    for item, rotation_flag in zip(best_genome.item_sequence, best_genome.rotation_flags):
-        # Apply rotation based on flag
-        item_copy = Item(
-            name=item.name,
-            length=item.original_dims[0] if hasattr(item, 'original_dims') else item.dimensions[0],
-            width=item.original_dims[1] if hasattr(item, 'original_dims') else item.dimensions[1],
-            height=item.original_dims[2] if hasattr(item, 'original_dims') else item.dimensions[2],
-            weight=item.weight,
-            quantity=1,  # Already expanded
-            fragility=item.fragility,
-            stackable=item.stackable,
-            boxing_type=getattr(item, 'boxing_type', 'STANDARD'),
-            bundle=item.bundle,
-            temperature_sensitivity=getattr(item, 'temperature_sensitivity', None),
-            load_bearing=getattr(item, 'load_bearing', 0)
-        )
-        
-        # Explicitly transfer needs_insulation flag
-        if hasattr(item, 'needs_insulation'):
-            item_copy.needs_insulation = item.needs_insulation
-        
-        # Apply rotation using genetic packer's rotation method
-        rotated_dims = GeneticPacker._get_rotation(None, item_copy.dimensions, rotation_flag)
-        item_copy.dimensions = rotated_dims
+    item_types = best_genome.item_types
+    for index, rotation_flag in zip(best_genome.order, best_genome.rotation_flags):
+        item = best_genome.items[index]
+        item_type = item_types.item_types[item_types.types[index]]
+        if item_type is None:
+            logger.error(f"Item in genome.item_sequence is not an Item object: {item}")
+            failed_packs += 1
+            continue
+
+        # Candidate placement of the item's type, rotated as the genome says; the
+        # full item is only copied once it is placed
+        box = PlacedBox(item_type, item.name, None,
+                        GeneticPacker._get_rotation(None, item_type.dimensions, rotation_flag))
         
         # Sort spaces before trying to place this item
         sort_spaces_by_fitness(container)
         
         # Print data about temperature-sensitive items for debugging - only at DEBUG level
-        if hasattr(item_copy, 'needs_insulation') and item_copy.needs_insulation:
-            logger.debug(f"Trying to place temperature-sensitive item: {item_copy.name}")
-            logger.debug(f"  Temperature sensitivity: {item_copy.temperature_sensitivity}")
-            logger.debug(f"  Needs insulation: {item_copy.needs_insulation}")
+        if box.needs_insulation:
+            logger.debug(f"Trying to place temperature-sensitive item: {box.name}")
+            logger.debug(f"  Temperature sensitivity: {box.temperature_sensitivity}")
+            logger.debug(f"  Needs insulation: {box.needs_insulation}")
         
         # Try to pack item
         placed = False
-        for space in container.spaces:
-            if space.can_fit_item(item_copy.dimensions):
-                pos = (space.x, space.y, space.z)
-                if container._is_valid_placement(item_copy, pos, item_copy.dimensions):
-                    # For temperature sensitive items, check temperature constraints with absolute prohibition
-                    if hasattr(item_copy, 'needs_insulation') and item_copy.needs_insulation and temp_handler:
-                        # Use temperature handler to check constraints
-                        if not temp_handler.check_temperature_constraints(item_copy, pos, container.dimensions):
-                            logger.info(f"  ❌ Rejected position for temperature-sensitive item {item_copy.name} at {pos}")
-                            logger.info(f"     Failed temperature constraint check")
-                            continue  # Try next space
-                    
-                    # Check weight bearing capacity
-                    if space.z > 0:  # Only check for items not on the floor
-                        items_below = [i for i in container.items if 
-                                     i.position[2] + i.dimensions[2] == space.z and
-                                     i.position[0] < pos[0] + item_copy.dimensions[0] and
-                                     i.position[0] + i.dimensions[0] > pos[0] and
-                                     i.position[1] < pos[1] + item_copy.dimensions[1] and
-                                     i.position[1] + i.dimensions[1] > pos[1]]
-                        
-                        if items_below:
-                            total_weight_above = sum(i.weight for i in items_below)
-                            if total_weight_above > getattr(item_copy, 'load_bearing', 0):
-                                logger.info(f"  ❌ Rejected position for item {item_copy.name} at {pos}")
-                                logger.info(f"     Failed weight bearing capacity check: {total_weight_above} > {getattr(item_copy, 'load_bearing', 0)}")
-                                continue  # Try next space
-                    
-                    item_copy.position = pos
-                    
-                    # Explicitly set color for temperature-sensitive items that need insulation
-                    if hasattr(item_copy, 'needs_insulation') and item_copy.needs_insulation:
-                        item_copy.color = 'rgb(0, 128, 255)'  # Dark blue for temperature sensitive items
-                    
-                    container.items.append(item_copy)
-                    container._update_spaces(pos, item_copy.dimensions, space)
-                    
-                    # Print success for temperature-sensitive items
-                    if hasattr(item_copy, 'needs_insulation') and item_copy.needs_insulation:
-                        logger.info(f"  ✅ Successfully placed temperature-sensitive item {item_copy.name} at {pos}")
-                        # Calculate center position
-                        center_x = container.dimensions[0] / 2
-                        center_y = container.dimensions[1] / 2
-                        item_center_x = pos[0] + item_copy.dimensions[0]/2
-                        item_center_y = pos[1] + item_copy.dimensions[1]/2
-                        is_central = (
-                            center_x - container.dimensions[0]/6 <= item_center_x <= center_x + container.dimensions[0]/6 and
-                            center_y - container.dimensions[1]/6 <= item_center_y <= center_y + container.dimensions[1]/6
-                        )
-                        if is_central:
-                            logger.info(f"     Placed in central area of container (good for temperature protection)")
-                        else:
-                            # Count surrounding items for insulation
-                            surrounding_items = 0
-                            insulating_items = 0
-                            for placed_item in container.items[:-1]:  # Exclude current item
-                                if container._has_surface_contact(pos, item_copy.dimensions, placed_item):
-                                    surrounding_items += 1
-                                    if not getattr(placed_item, 'needs_insulation', False):
-                                        insulating_items += 1
-                            logger.info(f"     Not in central area, but has {surrounding_items} surrounding items ({insulating_items} insulating)")
+        for pos, space in container.candidate_positions(box.dimensions):
+            if container._is_valid_placement(box, pos, box.dimensions):
+                # For temperature sensitive items, check temperature constraints with absolute prohibition
+                if box.needs_insulation and temp_handler:
+                    # Use temperature handler to check constraints
+                    if not temp_handler.check_temperature_constraints(box, pos, container.dimensions):
+                        logger.info(f"  ❌ Rejected position for temperature-sensitive item {box.name} at {pos}")
+                        logger.info(f"     Failed temperature constraint check")
+                        continue  # Try next space
+                
+                # Check weight bearing capacity
+                if pos[2] > 0:  # Only check for items not on the floor
+                    items_below = container.items_below(pos, box.dimensions[:2], tolerance=0)
                     
-                    # Sort spaces immediately after placing an item to use the newly created spaces
-                    sort_spaces_by_fitness(container)
-                    placed = True
-                    successful_packs += 1
-                    break
-        
+                    if items_below:
+                        total_weight_above = sum(i.weight for i in items_below)
+                        if total_weight_above > box.load_bearing:
+                            logger.info(f"  ❌ Rejected position for item {box.name} at {pos}")
+                            logger.info(f"     Failed weight bearing capacity check: {total_weight_above} > {box.load_bearing}")
+                            continue  # Try next space
+                
+                box.position = pos
+                placed_item = box.to_item(item)
+                
+                # Explicitly set color for temperature-sensitive items that need insulation
+                if box.needs_insulation:
+                    placed_item.color = 'rgb(0, 128, 255)'  # Dark blue for temperature sensitive items
+                
+                container.items.append(placed_item)
+                container._update_spaces(pos, box.dimensions, space)
+                
+                # Print success for temperature-sensitive items
+                if box.needs_insulation:
+                    logger.info(f"  ✅ Successfully placed temperature-sensitive item {box.name} at {pos}")
+                    # Calculate center position
+                    center_x = container.dimensions[0] / 2
+                    center_y = container.dimensions[1] / 2
+                    item_center_x = pos[0] + box.dimensions[0]/2
+                    item_center_y = pos[1] + box.dimensions[1]/2
+                    is_central = (
+                        center_x - container.dimensions[0]/6 <= item_center_x <= center_x + container.dimensions[0]/6 and
+                        center_y - container.dimensions[1]/6 <= item_center_y <= center_y + container.dimensions[1]/6
+                    )
+                    if is_central:
+                        logger.info(f"     Placed in central area of container (good for temperature protection)")
+                    else:
+                        # Count surrounding items for insulation
+                        surrounding = container.contact_neighbors(placed_item)
+                        surrounding_items = len(surrounding)
+                        insulating_items = sum(1 for other in surrounding if not getattr(other, 'needs_insulation', False))
+                        logger.info(f"     Not in central area, but has {surrounding_items} surrounding items ({insulating_items} insulating)")
+                
+                # Sort spaces immediately after placing an item to use the newly created spaces
+                sort_spaces_by_fitness(container)
+                placed = True
+                successful_packs += 1
+                break
+    
         if not placed:
             failed_packs += 1
-            unpacked_items.append(item_copy)
-            logger.info(f"  ❌ Failed to place item {item_copy.name}")
+            unpacked_items.append(box.to_item(item))
+            logger.info(f"  ❌ Failed to place item {box.name}")
     
     # Log packing statistics
     logger.info(f"Packing complete - {successful_packs} items packed successfully, {failed_packs} failed")
+    if container.live_space_counts:
+        logger.info(f"Free spaces: {container.free_space_count()} live after the last placement, "
+                    f"peak {max(container.live_space_counts)} over {len(container.live_space_counts)} placements")
     if unpacked_items:
         logger.info("Unpacked items:")
         for item in unpacked_items:
@@ -323,6 +368,17 @@ def final_packing(best_genome, container_dims, expanded_items, route_temperature
     if hasattr(best_genome, 'generation_count'):
         container.generation_count = best_genome.generation_count
         logger.info(f"Final container generation count: {container.generation_count}")
+
+    # Why the search ended early, if it did
+    if getattr(best_genome, 'stop_reason', None):
+        container.stop_reason = best_genome.stop_reason
+
+    # Per-island results when the island model was used
+    if getattr(best_genome, 'island_stats', None):
+        container.island_stats = best_genome.island_stats
+
+    # Share of the initial population seeded from saved plans (warm start)
+    container.seeded_fraction = getattr(best_genome, 'seeded_fraction', 0.0)
     
     # Call _update_metrics() to update volume utilization and other metrics
     container._update_metrics()
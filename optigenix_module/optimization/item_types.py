@@ -0,0 +1,144 @@
+"""
+Item-type classes for symmetry reduction.
+
+Expanding a manifest row with quantity N yields N items that evaluation cannot
+tell apart: same dimensions, weight and handling attributes, different names.
+Any two genomes that differ only by permuting such items pack identically.
+Grouping the item table into type classes lets genome operators and the
+fitness cache work on type sequences, so equivalent genomes collapse. The
+table also holds one immutable ItemType per class, which evaluation places
+instead of copying items.
+"""
+from typing import List, Tuple
+
+import numpy as np
+
+from optigenix_module.models.placement import ItemType
+
+
+def item_type_key(item, index: int) -> Tuple:
+    """
+    Everything fitness evaluation reads from an item, apart from its name.
+
+    Objects that are not fully formed items get a key of their own.
+    """
+    try:
+        return (
+            tuple(item.original_dims), tuple(item.dimensions), item.weight, item.quantity,
+            item.fragility, item.stackable, item.boxing_type, item.bundle, item.load_bearing,
+            item.temperature_sensitivity, getattr(item, 'needs_insulation', False)
+        )
+    except (AttributeError, TypeError):
+        return ('item', index)
+
+
+class ItemTypeTable:
+    """
+    Item-type classes of an item table
+
+    Attributes:
+        types: Type id of every item index (uint16)
+        members: Item indices grouped by type, ascending within each type
+        count: Number of distinct types
+        item_types: ItemType of every type id, None for objects that are not items
+    """
+
+    def __init__(self, items: List):
+        """
+        Args:
+            items: Item table shared by the genomes of a run
+        """
+        self.items = items
+        ids = {}
+        self.types = np.array([ids.setdefault(item_type_key(item, index), len(ids))
+                               for index, item in enumerate(items)], dtype=np.uint16)
+        self.count = len(ids)
+        self.members = np.lexsort((np.arange(len(items)), self.types)).astype(np.uint16)
+        first = {}
+        for index, type_id in enumerate(self.types.tolist()):
+            first.setdefault(type_id, index)
+        self.item_types = tuple(self._item_type(type_id, items[first[type_id]]) for type_id in range(self.count))
+        self._item_types_by_units = {'m': self.item_types}
+
+    @staticmethod
+    def _item_type(type_id: int, item):
+        try:
+            return ItemType(type_id, item)
+        except (AttributeError, TypeError):
+            return None
+
+    def item_types_in(self, units: str) -> Tuple:
+        """item_types with dimensions in the given coordinate units, built once per units"""
+        item_types = self._item_types_by_units.get(units)
+        if item_types is None:
+            item_types = self._item_types_by_units[units] = tuple(
+                item_type.in_units(units) if item_type is not None else None for item_type in self.item_types)
+        return item_types
+
+    def sequence_types(self, order) -> np.ndarray:
+        """Type id at every position of an item index sequence"""
+        return self.types[np.frombuffer(order, dtype=np.uint16) if not isinstance(order, np.ndarray) else order]
+
+    def assign_items(self, type_sequence: np.ndarray) -> np.ndarray:
+        """
+        Item index sequence for a type sequence.
+
+        The items of each type are placed in ascending index order along the
+        sequence, so all genomes with the same type sequence get the same order.
+
+        Args:
+            type_sequence: Type id per position; must hold every type as often as the table does
+
+        Returns:
+            Item index permutation (uint16)
+        """
+        order = np.empty(len(type_sequence), dtype=np.uint16)
+        order[np.argsort(type_sequence, kind='stable')] = self.members
+        return order
+
+    def occurrence_ranks(self, type_sequence: np.ndarray) -> np.ndarray:
+        """For every position, how many earlier positions hold the same type"""
+        by_type = np.argsort(type_sequence, kind='stable')
+        sorted_types = type_sequence[by_type]
+        ranks = np.empty(len(type_sequence), dtype=np.intp)
+        ranks[by_type] = np.arange(len(type_sequence)) - np.searchsorted(sorted_types, sorted_types, side='left')
+        return ranks
+
+
+def packing_positions(order, pack_rank: np.ndarray) -> np.ndarray:
+    """
+    Genome positions in the order evaluation packs them.
+
+    Evaluation packs items sorted by a fixed per-item key (stable, so genome
+    order breaks ties) and each rotation flag stays with its genome position.
+
+    Args:
+        order: Genome item index permutation (uint16 buffer)
+        pack_rank: Rank of each item index in the packing sort (lower packs first)
+
+    Returns:
+        Array of genome positions
+    """
+    return np.argsort(pack_rank[np.frombuffer(order, dtype=np.uint16)], kind='stable')
+
+
+def placement_tokens(order, rotation_flags, positions: np.ndarray, item_types: np.ndarray) -> np.ndarray:
+    """
+    Placement tokens of a genome, in the order its items are packed.
+
+    A token encodes one (item type, rotation flag) pair as type * 6 + flag.
+    Interchangeable items share a type, so genomes that only differ by
+    permuting them produce the same tokens (and the same packing).
+
+    Args:
+        order: Genome item index permutation (uint16 buffer)
+        rotation_flags: Rotation flag per genome position (uint8 buffer)
+        positions: Genome positions in packing order (see packing_positions)
+        item_types: Type id of each item index
+
+    Returns:
+        Array of placement tokens
+    """
+    order = np.frombuffer(order, dtype=np.uint16)
+    flags = np.frombuffer(rotation_flags, dtype=np.uint8)
+    return item_types[order[positions]].astype(np.int32) * 6 + flags[positions]
@@ -1,21 +1,35 @@
 """
 Genetic algorithm implementation for container packing optimization.
 """
+import os
 import random
 import time
 import json
+import atexit
+import pickle
 import logging
+import hashlib
+import tempfile
+import threading
 import multiprocessing
+from collections import OrderedDict
 from copy import deepcopy
 from typing import List, Dict, Tuple, Any, Optional
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 from array import array
 import numpy as np
 
 from optigenix_module.models.container import EnhancedContainer
-from optigenix_module.models.item import Item
+from optigenix_module.models.container_core import check_placement_engine
+from optigenix_module.models.occupancy_grid import check_occupancy_resolution
+from optigenix_module.models.units import check_units, meters_per_unit
+from optigenix_module.models.placement import PlacedBox
 from optigenix_module.utils.llm_connector import get_llm_client
+from optigenix_module.utils.llm_cache import make_cache_key, value_bucket, log_bucket, count_bucket
 from optigenix_module.optimization.temperature import TemperatureConstraintHandler
+from optigenix_module.optimization.advisor import LLMAdvisor
+from optigenix_module.optimization.item_types import ItemTypeTable, packing_positions, placement_tokens
 from optigenix_module.optimization.max_utilization_fitness import apply_max_volume_fitness, detect_demo_dataset
 
 # Configure logging
@@ -35,23 +49,200 @@ if multiprocessing.current_process().name == 'MainProcess':
 # Initialize LLM client
 llm_client = get_llm_client()
 
+# Shared process pool for parallel fitness evaluation (one per process, created lazily)
+_EVALUATION_POOL = None
+_EVALUATION_POOL_PID = None
+_EVALUATION_POOL_WORKERS = None
+
+# Per-worker cache of the current run context (item table and container settings)
+_WORKER_RUN_CONTEXT = {'path': None, 'packer': None}
+
+def get_evaluation_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Get the shared fitness evaluation pool, creating it on first use.
+
+    The pool is created once per process and reused by every optimization run
+    asking for the same number of workers; a request for a different size
+    replaces it. A pool inherited from a parent process (e.g. a gunicorn master
+    that imported this module before forking) is never reused.
+    """
+    global _EVALUATION_POOL, _EVALUATION_POOL_PID, _EVALUATION_POOL_WORKERS
+
+    if _EVALUATION_POOL is not None and _EVALUATION_POOL_PID == os.getpid() and _EVALUATION_POOL_WORKERS != max_workers:
+        logger.info(f"Resizing fitness evaluation pool from {_EVALUATION_POOL_WORKERS} to {max_workers} workers")
+        shutdown_evaluation_pool()
+    if _EVALUATION_POOL is None or _EVALUATION_POOL_PID != os.getpid():
+        _EVALUATION_POOL = ProcessPoolExecutor(max_workers=max_workers)
+        _EVALUATION_POOL_PID = os.getpid()
+        _EVALUATION_POOL_WORKERS = max_workers
+        logger.info(f"Created fitness evaluation pool with {max_workers} worker processes")
+    return _EVALUATION_POOL
+
+def shutdown_evaluation_pool():
+    """Shut down the shared fitness evaluation pool if this process owns one"""
+    global _EVALUATION_POOL, _EVALUATION_POOL_PID, _EVALUATION_POOL_WORKERS
+
+    if _EVALUATION_POOL is not None and _EVALUATION_POOL_PID == os.getpid():
+        _EVALUATION_POOL.shutdown(wait=False, cancel_futures=True)
+    _EVALUATION_POOL = None
+    _EVALUATION_POOL_PID = None
+    _EVALUATION_POOL_WORKERS = None
+
+atexit.register(shutdown_evaluation_pool)
+
+def _numpy_rng() -> np.random.Generator:
+    """
+    Numpy generator for vectorized genome operators, seeded from the `random`
+    module so that random.seed() keeps whole runs reproducible.
+    """
+    return np.random.default_rng(random.getrandbits(64))
+
+def _call_with_timeout(func, timeout: float, *args, **kwargs):
+    """
+    Call func, giving up after timeout seconds.
+
+    The call runs in a daemon thread, so a slow LLM request can neither hold up
+    the caller past its deadline nor keep the process alive at exit.
+
+    Returns:
+        Tuple of (finished, result); result is None when the call did not finish
+        in time or raised.
+    """
+    outcome = {}
+
+    def target():
+        try:
+            outcome['result'] = func(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"❌ {getattr(func, '__name__', 'call')} failed: {e}")
+
+    worker = threading.Thread(target=target, name='llm-call', daemon=True)
+    worker.start()
+    worker.join(timeout)
+    if worker.is_alive():
+        return False, None
+    return True, outcome.get('result')
+
+def _load_worker_packer(context_path: str) -> 'GeneticPacker':
+    """
+    Get the worker-side packer for a run, loading the run context on first use.
+
+    Args:
+        context_path: Path of the run context written by GeneticPacker._start_run_context
+
+    Returns:
+        GeneticPacker configured with the run's item table and settings
+    """
+    if _WORKER_RUN_CONTEXT['path'] != context_path:
+        with open(context_path, 'rb') as f:
+            context = pickle.load(f)
+        packer = GeneticPacker(context['container_dims'], population_size=context['population_size'],
+                               route_temperature=context['route_temperature'],
+                               placement_engine=context['placement_engine'],
+                               occupancy_resolution=context['occupancy_resolution'],
+                               units=context['units'])
+        packer.items_to_pack = context['items']
+        packer.fitness_weights = context['fitness_weights']
+        _WORKER_RUN_CONTEXT['path'] = context_path
+        _WORKER_RUN_CONTEXT['packer'] = packer
+    return _WORKER_RUN_CONTEXT['packer']
+
+def _evaluate_genome_batch(context_path: str, batch: List[Tuple[int, bytes, bytes]]):
+    """
+    Worker entry point: measure a batch of genomes.
+
+    Args:
+        context_path: Path of the run context written by GeneticPacker._start_run_context
+        batch: List of (population_index, item index bytes, rotation flag bytes)
+
+    Returns:
+        List of (population_index, metrics or None, error message or None)
+    """
+    packer = _load_worker_packer(context_path)
+    items = packer.items_to_pack
+    packer._prepare_item_table(items)
+    results = []
+    for i, sequence_bytes, rotation_bytes in batch:
+        try:
+            order = np.frombuffer(sequence_bytes, dtype=np.uint16)
+            genome = PackingGenome(items, order=order, rotation_flags=rotation_bytes, item_types=packer._item_types)
+            results.append((i, packer._measure_genome(genome), None))
+        except Exception as e:
+            results.append((i, None, str(e)))
+    return results
+
+def _run_island_epoch(context_path: str, island: Dict[str, Any], generations: int, seed: int) -> Dict[str, Any]:
+    """
+    Worker entry point: evolve one island of an island-model run.
+
+    Args:
+        context_path: Path of the run context written by GeneticPacker._start_run_context
+        island: Island state (see GeneticPacker._run_islands)
+        generations: Number of generations to run before the next migration
+        seed: Seed for this island's random number generators
+
+    Returns:
+        Updated island state
+    """
+    packer = _load_worker_packer(context_path)
+    budget = island['budget']
+    packer._deadline = time.monotonic() + budget['deadline_seconds'] if budget['deadline_seconds'] is not None else None
+    packer.max_evaluations = budget['max_evaluations']
+    packer.evaluations = 0
+    random.seed(seed)
+    return packer._evolve_island(island, generations)
+
 class PackingGenome:
     """
     Genome class for genetic algorithm-based packing optimization
     
     Represents a potential solution to the packing problem with a specific
-    item sequence and rotation configuration.
+    item sequence and rotation configuration. The sequence is stored as a
+    compact permutation of indices into the shared item table rather than a
+    list of Item objects, so copying, hashing and crossover stay cheap on
+    manifests with thousands of items.
     """
     
-    def __init__(self, items, mutation_rate=0.1):
-        """Initialize genome with items and mutation rate"""
+    SWAP_ATTEMPTS = 4  # Draws per swap mutation before giving up on finding distinct item types
+
+    def __init__(self, items, mutation_rate=0.1, order=None, rotation_flags=None, item_types=None):
+        """
+        Initialize genome with items and mutation rate
+
+        Args:
+            items: Item table shared by every genome of a run (not copied)
+            mutation_rate: Base mutation rate
+            order: Optional permutation of item indices (defaults to table order)
+            rotation_flags: Optional rotation flag per sequence position (defaults to random)
+            item_types: ItemTypeTable of items, shared by the genomes of a run
+                        (built on first use when not given)
+        """
         self.items = items  # Store the original items list
-        self.item_sequence = items.copy()
-        # Use array for rotation flags instead of list for better memory usage
-        self.rotation_flags = array('B', [random.randint(0, 5) for _ in items])
+        self._item_types = item_types
+        # Item indices in packing order, and one rotation flag (0-5) per sequence position
+        self.order = array('H')
+        if order is None:
+            self.order.extend(range(len(items)))
+        else:
+            self.order.frombytes(np.asarray(order, dtype=np.uint16).tobytes())
+        if rotation_flags is None:
+            rotation_flags = _numpy_rng().integers(0, 6, len(items), dtype=np.uint8).tobytes()
+        self.rotation_flags = array('B', rotation_flags)
         self.mutation_rate = mutation_rate
         self.fitness = 0.0
 
+    @property
+    def item_types(self) -> ItemTypeTable:
+        """Item-type classes of the item table"""
+        if self._item_types is None:
+            self._item_types = ItemTypeTable(self.items)
+        return self._item_types
+
+    @property
+    def item_sequence(self):
+        """Items in packing order"""
+        return [self.items[i] for i in self.order]
+
     def mutate(self, operation_focus=None, rate_modifier=0):
         """
         Apply mutation operators to modify the genome
@@ -90,78 +281,89 @@ class PackingGenome:
             swap_prob = 1.0
             subsequence_prob = 1.0
             aggressive_prob = 0.0
-        
+
+        rng = _numpy_rng()
+        size = len(self.order)
+
         # Rotation mutation
-        for i in range(len(self.item_sequence)):
-            if random.random() < effective_rate * rotation_prob:
-                self.rotation_flags[i] = random.randint(0, 5)
+        self._mutate_rotations(rng, effective_rate * rotation_prob)
 
         # Sequence mutation - swap items
-        if random.random() < effective_rate * swap_prob * 2:
-            if len(self.item_sequence) >= 2:
-                idx1, idx2 = random.sample(range(len(self.item_sequence)), 2)
-                self.item_sequence[idx1], self.item_sequence[idx2] = \
-                    self.item_sequence[idx2], self.item_sequence[idx1]
+        if rng.random() < effective_rate * swap_prob * 2 and size >= 2:
+            self._mutate_swaps(rng, 1)
             
         # Sequence mutation - shift subsequence
-        if random.random() < effective_rate * subsequence_prob:
-            if len(self.item_sequence) > 3:
-                seq_length = random.randint(2, max(2, len(self.item_sequence) // 2))
-                start_idx = random.randint(0, len(self.item_sequence) - seq_length - 1)
-                target_idx = random.randint(0, len(self.item_sequence) - seq_length)
-                
-                # Extract subsequence
-                subsequence = self.item_sequence[start_idx:start_idx+seq_length]
-                rotation_subseq = list(self.rotation_flags[start_idx:start_idx+seq_length])
-                
-                # Remove subsequence
-                self.item_sequence = self.item_sequence[:start_idx] + \
-                                    self.item_sequence[start_idx+seq_length:]
-                
-                # Create new rotation flags array
-                new_rotation_flags = (list(self.rotation_flags[:start_idx]) + 
-                                    list(self.rotation_flags[start_idx+seq_length:]))
-                
-                # Insert at target location
-                self.item_sequence = self.item_sequence[:target_idx] + \
-                                    subsequence + \
-                                    self.item_sequence[target_idx:]
-                
-                # Insert rotation subsequence and rebuild array
-                final_rotations = (new_rotation_flags[:target_idx] + 
-                                 rotation_subseq + 
-                                 new_rotation_flags[target_idx:])
-                self.rotation_flags = array('B', final_rotations)
+        if rng.random() < effective_rate * subsequence_prob and size > 3:
+            self._mutate_subsequence(rng)
         
         # Aggressive mutations - only applied when specified
-        if aggressive_prob > 0 and random.random() < effective_rate * aggressive_prob:
+        if aggressive_prob > 0 and rng.random() < effective_rate * aggressive_prob:
             # Multiple aggressive mutations to escape local optima
             
             # 1. Large sequence reversal - reverse a significant chunk of the sequence
-            if len(self.item_sequence) > 10:
-                chunk_size = random.randint(len(self.item_sequence)//4, len(self.item_sequence)//2)
-                start = random.randint(0, len(self.item_sequence) - chunk_size)
-                
-                # Reverse the subsequence
-                self.item_sequence[start:start+chunk_size] = reversed(self.item_sequence[start:start+chunk_size])
+            if size > 10:
+                chunk_size = int(rng.integers(size // 4, size // 2 + 1))
+                start = int(rng.integers(0, size - chunk_size + 1))
+                order = np.frombuffer(self.order, dtype=np.uint16)
+                order[start:start+chunk_size] = order[start:start+chunk_size][::-1].copy()
                 
                 # Also randomize rotations in that subsequence
-                for i in range(start, start + chunk_size):
-                    self.rotation_flags[i] = random.randint(0, 5)
+                rotations = np.frombuffer(self.rotation_flags, dtype=np.uint8)
+                rotations[start:start+chunk_size] = rng.integers(0, 6, chunk_size, dtype=np.uint8)
             
             # 2. Complete rotation randomization with high probability
-            if random.random() < 0.7:  # 70% chance
-                for i in range(len(self.rotation_flags)):
-                    if random.random() < 0.5:  # Randomize about half of all rotations
-                        self.rotation_flags[i] = random.randint(0, 5)
+            if rng.random() < 0.7:  # 70% chance
+                self._mutate_rotations(rng, 0.5)  # Randomize about half of all rotations
             
             # 3. Multiple swaps - perform several random swaps to significantly change the sequence
-            swap_count = random.randint(3, max(3, len(self.item_sequence) // 5))
-            for _ in range(swap_count):
-                if len(self.item_sequence) >= 2:
-                    idx1, idx2 = random.sample(range(len(self.item_sequence)), 2)
-                    self.item_sequence[idx1], self.item_sequence[idx2] = \
-                        self.item_sequence[idx2], self.item_sequence[idx1]
+            if size >= 2:
+                self._mutate_swaps(rng, int(rng.integers(3, max(3, size // 5) + 1)))
+
+    def _mutate_rotations(self, rng, probability):
+        """Re-draw the rotation flag of each position with the given probability"""
+        rotations = np.frombuffer(self.rotation_flags, dtype=np.uint8)
+        mask = rng.random(len(rotations)) < probability
+        count = int(mask.sum())
+        if count:
+            rotations[mask] = rng.integers(0, 6, count, dtype=np.uint8)
+
+    def _mutate_swaps(self, rng, swap_count):
+        """
+        Swap swap_count pairs of sequence positions (rotation flags stay in place).
+
+        Swapping two interchangeable items cannot change the packing, so such
+        pairs are rejected and redrawn, up to SWAP_ATTEMPTS times.
+        """
+        order = np.frombuffer(self.order, dtype=np.uint16)
+        types = self.item_types.types
+        swap_count = min(swap_count, len(order) // 2)
+        for _ in range(self.SWAP_ATTEMPTS):
+            if swap_count <= 0:
+                break
+            positions = rng.choice(len(order), size=2 * swap_count, replace=False)
+            first, second = positions[:swap_count], positions[swap_count:]
+            distinct = types[order[first]] != types[order[second]]
+            first, second = first[distinct], second[distinct]
+            order[first], order[second] = order[second], order[first].copy()
+            swap_count -= len(first)
+
+    def _mutate_subsequence(self, rng):
+        """Move a random block of the sequence, with its rotation flags, to a new position"""
+        size = len(self.order)
+        seq_length = int(rng.integers(2, max(2, size // 2) + 1))
+        start_idx = int(rng.integers(0, size - seq_length))
+        target_idx = int(rng.integers(0, size - seq_length + 1))
+
+        # Position permutation: remove the block, then insert it at the target index
+        positions = np.arange(size)
+        block = positions[start_idx:start_idx+seq_length]
+        rest = np.concatenate((positions[:start_idx], positions[start_idx+seq_length:]))
+        moved = np.concatenate((rest[:target_idx], block, rest[target_idx:]))
+
+        order = np.frombuffer(self.order, dtype=np.uint16)
+        rotations = np.frombuffer(self.rotation_flags, dtype=np.uint8)
+        order[:] = order[moved]
+        rotations[:] = rotations[moved]
 
 class GeneticPacker:
     """
@@ -170,8 +372,34 @@ class GeneticPacker:
     Uses evolutionary algorithms to find efficient item arrangements.
     """
     
-    def __init__(self, container_dims, population_size=10, generations=8, route_temperature=None):
-        """Initialize genetic packer with container dimensions and algorithm parameters"""
+    def __init__(self, container_dims, population_size=10, generations=8, route_temperature=None,
+                 parallel_workers=None, fitness_cache_size=1024, islands=1, migration_interval=5,
+                 migration_topology='ring', migration_size=None, placement_engine='spaces',
+                 occupancy_resolution=None, units='m'):
+        """
+        Initialize genetic packer with container dimensions and algorithm parameters
+
+        Args:
+            parallel_workers: Number of worker processes for fitness evaluation.
+                              None or 1 evaluates sequentially in this process.
+            fitness_cache_size: Maximum number of genome evaluations kept in the
+                                LRU fitness cache (0 disables caching).
+            islands: Number of island sub-populations, each of population_size
+                     genomes and evolved in its own worker process (1 disables
+                     the island model).
+            migration_interval: Generations between migrations in island mode.
+            migration_topology: 'ring' (each island sends migrants to the next) or
+                                'full' (each island receives the best migrants of all others).
+            migration_size: Genomes sent by each island per migration (defaults to the elite count).
+            placement_engine: Candidate positions used when packing a genome: 'spaces'
+                              (maximal free spaces) or 'extreme_points', which offers far
+                              fewer candidates on large manifests.
+            occupancy_resolution: Voxel edge (m) of the occupancy bitmap containers use to
+                                  pre-filter overlap checks (None disables it).
+            units: Coordinate units genomes are packed in during evaluation: 'm', or 'mm'
+                   for exact integer-millimetre geometry (see models.units). Metrics and
+                   the final plan are in metres either way.
+        """
         self.container_dims = container_dims
         self.population_size = population_size
         self.generations = generations
@@ -183,12 +411,87 @@ class GeneticPacker:
         }
         self.elite_percentage = 0.15  # Preserve top 15% of solutions
         self.route_temperature = route_temperature
+        self.placement_engine = check_placement_engine(placement_engine)
+        self.occupancy_resolution = check_occupancy_resolution(occupancy_resolution)
+        self.units = check_units(units)
         self.items_to_pack = None  # Will be set in optimize method
+
+        # LRU cache of genome signature -> (fitness, metrics)
+        self.fitness_cache_size = fitness_cache_size
+        self._fitness_cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
         self.fitness_weights = None  # Will be set in optimize method
+        self.parallel_workers = parallel_workers
+        self._run_context_path = None  # Worker context file for the current run
+
+        # Packing order of the current item table (see _prepare_item_table)
+        self._ranked_items = None  # Item table the packing ranks were computed for
+        self._pack_rank = np.empty(0, dtype=np.int32)
+        self._item_types = None  # ItemTypeTable of the ranked item table
+
+        # Island model settings
+        if migration_topology not in ('ring', 'full'):
+            raise ValueError(f"Unknown migration topology: {migration_topology}")
+        self.islands = max(1, int(islands or 1))
+        self.migration_interval = max(1, int(migration_interval))
+        self.migration_topology = migration_topology
+        self.migration_size = migration_size
+        self.island_stats = []
+
+        # Run budget and early stopping, set per run by optimize
+        self._deadline = None
+        self.max_evaluations = None
+        self.stagnation_limit = None
+        self.stop_at_volume_bound = False
+        self._volume_bound = 1.0
+        self.evaluations = 0
+        self.generations_completed = 0
+        self.stop_reason = None
+
+        # Background LLM advice for the generation loop
+        self._advisor = None
+        self.stale_advice_generations = 0
+
+        # Warm-start seeds (see warm_start.py), set per run by optimize
+        self._seeds = []
+        self.seeded_genomes = 0
+        self.initial_genomes = 0
         
         # Initialize temperature constraint handler
         self.temp_handler = TemperatureConstraintHandler(route_temperature)
 
+    @property
+    def seeded_fraction(self) -> float:
+        """Fraction of the initial population seeded from saved plans in the last run"""
+        return self.seeded_genomes / self.initial_genomes if self.initial_genomes else 0.0
+
+    @property
+    def fitness_weights(self):
+        """Fitness weights used to score genome metrics"""
+        return self._fitness_weights
+
+    @fitness_weights.setter
+    def fitness_weights(self, weights):
+        """Set fitness weights, invalidating cached fitness values when they change"""
+        if weights != getattr(self, '_fitness_weights', None) and self._fitness_cache:
+            logger.info(f"Fitness weights changed - clearing {len(self._fitness_cache)} cached evaluations")
+            self._fitness_cache.clear()
+        self._fitness_weights = weights
+
+    def _genome_signature(self, genome) -> bytes:
+        """
+        Canonical cache key for a genome: a hash of its placement tokens, the
+        (item type, rotation) sequence evaluation packs. Genomes that only differ
+        by permuting interchangeable items, or by order among items the packing
+        sort never ties, share a signature.
+        """
+        self._prepare_item_table(genome.items)
+        positions = packing_positions(genome.order, self._pack_rank)
+        tokens = placement_tokens(genome.order, genome.rotation_flags, positions, self._item_types.types)
+        return hashlib.blake2b(tokens.tobytes(), digest_size=16).digest()
+
     def _calculate_initial_metrics(self) -> Dict[str, Any]:
         """
         Calculate initial metrics for the LLM to determine initial fitness weights.
@@ -247,7 +550,7 @@ class GeneticPacker:
         """
         global llm_client, logger # Access module-level instances
 
-        if not llm_client or not hasattr(llm_client, 'get_llm_completion'):
+        if not llm_client or not getattr(llm_client, 'enabled', False):
             logger.info("LLM client not available for initial dynamic fitness weights.")
             return None
 
@@ -274,8 +577,17 @@ class GeneticPacker:
         Ensure the numeric weights sum up to 1.0.
         """
         
+        # Similar problems share cached weights: key on bucketed metrics, not exact values
+        cache_key = make_cache_key(
+            "initial_weights",
+            items=count_bucket(initial_metrics.get('item_count', 0)),
+            utilization=value_bucket(initial_metrics.get('initial_volume_utilization_estimate', 0.0)),
+            container="x".join(f"{d:g}" for d in initial_metrics.get('container_dimensions', [0, 0, 0])),
+            temperature=self.route_temperature is not None
+        )
+
         try:
-            response_text = llm_client.get_llm_completion(prompt)
+            response_text = llm_client.generate(prompt, cache_key=cache_key)
             logger.info(f"LLM response for initial dynamic weights: {response_text}")
             
             if not response_text:
@@ -335,168 +647,201 @@ class GeneticPacker:
     def _evaluate_fitness(self, genome):
         """
         Evaluate fitness of a genome considering fitness weights.
-        
+
         Args:
             genome: PackingGenome to evaluate
-            
+
         Returns:
             float: Fitness score of the genome
         """
-        fitness = 0.0  # Initialize fitness to 0.0 at the beginning
+        metrics = self._measure_genome(genome)
 
-        container = EnhancedContainer(self.container_dims)
+        # Store metrics in genome for detailed logging
+        genome.metrics = metrics
+
+        fitness = self._score_metrics(metrics)
+        genome.fitness = fitness # Assign calculated fitness to the genome object
+        logger.debug(f"Total fitness: {fitness:.4f}, Metrics: {metrics}")
+        return fitness
+
+    def _score_metrics(self, metrics: Dict[str, float]) -> float:
+        """
+        Combine packing metrics into a single fitness value using the current fitness weights.
+
+        Args:
+            metrics: Metrics dictionary produced by _measure_genome
+
+        Returns:
+            float: Weighted fitness score
+        """
+        current_weights = self.fitness_weights
+        if not current_weights or not isinstance(current_weights, dict) or not any(w > 0 for w in current_weights.values()):
+            logger.warning("_evaluate_fitness: self.fitness_weights not set, invalid, or all zero. Falling back to default.")
+            current_weights = self._get_default_fitness_weights()
+
+        fitness = 0.0
+        for weight_name, weight_value in current_weights.items():
+            metric_key = weight_name.replace('_weight', '')
+            metric_value = metrics.get(metric_key, 0.0)
+            fitness += metric_value * weight_value
+            logger.debug(f"Fitness component: {metric_key}={metric_value:.4f} * {weight_value:.4f} = {metric_value * weight_value:.4f}")
+        return fitness
+
+    def _prepare_item_table(self, items):
+        """
+        Build the item-type table of an item table and precompute the packing
+        order rank of every item in it.
+
+        Evaluation packs items sorted by volume, weight and stackability of their
+        item types; the sort is stable, so genome order only breaks ties. Items
+        are grouped into interchangeable types (see item_types.py), and
+        evaluation places the type records instead of copying items. optimize()
+        builds the table once per run and hands it to every genome it creates.
+
+        Args:
+            items: Item table shared by the genomes being evaluated
+        """
+        if items is self._ranked_items:
+            return
+
+        self._item_types = ItemTypeTable(items)
+
+        def pack_key(item_type):
+            if item_type is None:
+                return None
+            dims = item_type.dimensions
+            return (-(dims[0] * dims[1] * dims[2]) if len(dims) == 3 else 0, -item_type.weight, not item_type.stackable)
+
+        keys = [pack_key(self._item_types.item_types[type_id]) for type_id in self._item_types.types.tolist()]
+        # Sorting is largest key first; items that are not Item objects go last and are skipped
+        ranks = {key: rank for rank, key in enumerate(sorted(set(k for k in keys if k is not None), reverse=True))}
+        self._pack_rank = np.array([ranks[key] if key is not None else len(ranks) for key in keys], dtype=np.int32)
+        self._ranked_items = items
+
+    def _measure_genome(self, genome) -> Dict[str, float]:
+        """
+        Pack a genome into a fresh container and measure the resulting layout.
+
+        This is the expensive part of fitness evaluation. It does not depend on
+        the fitness weights, so it can run in worker processes.
+
+        Args:
+            genome: PackingGenome to pack
+
+        Returns:
+            dict: Packing metrics (volume_utilization, contact_ratio, ...)
+        """
+        container = EnhancedContainer(self.container_dims, placement_engine=self.placement_engine,
+                                      occupancy_resolution=self.occupancy_resolution, units=self.units)
+        # Areas and wall distances are scored in metres whatever the coordinate units
+        meters = meters_per_unit(self.units)
+        square_meters = meters * meters
         
         # Set route temperature if available
         if self.route_temperature is not None:
             container.route_temperature = self.route_temperature
         
-        # Sort spaces by their distance from container origin for better packing
-        def sort_spaces_local(current_container_instance): # Renamed to avoid conflict
-            current_container_instance.spaces.sort(key=lambda space: (
-                space.z,  # Prioritize lower heights first
-                space.x**2 + space.y**2,  # Prefer spaces closer to origin
-                -(space.width * space.height * space.depth)  # Prefer larger spaces
-            ))
-        
-        # Make a local copy of items to avoid modifying the originals
-        # Ensure items in genome.item_sequence are full Item objects
-        items_to_pack_for_eval = []
-        for item_in_seq, rotation_flag_val in zip(genome.item_sequence, genome.rotation_flags):
-            if isinstance(item_in_seq, Item): # Make sure it's an Item object
-                 # Create a copy of the item for modification during evaluation
-                item_copy = Item(
-                    name=item_in_seq.name,
-                    length=item_in_seq.original_dims[0], # Use original_dims for copying
-                    width=item_in_seq.original_dims[1],
-                    height=item_in_seq.original_dims[2],
-                    weight=item_in_seq.weight / item_in_seq.quantity if item_in_seq.bundle == 'YES' and item_in_seq.quantity > 1 else item_in_seq.weight, # Adjust weight if bundled
-                    quantity=item_in_seq.quantity, # This will be handled by bundle logic in Item constructor if needed
-                    fragility=item_in_seq.fragility,
-                    stackable=item_in_seq.stackable,
-                    boxing_type=item_in_seq.boxing_type,
-                    bundle=item_in_seq.bundle, # Let Item constructor handle bundling if quantity > 1
-                    load_bearing=item_in_seq.load_bearing,
-                    temperature_sensitivity=item_in_seq.temperature_sensitivity
-                )
-                item_copy.needs_insulation = item_in_seq.needs_insulation # Preserve this flag
-                items_to_pack_for_eval.append((item_copy, rotation_flag_val))
-            else:
-                logger.error(f"Item in genome.item_sequence is not an Item object: {item_in_seq}")
-                continue # Skip non-Item objects
-
-        # Pre-sort items by volume and weight for better initial packing
-        # Ensure dimensions are available for sorting
-        items_to_pack_for_eval.sort(key=lambda x: (
-            -(x[0].dimensions[0] * x[0].dimensions[1] * x[0].dimensions[2]) if hasattr(x[0], 'dimensions') and len(x[0].dimensions) == 3 else 0,
-            -x[0].weight if hasattr(x[0], 'weight') else 0,
-            not x[0].stackable if hasattr(x[0], 'stackable') else True
-        ), reverse=True) # Sorting should be largest to smallest, heaviest to lightest
+        # Items are packed in a fixed per-item order (see _prepare_item_table)
+        self._prepare_item_table(genome.items)
+        positions = packing_positions(genome.order, self._pack_rank)
+        sequence = np.frombuffer(genome.order, dtype=np.uint16)[positions].tolist()
+        tokens = placement_tokens(genome.order, genome.rotation_flags, positions, self._item_types.types).tolist()
+        item_types = self._item_types.item_types_in(self.units)
         
         # Pack items and track metrics
         total_contact_area_eval = 0.0
         total_surface_area_eval = 0.0
         
-        for item_obj, rotation_flag_val in items_to_pack_for_eval:
-            original_dims = item_obj.dimensions # This should be the (potentially bundled) dimensions
-            # Apply rotation to a temporary dimension variable for placement checks
-            rotated_dims_for_check = GeneticPacker._get_rotation(None, original_dims, rotation_flag_val)
+        for depth in range(len(tokens)):
+            item_type = item_types[tokens[depth] // 6]
+            rotation_flag_val = tokens[depth] % 6
+            if item_type is None:
+                logger.error(f"Item in genome.item_sequence is not an Item object: {genome.items[sequence[depth]]}")
+                continue # Skip non-Item objects
+            # Apply rotation to the type's (potentially bundled) dimensions for placement checks
+            rotated_dims_for_check = GeneticPacker._get_rotation(None, item_type.dimensions, rotation_flag_val)
             
             best_pos_eval = None
             best_rot_applied = None # Store the actual dimensions used for packing
             best_space_eval = None
             best_score_eval = float('-inf')
+            best_contact_eval = 0.0
             
-            is_temperature_sensitive_eval = hasattr(item_obj, 'needs_insulation') and item_obj.needs_insulation and self.route_temperature is not None
+            is_temperature_sensitive_eval = item_type.needs_insulation and self.route_temperature is not None
             
-            for space_candidate in container.spaces:
-                if is_temperature_sensitive_eval and hasattr(space_candidate, 'temperature_safe') and not space_candidate.temperature_safe:
-                    continue
-                    
-                if space_candidate.can_fit_item(rotated_dims_for_check):
-                    pos_candidate = (space_candidate.x, space_candidate.y, space_candidate.z)
-                    # Pass rotated_dims_for_check for validation
-                    if container._is_valid_placement(item_obj, pos_candidate, rotated_dims_for_check):
-                        if is_temperature_sensitive_eval:
-                            wall_buffer = 0.3
-                            x_pos, y_pos, z_pos = pos_candidate
-                            w_dim, d_dim, h_dim = rotated_dims_for_check # Use rotated dimensions for checks
-                            
-                            # Check proximity to all six walls
-                            if not (x_pos >= wall_buffer and \
-                                    y_pos >= wall_buffer and \
-                                    z_pos >= wall_buffer and \
-                                    container.dimensions[0] - (x_pos + w_dim) >= wall_buffer and \
-                                    container.dimensions[1] - (y_pos + d_dim) >= wall_buffer and \
-                                    container.dimensions[2] - (z_pos + h_dim) >= wall_buffer):
-                                continue
-                        
-                        contact_score_eval = 0.0
-                        wall_contacts_eval = 0
-                        # Use rotated_dims_for_check for contact calculations
-                        if pos_candidate[0] == 0 or pos_candidate[0] + rotated_dims_for_check[0] == container.dimensions[0]:
-                            wall_contacts_eval += 1
-                        if pos_candidate[1] == 0 or pos_candidate[1] + rotated_dims_for_check[1] == container.dimensions[1]:
-                            wall_contacts_eval += 1
-                        if pos_candidate[2] == 0:
-                            wall_contacts_eval += 1
-                        
-                        for placed_item_instance in container.items:
-                            if hasattr(container, '_has_surface_contact') and hasattr(container, '_calculate_overlap_area') and \
-                               container._has_surface_contact(pos_candidate, rotated_dims_for_check, placed_item_instance):
-                                overlap_area_eval = container._calculate_overlap_area(
-                                    (pos_candidate[0], pos_candidate[1], rotated_dims_for_check[0], rotated_dims_for_check[1]),
-                                    (placed_item_instance.position[0], placed_item_instance.position[1],
-                                     placed_item_instance.dimensions[0], placed_item_instance.dimensions[1])
-                                )
-                                contact_score_eval += overlap_area_eval
+            for pos_candidate, space_candidate in container.candidate_positions(
+                    rotated_dims_for_check, temperature_safe=is_temperature_sensitive_eval):
+                # Pass rotated_dims_for_check for validation
+                if container._is_valid_placement(item_type, pos_candidate, rotated_dims_for_check):
+                    if is_temperature_sensitive_eval:
+                        wall_buffer = container._length(0.3)
+                        x_pos, y_pos, z_pos = pos_candidate
+                        w_dim, d_dim, h_dim = rotated_dims_for_check # Use rotated dimensions for checks
                         
-                        current_placement_score = 0.0
-                        if is_temperature_sensitive_eval:
-                            center_x_container = container.dimensions[0] / 2
-                            center_y_container = container.dimensions[1] / 2
-                            # Use rotated_dims_for_check for item center calculation
-                            item_center_x_eval = pos_candidate[0] + rotated_dims_for_check[0]/2
-                            item_center_y_eval = pos_candidate[1] + rotated_dims_for_check[1]/2
-                            
-                            distance_from_center_sq = ((item_center_x_eval - center_x_container)**2 + 
-                                                  (item_center_y_eval - center_y_container)**2)
-                            max_distance_sq = ((container.dimensions[0]/2)**2 + (container.dimensions[1]/2)**2)
-                            normalized_distance = (distance_from_center_sq / max_distance_sq) if max_distance_sq > 0 else 0.0
-                                                  
-                            central_bonus_eval = 50 * (1 - normalized_distance) # Max 50 points
-                            current_placement_score = contact_score_eval * 3 + central_bonus_eval
-                        else:
-                            current_placement_score = contact_score_eval * 2 + wall_contacts_eval * 1.5
+                        # Check proximity to all six walls
+                        if not (x_pos >= wall_buffer and \
+                                y_pos >= wall_buffer and \
+                                z_pos >= wall_buffer and \
+                                container.dimensions[0] - (x_pos + w_dim) >= wall_buffer and \
+                                container.dimensions[1] - (y_pos + d_dim) >= wall_buffer and \
+                                container.dimensions[2] - (z_pos + h_dim) >= wall_buffer):
+                            continue
+                    
+                    contact_score_eval = 0.0
+                    wall_contacts_eval = 0
+                    # Use rotated_dims_for_check for contact calculations
+                    if pos_candidate[0] == 0 or pos_candidate[0] + rotated_dims_for_check[0] == container.dimensions[0]:
+                        wall_contacts_eval += 1
+                    if pos_candidate[1] == 0 or pos_candidate[1] + rotated_dims_for_check[1] == container.dimensions[1]:
+                        wall_contacts_eval += 1
+                    if pos_candidate[2] == 0:
+                        wall_contacts_eval += 1
+                    
+                    # Floor-rectangle overlap with every item in surface contact
+                    for _, _, overlap_area_eval in container.surface_contacts(pos_candidate, rotated_dims_for_check):
+                        contact_score_eval += overlap_area_eval
+                    contact_score_eval *= square_meters
+                    
+                    current_placement_score = 0.0
+                    if is_temperature_sensitive_eval:
+                        center_x_container = container.dimensions[0] / 2
+                        center_y_container = container.dimensions[1] / 2
+                        # Use rotated_dims_for_check for item center calculation
+                        item_center_x_eval = pos_candidate[0] + rotated_dims_for_check[0]/2
+                        item_center_y_eval = pos_candidate[1] + rotated_dims_for_check[1]/2
                         
-                        if current_placement_score > best_score_eval:
-                            best_score_eval = current_placement_score
-                            best_pos_eval = pos_candidate
-                            best_rot_applied = rotated_dims_for_check # This is the dimension set to use
-                            best_space_eval = space_candidate
-            
+                        distance_from_center_sq = ((item_center_x_eval - center_x_container)**2 + 
+                                              (item_center_y_eval - center_y_container)**2)
+                        max_distance_sq = ((container.dimensions[0]/2)**2 + (container.dimensions[1]/2)**2)
+                        normalized_distance = (distance_from_center_sq / max_distance_sq) if max_distance_sq > 0 else 0.0
+                                              
+                        central_bonus_eval = 50 * (1 - normalized_distance) # Max 50 points
+                        current_placement_score = contact_score_eval * 3 + central_bonus_eval
+                    else:
+                        current_placement_score = contact_score_eval * 2 + wall_contacts_eval * 1.5
+                    
+                    if current_placement_score > best_score_eval:
+                        best_score_eval = current_placement_score
+                        best_pos_eval = pos_candidate
+                        best_rot_applied = rotated_dims_for_check # This is the dimension set to use
+                        best_space_eval = space_candidate
+                        best_contact_eval = contact_score_eval
+        
             if best_pos_eval and best_rot_applied: # Ensure best_rot_applied is also found
-                item_obj.position = best_pos_eval
-                item_obj.dimensions = best_rot_applied # Set the item's dimensions to the rotated ones used for packing
+                # Placements are recorded as the item's type, position and rotated dimensions; items are never copied
+                item_obj = PlacedBox(item_type, genome.items[sequence[depth]].name, best_pos_eval, best_rot_applied)
                 container.items.append(item_obj)
                 container._update_spaces(best_pos_eval, best_rot_applied, best_space_eval)
                 
-                item_surface_area = 2 * (
-                    item_obj.dimensions[0] * item_obj.dimensions[1] +
-                    item_obj.dimensions[1] * item_obj.dimensions[2] +
-                    item_obj.dimensions[0] * item_obj.dimensions[2]
-                )
-                total_surface_area_eval += item_surface_area
-                
-                for other_item_instance in container.items[:-1]:
-                    if hasattr(container, '_has_surface_contact') and hasattr(container, '_calculate_overlap_area') and \
-                       container._has_surface_contact(item_obj.position, item_obj.dimensions, other_item_instance):
-                        overlap_area_contact = container._calculate_overlap_area(
-                             (item_obj.position[0], item_obj.position[1], item_obj.dimensions[0], item_obj.dimensions[1]),
-                             (other_item_instance.position[0], other_item_instance.position[1], other_item_instance.dimensions[0], other_item_instance.dimensions[1])
-                        )
-                        total_contact_area_eval += overlap_area_contact
-                
-                sort_spaces_local(container)
+                # The contact area of the placement was summed while scoring it
+                total_contact_area_eval += best_contact_eval
+                total_surface_area_eval += 2 * (
+                    best_rot_applied[0] * best_rot_applied[1] +
+                    best_rot_applied[1] * best_rot_applied[2] +
+                    best_rot_applied[0] * best_rot_applied[2]
+                ) * square_meters
+                # _update_spaces keeps the spaces ordered by height, then distance from the
+                # origin, then decreasing volume, so they need no re-sort here
         
         # Calculate all metrics
         metrics = {}
@@ -528,8 +873,8 @@ class GeneticPacker:
             logger.debug(f"Could not calculate weight balance score: {e}")
             metrics['weight_balance'] = 0.0
             
-        metrics['items_packed_ratio'] = (len(container.items) / len(genome.item_sequence)) if len(genome.item_sequence) > 0 else \
-                                      (1.0 if not genome.item_sequence and not container.items else 0.0) # Handle empty item sequence
+        metrics['items_packed_ratio'] = (len(container.items) / len(genome.order)) if len(genome.order) > 0 else \
+                                      (1.0 if not genome.order and not container.items else 0.0) # Handle empty item sequence
 
         # Temperature Constraint Score
         # Higher is better (closer to 1.0 means constraint is well met)
@@ -554,7 +899,7 @@ class GeneticPacker:
                         container.dimensions[2] - (z + h)
                     ]
                     min_dist_for_item = min(d for d in dist_to_walls if d >= 0) # Smallest distance to any wall
-                    total_min_wall_distance += min_dist_for_item
+                    total_min_wall_distance += min_dist_for_item * meters
                 
                 avg_min_wall_distance = total_min_wall_distance / len(temp_sensitive_packed_items) if temp_sensitive_packed_items else 0
                 
@@ -562,6 +907,7 @@ class GeneticPacker:
                 temp_constraint_score = min(1.0, avg_min_wall_distance / target_avg_wall_distance) if target_avg_wall_distance > 0 else 1.0
             # If no temp-sensitive items are packed, constraint is considered met.
         metrics['temperature_constraint'] = temp_constraint_score
+        metrics['live_spaces'] = container.free_space_count()
 
         # Weight Capacity Score
         # Higher is better (1.0 if within capacity, penalizes overweight)
@@ -575,41 +921,182 @@ class GeneticPacker:
                 weight_capacity_score = max(0.0, 2.0 - overweight_ratio) # Linear penalty
         metrics['weight_capacity'] = weight_capacity_score
 
-        # Store metrics in genome for detailed logging
-        genome.metrics = metrics
+        return metrics
 
-        # Apply weights to calculate main fitness
-        current_weights = self.fitness_weights
-        if not current_weights or not isinstance(current_weights, dict) or not any(w > 0 for w in current_weights.values()):
-            logger.warning("_evaluate_fitness: self.fitness_weights not set, invalid, or all zero. Falling back to default.")
-            current_weights = self._get_default_fitness_weights() 
-        
-        fitness = 0.0
-        for weight_name, weight_value in current_weights.items():
-            metric_key = weight_name.replace('_weight', '')
-            metric_value = metrics.get(metric_key, 0.0)
-            fitness += metric_value * weight_value
-            logger.debug(f"Fitness component: {metric_key}={metric_value:.4f} * {weight_value:.4f} = {metric_value * weight_value:.4f}")
-        
-        # Store metrics in genome for detailed logging
-        genome.metrics = metrics
+    def _evaluate_population(self, population):
+        """
+        Evaluate fitness for every genome in the population.
 
-        # Apply weights to calculate main fitness
-        current_weights = self.fitness_weights
-        if not current_weights or not isinstance(current_weights, dict) or not any(w > 0 for w in current_weights.values()):
-            logger.warning("_evaluate_fitness: self.fitness_weights not set, invalid, or all zero. Falling back to default.")
-            current_weights = self._get_default_fitness_weights() 
-        
-        fitness = 0.0
-        for weight_name, weight_value in current_weights.items():
-            metric_key = weight_name.replace('_weight', '')
-            metric_value = metrics.get(metric_key, 0.0)
-            fitness += metric_value * weight_value
-            logger.debug(f"Fitness component: {metric_key}={metric_value:.4f} * {weight_value:.4f} = {metric_value * weight_value:.4f}")
-        
-        genome.fitness = fitness # Assign calculated fitness to the genome object
-        logger.debug(f"Total fitness: {fitness:.4f}, Metrics: {metrics}")
-        return fitness
+        Genomes already in the fitness cache (typically elites carried over from the
+        previous generation) and duplicates within the population are not packed
+        again. The remaining genomes are evaluated on the shared worker pool when
+        parallel evaluation is enabled, otherwise one at a time in this process.
+
+        Args:
+            population: List of PackingGenome instances to evaluate
+        """
+        pending = OrderedDict()  # signature -> genomes sharing it
+        for genome in population:
+            signature = self._genome_signature(genome)
+            cached = self._fitness_cache.get(signature)
+            if cached is not None:
+                self._fitness_cache.move_to_end(signature)
+                genome.fitness, genome.metrics = cached
+                self.cache_hits += 1
+            elif signature in pending:
+                pending[signature].append(genome)
+                self.cache_hits += 1
+            else:
+                pending[signature] = [genome]
+                self.cache_misses += 1
+
+        unique_genomes = [genomes[0] for genomes in pending.values()]
+        for genome in unique_genomes:
+            genome.metrics = None
+        if len(unique_genomes) < len(population):
+            logger.info(f"    ♻️  Reusing cached fitness for {len(population) - len(unique_genomes)} genome(s)")
+
+        self._evaluate_genomes(unique_genomes)
+
+        for signature, genomes in pending.items():
+            evaluated = genomes[0]
+            for duplicate in genomes[1:]:
+                duplicate.fitness = evaluated.fitness
+                duplicate.metrics = evaluated.metrics
+            if evaluated.metrics is not None:
+                self._cache_fitness(signature, evaluated.fitness, evaluated.metrics)
+
+    def _cache_fitness(self, signature, fitness, metrics):
+        """Store an evaluation in the LRU fitness cache, evicting the oldest entry when full"""
+        if self.fitness_cache_size <= 0:
+            return
+        self._fitness_cache[signature] = (fitness, metrics)
+        if len(self._fitness_cache) > self.fitness_cache_size:
+            self._fitness_cache.popitem(last=False)
+
+    def _evaluate_genomes(self, population):
+        """
+        Evaluate a list of genomes without consulting the fitness cache.
+
+        Args:
+            population: List of PackingGenome instances to evaluate
+        """
+        if not population:
+            return
+        # Genomes beyond the evaluation budget are left unevaluated
+        remaining = self._remaining_evaluations()
+        if remaining is not None and remaining < len(population):
+            self._skip_evaluation(population[remaining:])
+            population = population[:remaining]
+
+        if self.parallel_workers and self.parallel_workers > 1 and self._run_context_path:
+            try:
+                self._evaluate_population_parallel(population)
+                return
+            except BrokenProcessPool as e:
+                logger.error(f"❌ Evaluation worker pool failed ({e}). Falling back to sequential evaluation.")
+                shutdown_evaluation_pool()
+
+        for i, genome in enumerate(population):
+            if self._budget_exhausted():
+                self._skip_evaluation(population[i:])
+                break
+            self.evaluations += 1
+            try:
+                genome.fitness = self._evaluate_fitness(genome)
+                if (i + 1) % 5 == 0 or i == len(population) - 1:
+                    logger.info(f"    ✅ Evaluated {i + 1}/{len(population)} genomes (latest fitness: {genome.fitness:.4f})")
+            except Exception as e:
+                logger.error(f"❌ Error evaluating genome {i + 1}: {e}")
+                genome.fitness = 0.0
+
+    @staticmethod
+    def _skip_evaluation(genomes):
+        """Mark genomes left unevaluated when the run budget ran out"""
+        if not genomes:
+            return
+        for genome in genomes:
+            genome.fitness = 0.0
+            genome.metrics = None
+        logger.info(f"    ⏱️  Run budget reached - skipped {len(genomes)} genome evaluation(s)")
+
+    def _evaluate_population_parallel(self, population):
+        """
+        Evaluate the population on the shared process pool.
+
+        Genomes are sent as item-index sequences plus rotation flags; the item table
+        was written once for this run (see _start_run_context). Workers return only
+        metrics, and fitness weights are applied here so that weight changes never
+        need to reach the workers. Results are written back by population index, so
+        the outcome matches sequential evaluation exactly.
+        """
+        pool = get_evaluation_pool(self.parallel_workers)
+
+        payload = [
+            (i, genome.order.tobytes(), genome.rotation_flags.tobytes())
+            for i, genome in enumerate(population)
+        ]
+        batch_count = min(len(payload), self.parallel_workers * 2)
+        batches = [payload[b::batch_count] for b in range(batch_count)]
+
+        futures = [pool.submit(_evaluate_genome_batch, self._run_context_path, batch) for batch in batches]
+        evaluated = 0
+        done = set()
+        try:
+            for future in as_completed(futures, timeout=self._remaining_time()):
+                for i, metrics, error in future.result():
+                    genome = population[i]
+                    done.add(i)
+                    evaluated += 1
+                    if metrics is None:
+                        logger.error(f"❌ Error evaluating genome {i + 1}: {error}")
+                        genome.fitness = 0.0
+                        continue
+                    genome.metrics = metrics
+                    genome.fitness = self._score_metrics(metrics)
+                logger.info(f"    ✅ Evaluated {evaluated}/{len(population)} genomes in parallel")
+        except FuturesTimeoutError:
+            # Deadline reached: stop waiting and leave the remaining genomes unevaluated
+            for future in futures:
+                future.cancel()
+            self._skip_evaluation([genome for i, genome in enumerate(population) if i not in done])
+        finally:
+            self.evaluations += evaluated
+
+    def _start_run_context(self):
+        """
+        Write the per-run worker context (item table, container and route settings)
+        to a temporary file. Workers load it once per run instead of receiving the
+        item table with every genome.
+        """
+        if (not self.parallel_workers or self.parallel_workers <= 1) and self.islands <= 1:
+            return
+        fd, path = tempfile.mkstemp(prefix='gravitycargo_ga_', suffix='.pkl')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump({
+                'container_dims': self.container_dims,
+                'route_temperature': self.route_temperature,
+                'placement_engine': self.placement_engine,
+                'occupancy_resolution': self.occupancy_resolution,
+                'units': self.units,
+                'items': self.items_to_pack,
+                'population_size': self.population_size,
+                'fitness_weights': self.fitness_weights
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._run_context_path = path
+        if self.islands > 1:
+            logger.info(f"Island model enabled with {self.islands} islands")
+        else:
+            logger.info(f"Parallel evaluation enabled with {self.parallel_workers} workers")
+
+    def _end_run_context(self):
+        """Remove the per-run worker context file"""
+        if self._run_context_path:
+            try:
+                os.remove(self._run_context_path)
+            except OSError:
+                pass
+            self._run_context_path = None
 
     def mutate_population(self, population, operation_focus, rate_modifier):
         """
@@ -699,7 +1186,16 @@ class GeneticPacker:
             RESPOND WITH ONLY THE JSON OBJECT, NO OTHER TEXT.
             """
             
-            response = llm_client.generate(prompt)
+            best_genome = max(population, key=lambda g: g.fitness)
+            best_metrics = getattr(best_genome, 'metrics', None) or {}
+            cache_key = make_cache_key(
+                "adaptive_mutation",
+                variance=log_bucket(fitness_variance),
+                stagnation=min(stagnation_counter, 10),
+                items=count_bucket(len(self.items_to_pack)),
+                utilization=value_bucket(best_metrics.get('volume_utilization', 0.0))
+            )
+            response = llm_client.generate(prompt, cache_key=cache_key)
             
             try:
                 strategy = json.loads(response.strip())
@@ -780,7 +1276,7 @@ class GeneticPacker:
                 logger.warning("current_metrics is None in _get_dynamic_fitness_weights. Cannot fetch dynamic weights.")
                 return None
 
-            if not llm_client or not hasattr(llm_client, 'get_llm_completion'):
+            if not llm_client or not getattr(llm_client, 'enabled', False):
                 logger.info("LLM client not available for dynamic fitness weights.")
                 return None
             
@@ -832,7 +1328,16 @@ class GeneticPacker:
             RESPOND WITH ONLY THE JSON OBJECT, NO OTHER TEXT.
             """
             
-            response_text = llm_client.get_llm_completion(prompt)
+            cache_key = make_cache_key(
+                "dynamic_weights",
+                variance=log_bucket(fitness_variance),
+                items=count_bucket(len(self.items_to_pack)),
+                **{name: value_bucket(current_metrics.get(name, 0.0), 0.1)
+                   for name in ('volume_utilization', 'stability_score', 'contact_ratio',
+                                'weight_balance', 'items_packed_ratio')},
+                temperature=value_bucket(self.route_temperature, 5.0) if self.route_temperature is not None else "none"
+            )
+            response_text = llm_client.generate(prompt, cache_key=cache_key)
             logger.info(f"LLM response for dynamic fitness weights: {response_text}")
             
             if not response_text:
@@ -876,17 +1381,43 @@ class GeneticPacker:
             logger.error(f"Error getting dynamic fitness weights from LLM: {e}", exc_info=True)
             return None
 
-    def optimize(self, items, fitness_weights=None):
+    def optimize(self, items, fitness_weights=None, deadline_seconds=None, max_evaluations=None,
+                 stagnation_limit=None, stop_at_volume_bound=False, seeds=None):
         """
         Run the genetic algorithm to find the best packing solution.
+
+        The run stops early, returning the best genome found so far, when a budget
+        runs out or the search has converged; the reason is kept in stop_reason.
         Args:
             items: List of items to pack
             fitness_weights (dict, optional): Predefined fitness weights from UI.
                                               If None or empty, dynamic weights may be fetched.
+            deadline_seconds (float, optional): Wall-clock budget for the whole run,
+                                                including LLM calls.
+            max_evaluations (int, optional): Maximum number of genomes to pack
+                                             (cached fitness lookups are free).
+            stagnation_limit (int, optional): Stop after this many generations
+                                              without improvement.
+            stop_at_volume_bound (bool): Stop once the best genome packs every item,
+                                         so volume utilization is at its upper bound.
+            seeds (list, optional): (item index order, rotation flags) pairs, e.g. from
+                                    warm_start.warm_start_seeds, that seed part of the
+                                    initial population.
         Returns:
             tuple: (best_genome, best_fitness, generation_count)
         """
         self.items_to_pack = items # Store items for use in _calculate_initial_metrics and _evaluate_fitness
+        self._fitness_cache.clear()  # Cached signatures are only valid for this item table
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._ranked_items = None
+        self._prepare_item_table(items)
+        if self._item_types.count < len(items):
+            logger.info(f"🧬 Symmetry reduction: {len(items)} items in {self._item_types.count} interchangeable types")
+        self._start_budget(items, deadline_seconds, max_evaluations, stagnation_limit, stop_at_volume_bound)
+        self._seeds = list(seeds or [])
+        self.seeded_genomes = 0
+        self.initial_genomes = 0
         
         logger.info(f"GeneticPacker.optimize called. Received fitness_weights from UI/caller: {fitness_weights}")
 
@@ -903,7 +1434,7 @@ class GeneticPacker:
             # Calculate initial metrics first, as _get_initial_dynamic_fitness_weights might need them.
             # self.items_to_pack should be set before calling _calculate_initial_metrics.
             initial_metrics_for_llm = self._calculate_initial_metrics()
-            dynamic_weights = self._get_initial_dynamic_fitness_weights(initial_metrics=initial_metrics_for_llm) 
+            dynamic_weights = self._call_llm(self._get_initial_dynamic_fitness_weights, initial_metrics=initial_metrics_for_llm)
             
             if dynamic_weights:
                 self.fitness_weights = dynamic_weights
@@ -919,28 +1450,118 @@ class GeneticPacker:
         
         logger.info(f"Final fitness weights for optimization run: {self.fitness_weights}")
 
+        self._start_run_context()
+        try:
+            if self.islands > 1:
+                return self._run_islands(items)
+            return self._run_generations(items)
+        finally:
+            self._end_run_context()
+            if self._advisor is not None:
+                self._advisor.close()
+                self._advisor = None
+
+    def _start_budget(self, items, deadline_seconds, max_evaluations, stagnation_limit, stop_at_volume_bound):
+        """Reset the run budget and early stopping settings (see optimize)"""
+        self._deadline = time.monotonic() + deadline_seconds if deadline_seconds is not None else None
+        self.max_evaluations = max_evaluations
+        self.stagnation_limit = stagnation_limit
+        self.stop_at_volume_bound = stop_at_volume_bound
+        self.evaluations = 0
+        self.generations_completed = 0
+        self.stop_reason = None
+
+        container_volume = self.container_dims[0] * self.container_dims[1] * self.container_dims[2]
+        items_volume = sum(item.dimensions[0] * item.dimensions[1] * item.dimensions[2]
+                           for item in items if hasattr(item, 'dimensions') and len(item.dimensions) == 3)
+        self._volume_bound = min(1.0, items_volume / container_volume) if container_volume > 0 else 0.0
+
+        if deadline_seconds is not None or max_evaluations is not None:
+            logger.info(f"⏱️  Run budget: deadline={deadline_seconds}s, max evaluations={max_evaluations}")
+
+    def _remaining_time(self) -> Optional[float]:
+        """Seconds left before the run deadline, or None without a deadline"""
+        if self._deadline is None:
+            return None
+        return max(0.0, self._deadline - time.monotonic())
+
+    def _remaining_evaluations(self) -> Optional[int]:
+        """Genome evaluations left in the run budget, or None without a limit"""
+        if self.max_evaluations is None:
+            return None
+        return max(0, self.max_evaluations - self.evaluations)
+
+    def _budget_exhausted(self) -> Optional[str]:
+        """Reason the run budget is used up, or None while it lasts"""
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            return "deadline reached"
+        if self.max_evaluations is not None and self.evaluations >= self.max_evaluations:
+            return "evaluation budget used"
+        return None
+
+    def _converged(self, best_genome, stagnation_counter) -> Optional[str]:
+        """Reason the search can stop early, or None if it should continue"""
+        if self.stagnation_limit and stagnation_counter >= self.stagnation_limit:
+            return f"no improvement for {stagnation_counter} generations"
+        if self.stop_at_volume_bound and best_genome is not None:
+            metrics = getattr(best_genome, 'metrics', None) or {}
+            if metrics.get('items_packed_ratio', 0.0) >= 1.0 or \
+               metrics.get('volume_utilization', 0.0) >= self._volume_bound - 1e-9:
+                return f"volume bound reached ({self._volume_bound:.2%})"
+        return None
+
+    def _call_llm(self, func, *args, **kwargs):
+        """
+        Call an LLM-backed helper within the run deadline.
+
+        Returns:
+            The helper's result, or None if the deadline passed first
+        """
+        remaining = self._remaining_time()
+        if remaining is None:
+            return func(*args, **kwargs)
+        if remaining <= 0:
+            logger.info(f"⏱️  Skipping {func.__name__}: run deadline reached")
+            return None
+        finished, result = _call_with_timeout(func, remaining, *args, **kwargs)
+        if not finished:
+            logger.warning(f"⏱️  {func.__name__} did not finish before the run deadline - continuing without it")
+        return result
+
+    def _run_generations(self, items):
+        """
+        Evolve the population for the configured number of generations.
+
+        Args:
+            items: List of items to pack
+
+        Returns:
+            PackingGenome: Best genome found
+        """
         # Initialize population
-        population = [PackingGenome(items) for _ in range(self.population_size)]
+        population = self._initial_population(items)
         best_overall_genome = None
         best_overall_fitness = float('-inf')
         stagnation_counter = 0
 
+        # LLM advice is prepared in the background; the loop only polls for it
+        self._advisor = LLMAdvisor()
+        self.stale_advice_generations = 0
+        current_strategy = None
+
         for generation in range(self.generations):
+            self.stop_reason = self._budget_exhausted()
+            if self.stop_reason:
+                break
+
             logger.info(f"\n{'='*60}")
             logger.info(f"🧬 GENERATION {generation + 1}/{self.generations}")
             logger.info(f"{'='*60}")
 
             # Evaluate fitness for the current population
-            # Use sequential evaluation instead of multiprocessing to avoid pickling issues
             logger.info(f"  📊 Evaluating {len(population)} genomes...")
-            for i, genome in enumerate(population):
-                try:
-                    genome.fitness = self._evaluate_fitness(genome)
-                    if (i + 1) % 5 == 0 or i == len(population) - 1:
-                        logger.info(f"    ✅ Evaluated {i + 1}/{len(population)} genomes (latest fitness: {genome.fitness:.4f})")
-                except Exception as e:
-                    logger.error(f"❌ Error evaluating genome {i + 1}: {e}")
-                    genome.fitness = 0.0
+            self._evaluate_population(population)
+            self.generations_completed += 1
 
             # Calculate generation statistics
             fitnesses = [g.fitness for g in population]
@@ -995,55 +1616,136 @@ class GeneticPacker:
                 stagnation_counter = 0
                 logger.info(f"    🚀 Improvement found! Stagnation reset.")
 
+            # Stop early once the budget is used up or the search has converged
+            self.stop_reason = self._budget_exhausted() or self._converged(best_overall_genome, stagnation_counter)
+            if self.stop_reason:
+                break
+
             # Adaptive mutation strategy
             if stagnation_counter >= 5:
-                new_strategy = self._get_adaptive_mutation_strategy(generation, population, stagnation_counter)
+                self._advisor.request('mutation', self._get_adaptive_mutation_strategy,
+                                      generation, list(population), stagnation_counter)
+                new_strategy = self._advisor.poll('mutation')
                 if new_strategy:
+                    current_strategy = new_strategy
                     logger.info(f"    🧬 Adapting mutation strategy: {new_strategy['operation_focus']} (rate: {new_strategy['mutation_rate_modifier']:.3f})")
                     logger.info(f"    💡 Reasoning: {new_strategy.get('explanation', 'No explanation provided')}")
-                    for genome in population:
-                        genome.mutate(
-                            operation_focus=new_strategy["operation_focus"],
-                            rate_modifier=new_strategy["mutation_rate_modifier"]
-                        )
+                else:
+                    # No fresh advice yet - keep the last advised strategy, or the rule-based one until advice arrives
+                    new_strategy = current_strategy or self._get_aggressive_mutation_strategy(stagnation_counter)
+                    logger.info(f"    🧠 Awaiting LLM advice - using mutation strategy: {new_strategy['operation_focus']}")
+                for genome in population:
+                    genome.mutate(
+                        operation_focus=new_strategy["operation_focus"],
+                        rate_modifier=new_strategy["mutation_rate_modifier"]
+                    )
 
             # Dynamic fitness weight adjustment every few generations (only if LLM is available)
             if generation > 0 and generation % 3 == 0 and best_overall_genome:
                 # Get current metrics from best genome for dynamic weight adjustment
                 current_metrics = getattr(best_overall_genome, 'metrics', {})
                 if current_metrics:
-                    dynamic_weights = self._get_dynamic_fitness_weights(generation, population, current_metrics)
-                    if dynamic_weights:
-                        logger.info(f"    🎯 Updated fitness weights based on current performance")
-                        logger.info(f"    📊 New weights: {dynamic_weights}")
-                        self.fitness_weights = dynamic_weights
-
-            # Elitism: carry forward the best genome
-            elite_count = max(1, int(self.population_size * self.elite_percentage))
-            new_population = sorted(population, key=lambda x: x.fitness, reverse=True)[:elite_count]
-
-            # Crossover and mutation to create new population
-            while len(new_population) < self.population_size:
-                parent1 = self._tournament_select(population)
-                parent2 = self._tournament_select(population)
-                child = self._crossover(parent1, parent2)
-                
-                # Apply mutation
-                child.mutate(
-                    operation_focus="balanced",  # Use a balanced approach for exploration
-                    rate_modifier=random.uniform(0.05, 0.2)  # Small to moderate mutation rate
-                )
-                
-                new_population.append(child)
+                    self._advisor.request('weights', self._get_dynamic_fitness_weights,
+                                          generation, list(population), dict(current_metrics))
+            dynamic_weights = self._advisor.poll('weights')
+            if dynamic_weights:
+                logger.info(f"    🎯 Updated fitness weights based on current performance")
+                logger.info(f"    📊 New weights: {dynamic_weights}")
+                self.fitness_weights = dynamic_weights
+
+            # Generations that go ahead while requested advice is still outstanding run on stale advice
+            if self._advisor.is_pending():
+                self.stale_advice_generations += 1
+
+            population = self._breed(population)
+
+        self._log_run_summary(best_overall_genome, best_overall_fitness)
+        return self._finish_run(best_overall_genome, best_overall_fitness)
+
+    def _initial_population(self, items):
+        """
+        Create an initial population, seeding up to half of it from warm-start seeds.
+
+        Every seed is used once as is; remaining seed slots hold mutated copies of
+        the seeds, and the rest of the population is random.
+
+        Args:
+            items: List of items to pack
+
+        Returns:
+            List of PackingGenome
+        """
+        population = []
+        seed_slots = 0
+        if self._seeds:
+            seed_slots = min(max(len(self._seeds), self.population_size // 2), self.population_size)
+        for i in range(seed_slots):
+            order, rotation_flags = self._seeds[i % len(self._seeds)]
+            genome = PackingGenome(items, order=order, rotation_flags=bytes(rotation_flags), item_types=self._item_types)
+            if i >= len(self._seeds):
+                genome.mutate()
+            population.append(genome)
+        population.extend(PackingGenome(items, item_types=self._item_types)
+                          for _ in range(self.population_size - seed_slots))
+
+        self.seeded_genomes += seed_slots
+        self.initial_genomes += len(population)
+        if seed_slots:
+            logger.info(f"🌱 Warm start: {seed_slots} of {len(population)} initial genomes seeded from saved plans")
+        return population
+
+    def _breed(self, population, operation_focus="balanced", rate_modifier=None):
+        """
+        Create the next generation from an evaluated population.
+
+        Args:
+            population: Evaluated list of PackingGenome instances
+            operation_focus: Mutation focus applied to children
+            rate_modifier: Fixed mutation rate modifier for children (None draws one per child)
+
+        Returns:
+            list: New population of population_size genomes
+        """
+        # Elitism: carry forward the best genome
+        elite_count = max(1, int(self.population_size * self.elite_percentage))
+        new_population = sorted(population, key=lambda x: x.fitness, reverse=True)[:elite_count]
+
+        # Crossover and mutation to create new population
+        while len(new_population) < self.population_size:
+            parent1 = self._tournament_select(population)
+            parent2 = self._tournament_select(population)
+            child = self._crossover(parent1, parent2)
+            
+            # Apply mutation
+            child.mutate(
+                operation_focus=operation_focus,  # Balanced by default for exploration
+                rate_modifier=rate_modifier if rate_modifier is not None else random.uniform(0.05, 0.2)  # Small to moderate mutation rate
+            )
             
-            population = new_population
+            new_population.append(child)
+        
+        return new_population
 
-        # Final generation summary
+    def _log_run_summary(self, best_overall_genome, best_overall_fitness):
+        """Log the final summary of an optimization run"""
         logger.info(f"\n{'='*60}")
         logger.info(f"🏁 OPTIMIZATION COMPLETE")
         logger.info(f"{'='*60}")
         logger.info(f"  🏆 Best fitness achieved: {best_overall_fitness:.4f}")
-        logger.info(f"  📊 Generations completed: {self.generations}")
+        logger.info(f"  📊 Generations completed: {self.generations_completed}/{self.generations}")
+        if self.stop_reason:
+            logger.info(f"  ⏹️  Stopped early: {self.stop_reason}")
+        total_lookups = self.cache_hits + self.cache_misses
+        if total_lookups:
+            logger.info(f"  ♻️  Fitness cache: {self.cache_hits} hits, {self.cache_misses} misses "
+                        f"({self.cache_hits / total_lookups:.1%} hit rate)")
+        if self._advisor is not None and self._advisor.requests_made:
+            logger.info(f"  🧠 LLM advisor: {self._advisor.requests_made} request(s), "
+                        f"{self._advisor.responses_received} fresh response(s), "
+                        f"{self.stale_advice_generations} generation(s) on stale advice")
+        if self.seeded_genomes:
+            logger.info(f"  🌱 Warm start: {self.seeded_genomes} of {self.initial_genomes} initial genomes "
+                        f"({self.seeded_fraction:.0%}) came from saved plans")
         if best_overall_genome and hasattr(best_overall_genome, 'metrics'):
             metrics = best_overall_genome.metrics
             logger.info(f"  📈 Final metrics:")
@@ -1054,19 +1756,235 @@ class GeneticPacker:
             logger.info(f"    - Weight balance: {metrics.get('weight_balance', 0.0):.3f}")
             logger.info(f"    - Temperature constraint: {metrics.get('temperature_constraint', 0.0):.3f}")
             logger.info(f"    - Weight capacity: {metrics.get('weight_capacity', 0.0):.3f}")
+            logger.info(f"    - Free spaces left: {metrics.get('live_spaces', 0)}")
         logger.info(f"{'='*60}")
 
+    def _finish_run(self, best_overall_genome, best_overall_fitness):
+        """Record the best solution of a run and return it"""
         self.best_solution = best_overall_genome
         self.best_fitness = best_overall_fitness
-        self.generation_count = self.generations
+        self.generation_count = self.generations_completed
         
         # Store final performance data in the best genome for reporting
         if best_overall_genome:
             best_overall_genome.best_fitness = best_overall_fitness
-            best_overall_genome.generation_count = self.generations
+            best_overall_genome.generation_count = self.generations_completed
+            best_overall_genome.stop_reason = self.stop_reason
+            best_overall_genome.seeded_fraction = self.seeded_fraction
         
         return best_overall_genome
 
+    def _run_islands(self, items):
+        """
+        Evolve independent island populations, migrating top genomes between them.
+
+        Each island holds population_size genomes and runs migration_interval
+        generations at a time in a worker process. Between epochs the best
+        migration_size genomes of every island replace the worst genomes of its
+        neighbours: the next island for a ring topology, or the best migrants of
+        all other islands for a fully connected one. Fitness weights stay fixed
+        for the whole run so that island fitness values remain comparable.
+
+        Args:
+            items: List of items to pack
+
+        Returns:
+            PackingGenome: Best genome found on any island
+        """
+        islands = [{
+            'id': island_id,
+            'genomes': [self._encode_genome(genome) for genome in self._initial_population(items)],
+            'best': None,
+            'best_fitness': float('-inf'),
+            'stagnation': 0,
+            'generations': 0,
+            'evaluations': 0
+        } for island_id in range(self.islands)]
+
+        remaining = self.generations
+        epoch = 0
+        while remaining > 0:
+            self.stop_reason = self._budget_exhausted()
+            if self.stop_reason:
+                break
+            generations = min(self.migration_interval, remaining)
+            epoch += 1
+            logger.info(f"\n{'='*60}")
+            logger.info(f"🏝️  EPOCH {epoch}: {self.islands} islands x {generations} generation(s)")
+            logger.info(f"{'='*60}")
+
+            islands = self._run_island_epochs(islands, generations)
+            remaining -= generations
+            self.generations_completed = max(island['generations'] for island in islands)
+
+            for island in islands:
+                logger.info(f"    🏝️  Island {island['id'] + 1}: best fitness {island['best_fitness']:.4f} | "
+                            f"stagnation {island['stagnation']} generation(s)")
+
+            # Stop early once the budget is used up or every island has converged
+            best_island = max(islands, key=lambda island: island['best_fitness'])
+            best_genome = self._decode_genome(best_island['best']) if best_island['best'] else None
+            self.stop_reason = self._budget_exhausted() or \
+                self._converged(best_genome, min(island['stagnation'] for island in islands))
+            if self.stop_reason:
+                break
+            if remaining > 0:
+                self._migrate(islands)
+
+        self.island_stats = [{
+            'island': island['id'] + 1,
+            'best_fitness': island['best_fitness'],
+            'stagnation': island['stagnation'],
+            'generations': island['generations']
+        } for island in islands]
+
+        best_island = max(islands, key=lambda island: island['best_fitness'])
+        best_overall_genome = self._decode_genome(best_island['best']) if best_island['best'] else None
+        best_overall_fitness = best_island['best_fitness']
+
+        self._log_run_summary(best_overall_genome, best_overall_fitness)
+        for stats in self.island_stats:
+            logger.info(f"  🏝️  Island {stats['island']}: best fitness {stats['best_fitness']:.4f}, "
+                        f"stagnation {stats['stagnation']} generation(s)")
+        best_overall_genome = self._finish_run(best_overall_genome, best_overall_fitness)
+        if best_overall_genome:
+            best_overall_genome.island_stats = self.island_stats
+        return best_overall_genome
+
+    def _run_island_epochs(self, islands, generations):
+        """
+        Run one epoch on every island, in worker processes when possible.
+
+        Each island gets its own seed drawn here, so results do not depend on
+        how the islands are scheduled across workers.
+
+        Args:
+            islands: List of island states
+            generations: Number of generations per island
+
+        Returns:
+            list: Updated island states, in the same order
+        """
+        seeds = [random.getrandbits(32) for _ in islands]
+        if self._run_context_path:
+            # Each worker enforces the remaining deadline and an equal share of the evaluations left
+            remaining_evaluations = self._remaining_evaluations()
+            for island in islands:
+                island['budget'] = {
+                    'deadline_seconds': self._remaining_time(),
+                    'max_evaluations': remaining_evaluations // len(islands) if remaining_evaluations is not None else None
+                }
+            try:
+                pool = get_evaluation_pool(min(len(islands), os.cpu_count() or 1))
+                futures = [pool.submit(_run_island_epoch, self._run_context_path, island, generations, seed)
+                           for island, seed in zip(islands, seeds)]
+                evolved = [future.result() for future in futures]
+                self.evaluations += sum(island['evaluations'] for island in evolved)
+                return evolved
+            except BrokenProcessPool as e:
+                logger.error(f"❌ Island worker pool failed ({e}). Running islands in this process.")
+                shutdown_evaluation_pool()
+
+        # Same per-island seeding as the workers, without disturbing this process's generator
+        state = random.getstate()
+        try:
+            evolved = []
+            for island, seed in zip(islands, seeds):
+                random.seed(seed)
+                evolved.append(self._evolve_island(island, generations))
+            return evolved
+        finally:
+            random.setstate(state)
+
+    def _evolve_island(self, island, generations):
+        """
+        Evolve a single island for a number of generations.
+
+        Islands use the non-LLM stagnation strategy, applied to the children of
+        each new generation, since many islands would otherwise query the LLM in parallel.
+
+        Args:
+            island: Island state with encoded genomes
+            generations: Number of generations to run
+
+        Returns:
+            dict: Updated island state
+        """
+        population = [self._decode_genome(data) for data in island['genomes']]
+        evaluated = all(getattr(genome, 'metrics', None) is not None for genome in population)
+        evaluations_before = self.evaluations
+
+        for _ in range(generations):
+            if self._budget_exhausted():
+                break
+            if evaluated:
+                strategy = self._get_aggressive_mutation_strategy(island['stagnation']) if island['stagnation'] >= 5 else None
+                if strategy:
+                    population = self._breed(population, strategy['operation_focus'], strategy['mutation_rate_modifier'])
+                else:
+                    population = self._breed(population)
+            self._evaluate_population(population)
+            evaluated = True
+            island['generations'] += 1
+
+            best_genome = max(population, key=lambda x: x.fitness)
+            if best_genome.fitness > island['best_fitness']:
+                island['best_fitness'] = best_genome.fitness
+                island['best'] = self._encode_genome(best_genome)
+                island['stagnation'] = 0
+            else:
+                island['stagnation'] += 1
+            logger.info(f"    🏝️  Island {island['id'] + 1} generation {island['generations']}: "
+                        f"best {best_genome.fitness:.4f} (island best {island['best_fitness']:.4f})")
+
+        island['genomes'] = [self._encode_genome(genome) for genome in population]
+        island['evaluations'] = self.evaluations - evaluations_before
+        return island
+
+    def _migrate(self, islands):
+        """
+        Replace the worst genomes of each island with migrants from its neighbours.
+
+        Args:
+            islands: List of island states, updated in place
+        """
+        migration_size = self.migration_size or max(1, int(self.population_size * self.elite_percentage))
+        emigrants = [sorted(island['genomes'], key=lambda data: data[2], reverse=True)[:migration_size]
+                     for island in islands]
+
+        exchanged = 0
+        for index, island in enumerate(islands):
+            if self.migration_topology == 'ring':
+                incoming = emigrants[index - 1]
+            else:
+                incoming = sorted((data for other, group in enumerate(emigrants) if other != index for data in group),
+                                  key=lambda data: data[2], reverse=True)[:migration_size]
+
+            residents = sorted(island['genomes'], key=lambda data: data[2], reverse=True)
+            present = {(data[0], data[1]) for data in residents}
+            arrivals = [data for data in incoming if (data[0], data[1]) not in present]
+            if arrivals:
+                island['genomes'] = residents[:len(residents) - len(arrivals)] + arrivals
+                exchanged += len(arrivals)
+        logger.info(f"  🔀 Migration ({self.migration_topology}): {exchanged} genome(s) exchanged")
+
+    @staticmethod
+    def _encode_genome(genome):
+        """Compact, picklable form of a genome: (order bytes, rotation bytes, fitness, metrics)"""
+        return (genome.order.tobytes(), genome.rotation_flags.tobytes(), genome.fitness,
+                getattr(genome, 'metrics', None))
+
+    def _decode_genome(self, data):
+        """Rebuild a genome from _encode_genome data, seeding the fitness cache with its evaluation"""
+        order_bytes, rotation_bytes, fitness, metrics = data
+        genome = PackingGenome(self.items_to_pack, order=np.frombuffer(order_bytes, dtype=np.uint16),
+                               rotation_flags=rotation_bytes, item_types=self._item_types)
+        genome.fitness = fitness
+        genome.metrics = metrics
+        if metrics is not None:
+            self._cache_fitness(self._genome_signature(genome), fitness, metrics)
+        return genome
+
     @staticmethod
     def _get_rotation(_, original_dims: Tuple[float, float, float], rotation_flag: int) -> Tuple[float, float, float]:
         """Get dimensions after rotation based on flag (static method for external access)"""
@@ -1083,31 +2001,31 @@ class GeneticPacker:
         return max(tournament, key=lambda x: x.fitness)
 
     def _crossover(self, parent1, parent2):
-        """Order crossover (OX) for sequence, uniform crossover for rotations"""
-        # OX crossover for item sequence
-        size = len(parent1.item_sequence)
-        start, end = sorted(random.sample(range(size), 2))
-        
-        # Create child sequence using OX
-        child_sequence = [None] * size
-        child_sequence[start:end] = parent1.item_sequence[start:end]
-        
-        remaining = [item for item in parent2.item_sequence 
-                    if item not in child_sequence[start:end]]
-        
-        j = 0
-        for i in range(size):
-            if child_sequence[i] is None:
-                child_sequence[i] = remaining[j]
-                j += 1
-        
+        """Order crossover (OX) for the item type sequence, uniform crossover for rotations"""
+        rng = _numpy_rng()
+        order1 = np.frombuffer(parent1.order, dtype=np.uint16)
+        order2 = np.frombuffer(parent2.order, dtype=np.uint16)
+        rotations1 = np.frombuffer(parent1.rotation_flags, dtype=np.uint8)
+        rotations2 = np.frombuffer(parent2.rotation_flags, dtype=np.uint8)
+
+        # OX crossover on item type sequences: keep parent1's slice, fill the rest in
+        # parent2's order, dropping as many occurrences of each type as the slice holds
+        item_types = parent1.item_types
+        types1 = item_types.sequence_types(order1)
+        types2 = item_types.sequence_types(order2)
+        size = len(order1)
+        start, end = sorted(rng.choice(size, 2, replace=False))
+        used = np.bincount(types1[start:end], minlength=item_types.count)
+        remaining = types2[item_types.occurrence_ranks(types2) >= used[types2]]
+
+        child_types = np.empty(size, dtype=np.uint16)
+        child_types[start:end] = types1[start:end]
+        child_types[:start] = remaining[:start]
+        child_types[end:] = remaining[start:]
+        child_order = item_types.assign_items(child_types)
+
         # Uniform crossover for rotations
-        child_rotations = array('B', [
-            parent1.rotation_flags[i] if random.random() < 0.5 
-            else parent2.rotation_flags[i]
-            for i in range(size)
-        ])
-        
-        child = PackingGenome(child_sequence)
-        child.rotation_flags = child_rotations
-        return child
\ No newline at end of file
+        child_rotations = np.where(rng.random(size) < 0.5, rotations1, rotations2)
+
+        return PackingGenome(parent1.items, order=child_order, rotation_flags=child_rotations.tobytes(),
+                             item_types=item_types)
@@ -0,0 +1,197 @@
+"""
+Container type recommendation for a manifest.
+
+Choosing a container type used to take one optimization per candidate type.
+The sweep evaluates every type a transport mode allows at once: a quick
+layer-packing pass packs one container of each type concurrently, and only
+the best few types get a full genetic optimization, again concurrently, so
+the sweep takes about as long as a single optimization rather than the sum.
+Types whose single container leaves units behind are packed as a fleet (see
+pack_fleet) to count the containers they need.
+"""
+import os
+import time
+import logging
+from copy import deepcopy
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Sequence
+
+from optigenix_module.constants import CONTAINER_COST_ESTIMATES, TRANSPORT_MODES
+from optigenix_module.models.container import EnhancedContainer
+from optigenix_module.models.container_packing import expand_quantities
+from optigenix_module.models.item import Item
+from optigenix_module.optimization.fleet import (DEFAULT_FILL_FACTOR, container_capacities, pack_containers,
+                                                 pack_fleet)
+
+logger = logging.getLogger("recommendation")
+
+# Container types that get a full genetic optimization after the heuristic pass
+DEFAULT_TOP_K = 3
+
+
+def _fleet_size(container_type: str, items: List[Item], settings: Dict[str, Any]) -> Optional[int]:
+    """
+    Worker entry point: containers of one type the regular fleet packer fills with the manifest.
+
+    Returns:
+        The container count, or None when some units fit no container of the type
+    """
+    containers, plan = pack_fleet(items, [container_type], route_temperature=settings['route_temperature'],
+                                  constraint_weights=settings['constraint_weights'],
+                                  placement_engine=settings['placement_engine'],
+                                  occupancy_resolution=settings['occupancy_resolution'],
+                                  parallel_workers=1, fill_factor=settings['fill_factor'])
+    return None if plan['unpacked_items'] else len(containers)
+
+
+def _fleet_sizes(container_types: Sequence[str], items: List[Item], settings: Dict[str, Any],
+                 workers: int) -> Dict[str, Optional[int]]:
+    """_fleet_size of several types, on a process pool when there are several workers and types"""
+    if workers > 1 and len(container_types) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(container_types))) as pool:
+                sizes = pool.map(_fleet_size, container_types, [items] * len(container_types),
+                                 [settings] * len(container_types))
+                return dict(zip(container_types, sizes))
+        except BrokenProcessPool as e:
+            logger.error(f"❌ Fleet sizing pool failed ({e}). Packing the fleets in this process.")
+    # Each fleet packs its own copy of the items: packing sets their positions
+    return {name: _fleet_size(name, deepcopy(items), settings) for name in container_types}
+
+
+def _candidate(container: EnhancedContainer, total_items: int, fleet_size: Optional[int], max_weight: float,
+               cost: Optional[float], method: str) -> Dict[str, Any]:
+    """
+    Ranking record of one packed container type.
+
+    Args:
+        fleet_size: Containers of the type the regular fleet packer needs for the whole
+                    manifest (see _fleet_size); None when some unit does not fit the type
+        cost: Cost per container, None when unknown
+        method: 'heuristic' or 'genetic'
+    """
+    # A container that took every unit is all the manifest needs, whatever the fleet packer used
+    containers_needed = 1 if len(container.items) == total_items else fleet_size
+    return {
+        'container_type': container.container_type,
+        'container_dimensions': [float(d) for d in container.dimensions],
+        'max_weight': max_weight if max_weight != float('inf') else None,
+        'method': method,
+        'items_packed': len(container.items),
+        'total_items': total_items,
+        'volume_utilization': float(container.volume_utilization * 100),
+        'weight_utilization': float(container.total_weight / max_weight * 100) if max_weight != float('inf') else None,
+        'containers_needed': containers_needed,
+        'cost_per_container': cost,
+        'estimated_cost': containers_needed * cost if containers_needed is not None and cost is not None else None,
+        'pack_seconds': round(container.pack_seconds, 3)
+    }
+
+
+def _rank_key(candidate: Dict[str, Any]):
+    """Types that can carry the manifest first, cheapest first, then by what one container holds"""
+    cost = candidate['estimated_cost']
+    return (candidate['containers_needed'] is None, cost if cost is not None else float('inf'),
+            -candidate['items_packed'], -candidate['volume_utilization'])
+
+
+def recommend_container_type(items: List[Item], transport_mode: str, top_k: int = DEFAULT_TOP_K,
+                             route_temperature=None, constraint_weights=None, fitness_weights=None,
+                             population_size: int = 10, generations: int = 8,
+                             deadline_seconds: Optional[float] = None, placement_engine: str = 'spaces',
+                             occupancy_resolution=None, parallel_workers: Optional[int] = None,
+                             container_costs: Optional[Dict[str, float]] = None,
+                             fill_factor: float = DEFAULT_FILL_FACTOR) -> Dict[str, Any]:
+    """
+    Rank the container types of a transport mode for a manifest.
+
+    Every type is packed with the regular layer packer first; the top_k types of
+    that ranking are then optimized with the genetic algorithm and ranked again.
+    Types are ranked by the estimated cost of shipping the whole manifest
+    (containers needed times cost per container), then by items packed and
+    volume utilization of one container. A type whose single container leaves
+    units behind needs as many containers as pack_fleet fills with the manifest.
+    A top type keeps its heuristic result when the genetic one ranks worse.
+
+    Args:
+        items: Manifest items; quantities are expanded into units as pack_items does
+        transport_mode: Key of TRANSPORT_MODES whose container types are evaluated
+        top_k: Number of types that get a genetic optimization (0 skips it)
+        route_temperature: Route temperature for temperature-sensitive items
+        constraint_weights: Constraint weights of the regular packing algorithm
+        fitness_weights: Fitness weights of the genetic algorithm
+        population_size: Genetic algorithm population size
+        generations: Genetic algorithm generations
+        deadline_seconds: Wall-clock budget of the whole sweep; the genetic runs get what
+                          the heuristic pass leaves
+        placement_engine: Candidate positions used for packing, 'spaces' or 'extreme_points'
+        occupancy_resolution: Voxel edge (m) of the occupancy bitmap; None disables it
+        parallel_workers: Worker processes packing types concurrently; None uses one per CPU
+        container_costs: Cost per container by type (defaults to CONTAINER_COST_ESTIMATES)
+        fill_factor: Share of a container's volume the fleet packer assigns before opening
+                     the next when counting containers needed (see pack_fleet)
+
+    Returns:
+        Dict with the recommended type and the ranked candidates
+
+    Raises:
+        ValueError: The transport mode is unknown or has no predefined container types
+    """
+    if transport_mode not in TRANSPORT_MODES:
+        raise ValueError(f"Unknown transport mode: {transport_mode}")
+    mode_name, container_types = TRANSPORT_MODES[transport_mode]
+    if not container_types:
+        raise ValueError(f"Transport mode {mode_name} has no predefined container types")
+    started = time.monotonic()
+    workers = max(1, parallel_workers or os.cpu_count() or 1)
+    costs = CONTAINER_COST_ESTIMATES if container_costs is None else container_costs
+    capacities = container_capacities(container_types)
+    units = expand_quantities(items)
+    settings = dict(algorithm='regular', route_temperature=route_temperature, constraint_weights=constraint_weights,
+                    fitness_weights=fitness_weights, population_size=population_size, generations=generations,
+                    deadline_seconds=None, placement_engine=placement_engine,
+                    occupancy_resolution=occupancy_resolution)
+
+    def evaluate(containers, method):
+        return [_candidate(container, len(units), fleet_sizes.get(container.container_type),
+                           capacities[container.container_type][1], costs.get(container.container_type), method)
+                for container in containers]
+
+    logger.info(f"🔎 Container sweep for {mode_name}: {len(units)} units over {len(container_types)} types")
+    # Each type packs its own copy of the units: packing sets their positions
+    containers = pack_containers([(name, deepcopy(units)) for name in container_types], settings, workers)
+    partial = [container.container_type for container in containers if len(container.items) < len(units)]
+    fleet_sizes = _fleet_sizes(partial, items, dict(settings, fill_factor=fill_factor), workers) if partial else {}
+    ranked = sorted(evaluate(containers, 'heuristic'), key=_rank_key)
+    heuristic_seconds = time.monotonic() - started
+
+    top = [candidate['container_type'] for candidate in ranked[:max(0, top_k)]]
+    if top:
+        settings['algorithm'] = 'genetic'
+        if deadline_seconds is not None:
+            settings['deadline_seconds'] = max(0.0, deadline_seconds - heuristic_seconds)
+        logger.info(f"🔎 Genetic optimization of the top {len(top)} types: {', '.join(top)}")
+        best = {candidate['container_type']: candidate for candidate in ranked}
+        containers = pack_containers([(name, deepcopy(units)) for name in top], settings, workers)
+        for candidate in evaluate(containers, 'genetic'):
+            # A genetic run can do worse than the heuristic, e.g. when the deadline cut it short
+            if _rank_key(candidate) < _rank_key(best[candidate['container_type']]):
+                best[candidate['container_type']] = candidate
+        ranked = sorted(best.values(), key=_rank_key)
+
+    for rank, candidate in enumerate(ranked, 1):
+        candidate['rank'] = rank
+    wall_time = time.monotonic() - started
+    logger.info(f"🔎 Recommended {ranked[0]['container_type']} for {mode_name} in {wall_time:.2f}s")
+    return {
+        'transport_mode': mode_name,
+        'transport_mode_id': transport_mode,
+        'total_items': len(units),
+        'recommended': ranked[0]['container_type'],
+        'candidates': ranked,
+        'top_k': len(top),
+        'heuristic_seconds': round(heuristic_seconds, 3),
+        'wall_time_seconds': round(wall_time, 3),
+        'workers': workers
+    }
@@ -0,0 +1,248 @@
+"""
+Warm start for the genetic algorithm from saved container plans.
+
+Most manifests resemble ones packed before. Every saved plan in
+container_plans/ lists its packed items in placement order with their placed
+dimensions. This module fingerprints manifests by their multiset of item types
+(sorted dimensions plus handling flags), finds the most similar saved plans and
+turns their placement order and orientations into seed genomes, so the search
+starts from layouts that already worked instead of purely random ones.
+"""
+import os
+import json
+import random
+import logging
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("packer")
+
+# Plan indexes by folder, shared by every run in the process
+_PLAN_INDEXES: Dict[str, "PlanIndex"] = {}
+_PLAN_INDEXES_LOCK = threading.Lock()
+
+# Rotation flags as used by GeneticPacker._get_rotation
+_ROTATIONS = ((0, 1, 2), (0, 2, 1), (1, 0, 2), (1, 2, 0), (2, 0, 1), (2, 1, 0))
+
+
+def _round_dims(dims: Sequence[float]) -> Tuple[float, ...]:
+    return tuple(round(float(d), 3) for d in dims)
+
+
+def _type_key(dims, fragility, stackable, needs_insulation) -> Tuple:
+    """Orientation-independent item type: sorted dimensions plus handling flags"""
+    return (tuple(sorted(_round_dims(dims))), str(fragility).upper(), str(stackable).upper(),
+            bool(needs_insulation))
+
+
+def item_type_key(item) -> Tuple:
+    """Type key of an expanded Item (bundles use their bundled dimensions)"""
+    return _type_key(item.dimensions, item.fragility, item.stackable,
+                     getattr(item, 'needs_insulation', False))
+
+
+def manifest_fingerprint(items) -> Counter:
+    """Multiset of item type keys of a manifest"""
+    return Counter(item_type_key(item) for item in items)
+
+
+def fingerprint_similarity(a: Counter, b: Counter) -> float:
+    """Weighted Jaccard similarity of two fingerprints (1.0 for identical manifests)"""
+    union = sum((a | b).values())
+    return sum((a & b).values()) / union if union else 0.0
+
+
+def rotation_flag_for(dims: Sequence[float], placed_dims: Sequence[float]) -> Optional[int]:
+    """Rotation flag that turns dims into placed_dims, or None if none does"""
+    target = _round_dims(placed_dims)
+    for flag, axes in enumerate(_ROTATIONS):
+        if _round_dims(dims[axis] for axis in axes) == target:
+            return flag
+    return None
+
+
+class HistoricalPlan:
+    """Fingerprint and placement sequence of one saved container plan"""
+
+    def __init__(self, path, container_dims, fingerprint, placements, volume_utilization):
+        self.path = path
+        self.container_dims = container_dims
+        self.fingerprint = fingerprint
+        self.placements = placements  # (type key, placed dimensions) in packing order
+        self.volume_utilization = volume_utilization
+
+    @classmethod
+    def load(cls, path: str) -> Optional["HistoricalPlan"]:
+        """Read a container_plan_*.json file; returns None if it holds no usable plan"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            packed = data.get('packed_items') or []
+            unpacked = data.get('unpacked_items') or []
+            placements = [
+                (_type_key(entry['dimensions'], entry.get('fragility'), entry.get('stackable'),
+                           entry.get('needs_insulation', False)), tuple(entry['dimensions']))
+                for entry in packed
+            ]
+            fingerprint = Counter(key for key, _ in placements)
+            fingerprint.update(
+                _type_key(entry['dimensions'], entry.get('fragility'), entry.get('stackable'),
+                          entry.get('needs_insulation', False))
+                for entry in unpacked
+            )
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"⚠️  Skipping unreadable container plan {path}: {e}")
+            return None
+        if not placements:
+            return None
+        statistics = data.get('statistics') or {}
+        return cls(path, _round_dims(data.get('container_dimensions') or ()), fingerprint,
+                   placements, float(statistics.get('volume_utilization', 0.0)))
+
+
+class PlanIndex:
+    """
+    Index of saved container plans for similarity lookup
+
+    Plans are loaded lazily and reloaded only when their file changes, so
+    refreshing before each lookup costs one directory scan.
+    """
+
+    def __init__(self, folder: str):
+        """
+        Args:
+            folder: Directory holding container_plan_*.json files
+        """
+        self.folder = folder
+        self._plans: Dict[str, Tuple[float, Optional[HistoricalPlan]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return sum(1 for _, plan in self._plans.values() if plan is not None)
+
+    def refresh(self):
+        """Load new or changed plan files and forget deleted ones"""
+        try:
+            entries = [entry for entry in os.scandir(self.folder)
+                       if entry.name.endswith('.json') and entry.is_file()]
+        except OSError as e:
+            logger.warning(f"⚠️  Container plans folder unavailable ({self.folder}): {e}")
+            entries = []
+
+        with self._lock:
+            seen = set()
+            for entry in entries:
+                seen.add(entry.path)
+                mtime = entry.stat().st_mtime
+                known = self._plans.get(entry.path)
+                if known is None or known[0] != mtime:
+                    self._plans[entry.path] = (mtime, HistoricalPlan.load(entry.path))
+            for path in set(self._plans) - seen:
+                del self._plans[path]
+
+    def find_similar(self, items, container_dims=None, limit: int = 3,
+                     min_similarity: float = 0.5) -> List[Tuple[float, HistoricalPlan]]:
+        """
+        Find the saved plans whose manifests are most similar to items.
+
+        Args:
+            items: Expanded items of the new manifest
+            container_dims: Container of the new plan; plans for the same container rank first on ties
+            limit: Maximum number of plans returned
+            min_similarity: Minimum fingerprint similarity of a returned plan
+
+        Returns:
+            List of (similarity, plan), most similar first
+        """
+        self.refresh()
+        fingerprint = manifest_fingerprint(items)
+        container = _round_dims(container_dims) if container_dims is not None else None
+        with self._lock:
+            plans = [plan for _, plan in self._plans.values() if plan is not None]
+
+        scored = []
+        for plan in plans:
+            similarity = fingerprint_similarity(fingerprint, plan.fingerprint)
+            if similarity >= min_similarity:
+                scored.append((similarity, plan.container_dims == container, plan.volume_utilization, plan))
+        scored.sort(key=lambda entry: entry[:3], reverse=True)
+        return [(similarity, plan) for similarity, _, _, plan in scored[:limit]]
+
+
+def get_plan_index(folder: str) -> PlanIndex:
+    """Get the shared plan index for a folder (one per process)"""
+    folder = os.path.normpath(folder)
+    with _PLAN_INDEXES_LOCK:
+        index = _PLAN_INDEXES.get(folder)
+        if index is None:
+            index = _PLAN_INDEXES[folder] = PlanIndex(folder)
+        return index
+
+
+def seed_from_plan(items, plan: HistoricalPlan) -> Tuple[List[int], List[int], int]:
+    """
+    Turn a saved plan into a genome for the given items.
+
+    Items of the saved plan are matched to current items of the same type in
+    placement order and take over its orientation. Current items without a
+    counterpart follow in random order with random rotations.
+
+    Args:
+        items: Expanded items of the new manifest
+        plan: Saved plan to copy
+
+    Returns:
+        tuple: (item index order, rotation flag per position, number of matched items)
+    """
+    available = defaultdict(list)
+    for index in reversed(range(len(items))):
+        available[item_type_key(items[index])].append(index)
+
+    order, flags = [], []
+    for key, placed_dims in plan.placements:
+        candidates = available.get(key)
+        if not candidates:
+            continue
+        index = candidates.pop()
+        flag = rotation_flag_for(items[index].dimensions, placed_dims)
+        order.append(index)
+        flags.append(flag if flag is not None else random.randrange(6))
+    matched = len(order)
+
+    rest = [index for candidates in available.values() for index in candidates]
+    random.shuffle(rest)
+    order.extend(rest)
+    flags.extend(random.randrange(6) for _ in rest)
+    return order, flags, matched
+
+
+def warm_start_seeds(items, container_dims, plans_folder: str, limit: int = 3,
+                     min_similarity: float = 0.5) -> List[Tuple[List[int], List[int]]]:
+    """
+    Build seed genomes for items from the most similar saved plans.
+
+    Args:
+        items: Expanded items of the new manifest
+        container_dims: Container dimensions of the new plan
+        plans_folder: Directory holding saved container plans
+        limit: Maximum number of seeds (one per saved plan)
+        min_similarity: Minimum manifest similarity of a plan used as a seed
+
+    Returns:
+        List of (item index order, rotation flags) pairs
+    """
+    if not items or limit <= 0:
+        return []
+    index = get_plan_index(plans_folder)
+    matches = index.find_similar(items, container_dims, limit=limit, min_similarity=min_similarity)
+
+    seeds = []
+    for similarity, plan in matches:
+        order, flags, matched = seed_from_plan(items, plan)
+        logger.info(f"🌱 Warm start from {os.path.basename(plan.path)}: similarity {similarity:.2f}, "
+                    f"{matched}/{len(items)} items placed as before")
+        seeds.append((order, flags))
+    if not seeds:
+        logger.info(f"🌱 Warm start: no similar plan among {len(index)} saved plans")
+    return seeds
@@ -0,0 +1,138 @@
+"""
+Persistent cache for LLM responses shared across processes.
+
+Prompts sent during optimization differ mostly in exact metric values. Callers
+build cache keys from the prompt template and quantized metrics, so similar
+optimization states reuse a stored answer instead of a network round-trip.
+Responses live in a SQLite file, which every gunicorn worker can read and write.
+"""
+import os
+import math
+import time
+import sqlite3
+import logging
+from typing import Optional
+
+logger = logging.getLogger("llm_cache")
+
+# Global singleton instance
+_GLOBAL_CACHE_INSTANCE = None
+
+
+class LLMResponseCache:
+    """SQLite-backed LLM response cache with TTL and size-based eviction"""
+
+    def __init__(self, path: str, ttl_seconds: float = 7 * 24 * 3600, max_entries: int = 5000):
+        """
+        Args:
+            path: SQLite database file
+            ttl_seconds: Age after which a stored response is no longer used
+            max_entries: Maximum number of responses kept; least recently used go first
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        try:
+            with self._connect() as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    " key TEXT PRIMARY KEY, response TEXT NOT NULL,"
+                    " created REAL NOT NULL, accessed REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        except sqlite3.Error as e:
+            logger.warning(f"LLM response cache unavailable at {path}: {e}")
+
+    def _connect(self) -> sqlite3.Connection:
+        # A short-lived connection per operation keeps the cache safe across threads and forks
+        return sqlite3.connect(self.path, timeout=5.0)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored response for key, or None if missing or expired"""
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT response FROM responses WHERE key = ? AND created >= ?",
+                    (key, now - self.ttl_seconds)
+                ).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            logger.warning(f"LLM response cache read failed: {e}")
+            row = None
+
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def put(self, key: str, response: str) -> None:
+        """Store a response, then drop expired entries and trim the cache to max_entries"""
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, response, now, now)
+                )
+                conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,))
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    " SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"LLM response cache write failed: {e}")
+
+
+def make_cache_key(template: str, **fields) -> str:
+    """
+    Build a cache key from a prompt template name and already-quantized fields.
+
+    Example: make_cache_key("adaptive_mutation", stagnation=6, variance="1e-4")
+    gives "adaptive_mutation|stagnation=6|variance=1e-4".
+    """
+    return "|".join([template] + [f"{name}={fields[name]}" for name in sorted(fields)])
+
+
+def value_bucket(value: float, step: float = 0.05) -> str:
+    """Quantize a value to the nearest multiple of step"""
+    return f"{round(value / step) * step:.4g}"
+
+
+def log_bucket(value: float) -> str:
+    """Quantize a positive value to its order of magnitude (e.g. variances)"""
+    if value is None or value <= 0:
+        return "0"
+    return f"1e{math.floor(math.log10(value))}"
+
+
+def count_bucket(count: int) -> int:
+    """Quantize a count to the next power of two"""
+    return 1 << max(0, int(count) - 1).bit_length() if count > 0 else 0
+
+
+def get_llm_response_cache() -> Optional[LLMResponseCache]:
+    """
+    Get the shared LLM response cache (singleton pattern).
+
+    Configured with LLM_CACHE_PATH (empty disables the cache), LLM_CACHE_TTL_SECONDS
+    and LLM_CACHE_MAX_ENTRIES.
+    """
+    global _GLOBAL_CACHE_INSTANCE
+
+    if _GLOBAL_CACHE_INSTANCE is None:
+        path = os.environ.get("LLM_CACHE_PATH", "llm_cache.sqlite3")
+        if not path:
+            return None
+        _GLOBAL_CACHE_INSTANCE = LLMResponseCache(
+            path,
+            ttl_seconds=float(os.environ.get("LLM_CACHE_TTL_SECONDS", 7 * 24 * 3600)),
+            max_entries=int(os.environ.get("LLM_CACHE_MAX_ENTRIES", 5000))
+        )
+    return _GLOBAL_CACHE_INSTANCE
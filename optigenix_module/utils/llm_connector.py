@@ -8,11 +8,12 @@ import re
 import concurrent.futures
 from typing import Optional, Dict, Any, List
 from dotenv import load_dotenv
-from functools import lru_cache
 import google.generativeai as genai
 # Ensure FinishReason is NOT imported directly if it causes issues
 from google.generativeai.types import HarmCategory, HarmBlockThreshold # MODIFIED: Keep only necessary imports
 
+from optigenix_module.utils.llm_cache import get_llm_response_cache, make_cache_key
+
 # Load environment variables
 load_dotenv()
 
@@ -59,11 +60,25 @@ class GeminiClient:
         file_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
         self.logger.addHandler(file_handler)
     
-    def generate(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.7) -> str:
-        """Generate with Gemini model"""
+    def generate(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.7,
+                 cache_key: Optional[str] = None) -> str:
+        """Generate with Gemini model
+
+        Args:
+            cache_key: Optional key (see utils.llm_cache.make_cache_key) for sharing the
+                       response through the persistent LLM response cache
+        """
         if not self.enabled:
             fallback = self._get_fallback_strategy()
             return json.dumps(fallback)
+
+        cache = get_llm_response_cache() if cache_key else None
+        if cache is not None:
+            cache_key = f"gemini:{self.model_name}:{cache_key}"
+            cached = cache.get(cache_key)
+            if cached is not None:
+                print(f"\n♻️  CACHED LLM RESPONSE: {cache_key}")
+                return cached
             
         print(f"\\n{'='*60}")
         print(f"🧠 QUERYING LLM: Asking Gemini for adaptive mutation strategy...")
@@ -139,6 +154,8 @@ class GeminiClient:
                             end_time = time.time()
                             print(f"\\n[OK] RESPONSE RECEIVED ({end_time - start_time:.2f}s)")
                             print(f"{'='*60}")
+                            if cache is not None:
+                                cache.put(cache_key, content)
                             return content
                         else: # No parts or no text attribute
                             self.logger.warning(f"Finish reason STOP but no valid content parts or text attribute. Candidate: {candidate}")
@@ -212,9 +229,8 @@ class GeminiClient:
         ]
         return random.choice(strategies)
 
-    @lru_cache(maxsize=32)
     def _get_strategy_for_state(self, state_hash: str, problem_signature: str) -> str:
-        """Cache strategies for similar container states to reduce API calls"""
+        """Cache strategies for similar container states to reduce API calls (shared on disk)"""
         # Create a prompt based on the state hash and problem signature
         prompt = f"""
         Based on the following container state and problem signature, suggest an adaptive mutation strategy:
@@ -226,7 +242,8 @@ class GeminiClient:
         2. operation_focus: One of "balanced", "rotation", "swap" or "position"
         3. explanation: A brief explanation of the strategy
         """
-        return self.generate(prompt)
+        return self.generate(prompt, cache_key=make_cache_key("state_strategy", state=state_hash,
+                                                              problem=problem_signature))
 
     def get_batch_strategies(self, items=None, container=None, population_metrics=None, batch_size: int = 5) -> list:
         """Get multiple mutation strategies at once to reduce API calls
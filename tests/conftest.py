@@ -0,0 +1,40 @@
+"""
+Shared fixtures for the packing tests.
+
+The manifest is small enough to pack in well under a second but mixes
+repeated item types and fragility levels, so the packers exercise stacking,
+rotation and symmetry handling.
+"""
+import pytest
+
+from optigenix_module.models.item import Item
+from optigenix_module.models.container_packing import expand_quantities
+
+# 20ft container (m)
+CONTAINER_DIMS = (5.9, 2.35, 2.39)
+
+# name, length, width, height, weight, quantity, fragility
+MANIFEST = [
+    ('Crate', 1.2, 1.0, 1.0, 300, 4, 'LOW'),
+    ('Drum', 0.6, 0.6, 0.9, 120, 6, 'LOW'),
+    ('Pump', 1.0, 0.8, 0.9, 150, 3, 'MEDIUM'),
+    ('Carton', 0.6, 0.4, 0.4, 10, 10, 'LOW'),
+    ('Glass', 0.8, 0.5, 0.6, 40, 2, 'HIGH'),
+]
+
+
+def make_items(manifest=MANIFEST):
+    """Manifest rows as Item objects, as the upload handlers build them"""
+    return [Item(name, length, width, height, weight, quantity, fragility, 'YES', 'CRATE', 'NO')
+            for name, length, width, height, weight, quantity, fragility in manifest]
+
+
+@pytest.fixture
+def items():
+    return make_items()
+
+
+@pytest.fixture
+def units():
+    """The manifest expanded into one unit per quantity"""
+    return expand_quantities(make_items())
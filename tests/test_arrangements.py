@@ -0,0 +1,59 @@
+"""Alternative arrangements must differ from each other and from the current plan"""
+import copy
+
+import pytest
+
+from optigenix_module.models.container import EnhancedContainer
+from optigenix_module.models.container_packing import perturb_order
+from optigenix_module.optimization.arrangements import generate_arrangements, placement_hash
+
+from .conftest import CONTAINER_DIMS
+
+
+@pytest.fixture
+def packed(items):
+    container = EnhancedContainer(CONTAINER_DIMS)
+    container.pack_items(items)
+    # Packing rotates units; the arrangements must start from their unrotated dimensions
+    assert any(item.dimensions != item.unrotated_dimensions() for item in container.items)
+    return container
+
+
+def test_arrangements_are_distinct_and_exclude_the_current_plan(packed):
+    current = placement_hash(packed)
+    arrangements = packed.generate_multiple_arrangements(count=5, parallel_workers=1)
+    hashes = [container.placement_hash for container, _ in arrangements]
+    assert len(hashes) > 1
+    assert len(set(hashes)) == len(hashes)
+    assert current not in hashes
+    # Run 0 repacks the units as they were first packed, so it is the excluded plan
+    assert all(container.variant['variant'] != 0 for container, _ in arrangements)
+    # The perturbed packing order diversifies the 'spaces' runs, not only the engine switch
+    assert len({container.placement_hash for container, _ in arrangements
+                if container.variant['placement_engine'] == 'spaces'}) > 1
+    # The current plan is left as it was
+    assert placement_hash(packed) == current
+
+
+def test_first_run_repeats_the_current_plan(packed):
+    units = []
+    for item in packed.items:
+        unit = copy.copy(item)
+        unit.position = None
+        unit.dimensions = item.unrotated_dimensions()
+        unit.items_above = []
+        units.append(unit)
+    (container, _), = generate_arrangements(units, CONTAINER_DIMS, count=1, runs=1, parallel_workers=1,
+                                            constraint_weights=packed.constraint_weights)
+    assert container.variant['order_seed'] is None
+    assert container.placement_hash == placement_hash(packed)
+
+
+def test_perturb_order_keeps_units_and_insulated_first(units):
+    for unit in units[:3]:
+        unit.needs_insulation = True
+    first = perturb_order(units, seed=5)
+    assert first == perturb_order(units, seed=5)
+    assert first != units
+    assert sorted(map(id, first)) == sorted(map(id, units))
+    assert {id(unit) for unit in first[:3]} == {id(unit) for unit in units[:3]}
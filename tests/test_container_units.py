@@ -0,0 +1,20 @@
+"""Millimetre containers are for genome evaluation only"""
+import pytest
+
+from optigenix_module.models.container import EnhancedContainer
+
+from .conftest import CONTAINER_DIMS
+
+
+def test_pack_items_rejects_millimetre_containers(units):
+    container = EnhancedContainer(CONTAINER_DIMS, units='mm')
+    with pytest.raises(ValueError):
+        container.pack_items(units, expanded=True)
+    assert not container.items
+
+
+def test_pack_items_packs_metre_containers(units):
+    container = EnhancedContainer(CONTAINER_DIMS)
+    container.pack_items(units, expanded=True)
+    assert container.items
+    assert 0 < container.volume_utilization <= 1
@@ -0,0 +1,29 @@
+"""Topping up a packed container must not offer space its items already fill"""
+from optigenix_module.constants import get_predefined_container_dimensions
+from optigenix_module.models.container import EnhancedContainer
+from optigenix_module.models.item import Item
+from optigenix_module.optimization import fleet
+
+ROUTE_TEMPERATURE = 30
+
+
+def test_top_up_safe_zone_avoids_placed_items(units):
+    container = EnhancedContainer(get_predefined_container_dimensions('Twenty-foot'))
+    container.container_type = 'Twenty-foot'
+    container.pack_items(units, ROUTE_TEMPERATURE, expanded=True)
+    placed = [(item.position, item.dimensions) for item in container.items]
+    assert placed
+    before = {id(space) for space in container.spaces}
+
+    # Too wide for the temperature-safe zone, so it is offered but never placed
+    spill = Item('Vaccine', 5.0, 2.0, 2.0, 50, 1, 'HIGH', 'YES', 'CRATE', 'NO', 0, '2 to 8°C')
+    assert fleet._top_up([container], [spill], {'route_temperature': ROUTE_TEMPERATURE,
+                                                'constraint_weights': None}) == [spill]
+
+    zone = [space for space in container.spaces if id(space) not in before]
+    assert zone and all(space.temperature_safe for space in zone)
+    for space in zone:
+        for position, dims in placed:
+            assert not all(space_start < start + extent and start < space_start + space_extent
+                           for space_start, space_extent, start, extent in
+                           zip((space.x, space.y, space.z), (space.width, space.height, space.depth), position, dims))
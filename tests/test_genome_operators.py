@@ -0,0 +1,81 @@
+"""Crossover and mutation must keep genomes valid item permutations"""
+import random
+
+import numpy as np
+import pytest
+
+from optigenix_module.models.container_packing import expand_quantities
+from optigenix_module.optimization.packer import GeneticPacker, PackingGenome
+from optigenix_module.optimization.item_types import ItemTypeTable
+
+from .conftest import CONTAINER_DIMS, make_items
+
+FOCUSES = [None, 'rotation', 'swap', 'subsequence', 'balanced', 'aggressive']
+
+
+def assert_valid(genome, size):
+    order = np.frombuffer(genome.order, dtype=np.uint16)
+    rotations = np.frombuffer(genome.rotation_flags, dtype=np.uint8)
+    assert sorted(order.tolist()) == list(range(size))
+    assert len(rotations) == size
+    assert rotations.max() < 6
+
+
+@pytest.fixture
+def packer(units):
+    random.seed(3)
+    packer = GeneticPacker(CONTAINER_DIMS)
+    packer._prepare_item_table(units)
+    return packer
+
+
+def random_genome(units, item_types):
+    order = np.array(random.sample(range(len(units)), len(units)), dtype=np.uint16)
+    return PackingGenome(units, order=order, item_types=item_types)
+
+
+def test_crossover_children_are_permutations(units, packer):
+    for _ in range(200):
+        parent1 = random_genome(units, packer._item_types)
+        parent2 = random_genome(units, packer._item_types)
+        child = packer._crossover(parent1, parent2)
+        assert_valid(child, len(units))
+
+
+def test_crossover_keeps_type_counts_and_slice(units, packer):
+    table = packer._item_types
+    parent1 = random_genome(units, table)
+    parent2 = random_genome(units, table)
+    child = packer._crossover(parent1, parent2)
+    child_types = table.sequence_types(child.order)
+    assert np.bincount(child_types).tolist() == np.bincount(table.types).tolist()
+
+
+@pytest.mark.parametrize('focus', FOCUSES)
+def test_mutation_keeps_a_permutation(units, packer, focus):
+    genome = random_genome(units, packer._item_types)
+    for _ in range(100):
+        genome.mutate(operation_focus=focus, rate_modifier=0.2)
+        assert_valid(genome, len(units))
+
+
+def test_swaps_skip_interchangeable_items():
+    units = expand_quantities(make_items([('Crate', 1.2, 1.0, 1.0, 300, 6, 'LOW')]))
+    genome = PackingGenome(units)
+    before = genome.order.tobytes()
+    genome._mutate_swaps(np.random.default_rng(0), 3)
+    assert genome.order.tobytes() == before
+
+
+def test_genomes_of_a_run_share_one_type_table(units, packer):
+    parent1 = random_genome(units, packer._item_types)
+    parent2 = random_genome(units, packer._item_types)
+    child = packer._crossover(parent1, parent2)
+    assert child.item_types is packer._item_types
+
+
+def test_type_table_is_built_per_genome_table(units):
+    genome = PackingGenome(units)
+    assert isinstance(genome.item_types, ItemTypeTable)
+    assert genome.item_types.items is units
+    assert genome.item_types.count < len(units)
@@ -0,0 +1,48 @@
+"""Parallel fitness evaluation must give the same results as sequential evaluation"""
+import random
+
+from optigenix_module.optimization import packer as packer_module
+from optigenix_module.optimization.packer import GeneticPacker, PackingGenome
+
+from .conftest import CONTAINER_DIMS
+
+FITNESS_WEIGHTS = {
+    'volume_utilization_weight': 0.50,
+    'stability_score_weight': 0.10,
+    'contact_ratio_weight': 0.10,
+    'weight_balance_weight': 0.10,
+    'items_packed_ratio_weight': 0.20,
+}
+
+
+def evaluate(units, parallel_workers, genomes=8, seed=7):
+    random.seed(seed)
+    packer = GeneticPacker(CONTAINER_DIMS, population_size=genomes, parallel_workers=parallel_workers)
+    packer.items_to_pack = units
+    packer.fitness_weights = dict(FITNESS_WEIGHTS)
+    population = [PackingGenome(units) for _ in range(genomes)]
+    for genome in population:
+        genome.mutate()
+    packer._start_run_context()
+    try:
+        packer._evaluate_population(population)
+    finally:
+        packer._end_run_context()
+    return packer, population
+
+
+def test_parallel_evaluation_matches_sequential(units):
+    _, sequential = evaluate(units, None)
+    _, parallel = evaluate(units, 2)
+
+    assert [genome.fitness for genome in parallel] == [genome.fitness for genome in sequential]
+    assert [genome.metrics for genome in parallel] == [genome.metrics for genome in sequential]
+
+
+def test_evaluation_pool_follows_requested_size(units):
+    evaluate(units, 2, genomes=4)
+    assert packer_module._EVALUATION_POOL_WORKERS == 2
+    evaluate(units, 3, genomes=4)
+    assert packer_module._EVALUATION_POOL_WORKERS == 3
+    packer_module.shutdown_evaluation_pool()
+
@@ -0,0 +1,44 @@
+"""Container counts of the recommendation must match what the fleet packer needs"""
+import pytest
+
+from optigenix_module.optimization.fleet import pack_fleet
+from optigenix_module.optimization.recommendation import _rank_key, recommend_container_type
+
+from .conftest import MANIFEST, make_items
+
+# Air transport: Twenty-foot and Reefer-20ft
+TRANSPORT_MODE = '3'
+
+# Three times the shared manifest, more than one 20ft container takes
+LARGE_MANIFEST = [row[:5] + (row[5] * 3,) + row[6:] for row in MANIFEST]
+
+FITNESS_WEIGHTS = {
+    'volume_utilization_weight': 0.50,
+    'stability_score_weight': 0.10,
+    'contact_ratio_weight': 0.10,
+    'weight_balance_weight': 0.10,
+    'items_packed_ratio_weight': 0.20,
+}
+
+
+@pytest.fixture(scope='module')
+def heuristic():
+    return recommend_container_type(make_items(LARGE_MANIFEST), TRANSPORT_MODE, top_k=0, parallel_workers=1)
+
+
+def test_containers_needed_matches_the_fleet_packer(heuristic):
+    for candidate in heuristic['candidates']:
+        assert candidate['items_packed'] < candidate['total_items']
+        containers, plan = pack_fleet(make_items(LARGE_MANIFEST), [candidate['container_type']], parallel_workers=1)
+        assert not plan['unpacked_items']
+        assert candidate['containers_needed'] == len(containers) > 1
+
+
+def test_genetic_pass_keeps_the_better_result(heuristic):
+    # With no time left the genetic runs pack the manifest order unoptimized
+    result = recommend_container_type(make_items(LARGE_MANIFEST), TRANSPORT_MODE, top_k=2, parallel_workers=1,
+                                      fitness_weights=FITNESS_WEIGHTS, deadline_seconds=0)
+    before = {candidate['container_type']: candidate for candidate in heuristic['candidates']}
+    for candidate in result['candidates']:
+        assert _rank_key(candidate) <= _rank_key(before[candidate['container_type']])
+    assert [candidate['rank'] for candidate in result['candidates']] == [1, 2]
@@ -0,0 +1,12 @@
+"""A genetic run whose budget is gone before the first evaluation still returns a packing"""
+from optigenix_module.optimization.genetic import optimize_packing_with_genetic_algorithm
+
+from .conftest import CONTAINER_DIMS
+from .test_parallel_evaluation import FITNESS_WEIGHTS
+
+
+def test_zero_deadline_packs_the_manifest_order(items):
+    container = optimize_packing_with_genetic_algorithm(items, CONTAINER_DIMS, population_size=4, generations=2,
+                                                        fitness_weights=FITNESS_WEIGHTS, deadline_seconds=0)
+    assert container.items
+    assert container.stop_reason == "deadline reached"
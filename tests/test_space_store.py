@@ -0,0 +1,59 @@
+"""SpaceStore.carve must leave exactly the empty part of the container as free spaces"""
+import random
+
+import numpy as np
+import pytest
+
+from optigenix_module.models.space import MaximalSpace
+from optigenix_module.models.space_store import SpaceStore
+
+# Container in decimetres: width along x, height along y, depth along z, as MaximalSpace stores them
+EXTENTS = (20, 12, 10)
+
+
+def place_boxes(seed, count=15):
+    """Carve non-overlapping random boxes out of one full-container space"""
+    rng = random.Random(seed)
+    store = SpaceStore([MaximalSpace(0, 0, 0, *EXTENTS)])
+    boxes = []
+    while len(boxes) < count:
+        size = [rng.randint(1, 6) for _ in EXTENTS]
+        corner = [rng.randint(0, extent - s) for extent, s in zip(EXTENTS, size)]
+        box = tuple(corner) + tuple(c + s for c, s in zip(corner, size))
+        if any(all(box[a] < other[a + 3] and other[a] < box[a + 3] for a in range(3)) for other in boxes):
+            continue
+        store.carve(box)
+        boxes.append(box)
+    return store, np.array(boxes, dtype=float)
+
+
+def inside(points, boxes):
+    """points x boxes mask of points strictly inside each box"""
+    return ((points[:, None, :] > boxes[None, :, :3]) & (points[:, None, :] < boxes[None, :, 3:])).all(axis=2)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_spaces_never_overlap_placed_boxes(seed):
+    store, boxes = place_boxes(seed)
+    for box in boxes:
+        assert not store.overlap_mask(box).any()
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_every_free_point_is_covered(seed):
+    store, boxes = place_boxes(seed)
+    # Centres of a half-decimetre grid never lie on a box or space face
+    axes = [np.arange(extent * 2) / 2 + 0.25 for extent in EXTENTS]
+    points = np.stack(np.meshgrid(*axes, indexing='ij'), axis=-1).reshape(-1, 3)
+    free = points[~inside(points, boxes).any(axis=1)]
+    assert len(free)
+    assert inside(free, store.boxes()).any(axis=1).all()
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_spaces_stay_maximal(seed):
+    store, _ = place_boxes(seed)
+    spaces = store.boxes()
+    contains = ((spaces[:, None, :3] <= spaces[None, :, :3]) & (spaces[:, None, 3:] >= spaces[None, :, 3:])).all(axis=2)
+    np.fill_diagonal(contains, False)
+    assert not contains.any()